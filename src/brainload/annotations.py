@@ -184,28 +184,28 @@ def annot(subject_id, subjects_dir, annotation, hemi="both", meta_data=None, ori
     >>> import brainload as bl; import os
     >>> subjects_dir = os.path.join(os.getenv('HOME'), 'data', 'my_study_x')
     >>> vertex_labels, label_colors, label_names, meta_data = bl.annot('subject1', subjects_dir, 'aparc', hemi='both')
-    >>> print meta_data['lh.annotation_file']     # will print /home/someuser/data/my_study_x/subject1/label/lh.aparc.annot
-    >>> print meta_data['rh.annotation_file']     # will print /home/someuser/data/my_study_x/subject1/label/rh.aparc.annot
+    >>> print(meta_data['lh.annotation_file'])     # will print /home/someuser/data/my_study_x/subject1/label/lh.aparc.annot
+    >>> print(meta_data['rh.annotation_file'])     # will print /home/someuser/data/my_study_x/subject1/label/rh.aparc.annot
 
 
     Now load cortical parcellation annotations for the left hemisphere of a subject from the Destrieux ('aparc.a2009s') atlas:
 
     >>> vertex_labels, label_colors, label_names, meta_data = bl.annot('subject1', subjects_dir, 'aparc.a2009s', hemi='lh')
-    >>> print meta_data['lh.annotation_file']     # will print /home/someuser/data/my_study_x/subject1/label/lh.aparc.a2009s.annot
+    >>> print(meta_data['lh.annotation_file'])     # will print /home/someuser/data/my_study_x/subject1/label/lh.aparc.a2009s.annot
 
 
     Now load cortical parcellation annotations for the right hemisphere of a subject from the DKT ('aparc.DKTatlas40') atlas:
 
     >>> vertex_labels, label_colors, label_names, meta_data = bl.annot('subject1', subjects_dir, 'aparc.DKTatlas40', hemi='rh')
-    >>> print meta_data['rh.annotation_file']     # will print /home/someuser/data/my_study_x/subject1/label/lh.aparc.DKTatlas40.annot
+    >>> print(meta_data['rh.annotation_file'])     # will print /home/someuser/data/my_study_x/subject1/label/lh.aparc.DKTatlas40.annot
 
     Print the color and the annotation name for an example vertex:
 
     >>> vert_idx = 0     # We'll take the first vertex as an example.
     >>> if vertex_labels[vert_idx] >= 0:     # it is -1 if the vertex is not assigned any label/color
     >>>     i = vertex_labels[vert_idx]
-    >>>     print "label for vertex %d is %s" % (vert_idx, label_names[i])
-    >>>     print "color for vertex %d in RGBA is (%d %d %d %d)" % (vert_idx, label_colors[idx, 0], label_colors[idx, 1], label_colors[idx, 2], (255 - label_colors[idx, 3]))
+    >>>     print("label for vertex %d is %s" % (vert_idx, label_names[i]))
+    >>>     print("color for vertex %d in RGBA is (%d %d %d %d)" % (vert_idx, label_colors[idx, 0], label_colors[idx, 1], label_colors[idx, 2], (255 - label_colors[idx, 3])))
 
     References
     ----------
@@ -603,7 +603,7 @@ def label(subject_id, subjects_dir, label, hemi="both", meta_data=None):
     >>> import brainload as bl; import os
     >>> subjects_dir = os.path.join(os.getenv('HOME'), 'data', 'my_study_x')
     >>> verts_in_label, meta_data = bl.label('subject1', subjects_dir, 'cortex', hemi='lh')
-    >>> print meta_data['lh.label_file']     # will print /home/someuser/data/my_study_x/subject1/label/lh.cortex.label
+    >>> print(meta_data['lh.label_file'])     # will print /home/someuser/data/my_study_x/subject1/label/lh.cortex.label
 
     You could now use the label information to mask your morphology data.
 
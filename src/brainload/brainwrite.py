@@ -6,8 +6,8 @@ These functions are helpful if you want to generate and write volume or surface
 """
 
 import numpy as np
-import nibabel as nib
-import nibabel.freesurfer.mghformat as fsmgh
+
+_ROWS_PER_CHUNK = 10000     # the number of lines formatted at once by write_surface_vertices_overlay_text_file
 
 def get_volume_data_with_custom_marks(voxel_mark_list, background_voxel_value=0, shape=(256, 256, 256), dtype=np.uint8):
     """
@@ -49,13 +49,12 @@ def get_volume_data_with_custom_marks(voxel_mark_list, background_voxel_value=0,
     >>> nib.save(ni_img, 'my_data.nii')
     """
     # set background
-    voxel_data = np.ones(shape, dtype=dtype) * background_voxel_value
+    voxel_data = np.full(shape, background_voxel_value, dtype=dtype)
     # iterate through list and set proper color for each set of voxels
     for val_tuple in voxel_mark_list:
-        target_voxel_indices = val_tuple[0]
+        target_voxel_indices = np.asarray(val_tuple[0], dtype=int).reshape(-1, voxel_data.ndim)
         target_voxel_value = val_tuple[1]
-        for coord in target_voxel_indices:
-            voxel_data[coord[0],coord[1], coord[2]] = target_voxel_value
+        voxel_data[tuple(target_voxel_indices.T)] = target_voxel_value
     return voxel_data
 
 
@@ -99,22 +98,158 @@ def get_surface_vertices_overlay_volume_data(num_verts, vertex_mark_list, backgr
     ```get_surface_vertices_overlay_volume_data_1color```: the same data, but use one intensity value per vertex instead of 3 RGB values. Allows usage of FreeSurfer hack for saving to nifti format in case of fsaverage.
     ```get_surface_vertices_overlay_text_file_lines```: the same data, but for writing to a similar file in text format that can be loaded as a color map. Uses RGB color. No dimension limitations.
     """
-    background_rgb = np.array(background_rgb, dtype=dtype)
-    shape = (num_verts, 3, 1)
-    voxel_data = np.zeros(shape, dtype=dtype)
-    # set background color for all voxels/verts
-    voxel_data[:,0,0] = background_rgb[0]
-    voxel_data[:,1,0] = background_rgb[1]
-    voxel_data[:,2,0] = background_rgb[2]
-    # overwrite the color for the marked ones with the requested colors.
-    for val_tuple in vertex_mark_list:
-        target_vertex_indices = val_tuple[0]
-        target_vertex_rgb = val_tuple[1]
-        for vert_idx in target_vertex_indices:
-            voxel_data[vert_idx,0,0] = target_vertex_rgb[0]
-            voxel_data[vert_idx,1,0] = target_vertex_rgb[1]
-            voxel_data[vert_idx,2,0] = target_vertex_rgb[2]
-    return voxel_data
+    vertex_indices, vertex_colors = _vertex_mark_list_to_arrays(vertex_mark_list)
+    overlay_rgb = get_surface_vertices_overlay_rgb(num_verts, vertex_indices, vertex_colors, background_rgb=background_rgb, dtype=dtype)
+    return overlay_rgb[:, :, np.newaxis]
+
+
+def _vertex_mark_list_to_arrays(vertex_mark_list):
+    """
+    Turn a vertex mark list into two flat arrays.
+
+    Concatenates the vertex indices of all tuples in the list into one array, and repeats the color of each tuple once per vertex it contains. The order of the vertices is preserved, so colors given later in the list still take precedence.
+
+    Parameters
+    ----------
+    vertex_mark_list: list of tuples
+        Each tuple contains first the vertex indices (1D numpy int array with shape (n, ) for n vertices) and then a 1D array of length 3 that represents the RGB values of the color to assign to all the previously given n vertices.
+
+    Returns
+    -------
+    vertex_indices: numpy 1D int array
+        The vertex indices of all tuples.
+
+    vertex_colors: numpy 2D array
+        Array with shape (m, 3) for the m vertex indices, the color of each vertex.
+    """
+    if len(vertex_mark_list) == 0:
+        return np.zeros((0, ), dtype=int), np.zeros((0, 3), dtype=int)
+    index_arrays = [np.asarray(val_tuple[0], dtype=int).ravel() for val_tuple in vertex_mark_list]
+    vertex_indices = np.concatenate(index_arrays)
+    vertex_colors = np.repeat(np.array([val_tuple[1] for val_tuple in vertex_mark_list]), [a.shape[0] for a in index_arrays], axis=0)
+    return vertex_indices, vertex_colors
+
+
+def get_surface_vertices_overlay_rgb(num_verts, vertex_indices, vertex_colors, background_rgb=[200, 200, 200], dtype=np.uint8, assume_unique=False):
+    """
+    Generates a per-vertex RGB color buffer for a surface.
+
+    Performs the same task as get_surface_vertices_overlay_volume_data, but takes the marked vertices as two flat arrays instead of a list of tuples, and returns a 2D array. The buffer is filled with the background color and the marked vertices are then colored with a single scatter assignment. If a vertex index occurs several times, the color given last for it is used.
+
+    Parameters
+    ----------
+    num_verts: int
+        The number of vertices of the surface. E.g., 163842 if you want to color vertices on a hemisphere from the fsaverage Freesurfer subject.
+
+    vertex_indices: numpy 1D int array
+        The indices of the n vertices that should be colored.
+
+    vertex_colors: numpy 1D array of length 3 or 2D array with shape (n, 3)
+        The RGB color to assign to all vertices in vertex_indices, or one RGB color per vertex in vertex_indices.
+
+    background_rgb: numpy 1D array of length 3, optional
+        The background color, defined as 3 RGB values. Defaults to [200, 200, 200], which is a bright gray. This is assigned to all vertices which do not occur in vertex_indices.
+
+    dtype: data type, optional
+        The data type of the returned data 2D array. Defaults to ```np.uint8```.
+
+    assume_unique: bool, optional
+        Whether each vertex occurs at most once in vertex_indices, e.g., because the caller already used ```unique_last_vertex_occurrences```. Skips the deduplication. Defaults to False.
+
+    Returns
+    -------
+    overlay_rgb: numpy 2D array
+        A 2D array with shape (num_verts, 3) that contains the 3 RGB values for each vertex of the surface.
+
+    Examples
+    --------
+    Create an overlay for an fsaverage hemisphere in which 3 vertices are red and all others are gray:
+
+    >>> overlay_rgb = bw.get_surface_vertices_overlay_rgb(163842, np.array([0, 2, 4], dtype=int), [255, 0, 0], background_rgb=[200, 200, 200])
+    """
+    background_rgb = np.asarray(background_rgb, dtype=dtype)
+    vertex_colors = np.asarray(vertex_colors, dtype=dtype)
+    # Fill the buffer by broadcasting the background color, instead of building it row by row.
+    overlay_rgb = np.broadcast_to(background_rgb, (num_verts, 3)).copy()
+    if vertex_colors.ndim == 1:
+        # All marked vertices share one color, so repeated indices do not matter.
+        overlay_rgb[vertex_indices] = vertex_colors
+        return overlay_rgb
+    if not assume_unique:
+        # numpy does not guarantee which value wins if an index is repeated in a fancy assignment, so only keep the last occurrence of each vertex.
+        vertex_indices, last_occurrences = unique_last_vertex_occurrences(vertex_indices)
+        vertex_colors = vertex_colors[last_occurrences]
+    overlay_rgb[vertex_indices] = vertex_colors
+    return overlay_rgb
+
+
+def unique_last_vertex_occurrences(vertex_indices):
+    """
+    Find the unique vertex indices and the position of the last occurrence of each of them.
+
+    Useful to resolve vertices which are marked several times with different colors: the color given last wins.
+
+    Parameters
+    ----------
+    vertex_indices: numpy 1D int array
+        Vertex indices, may contain duplicates.
+
+    Returns
+    -------
+    unique_vertex_indices: numpy 1D int array
+        The sorted unique vertex indices.
+
+    last_occurrences: numpy 1D int array
+        For each entry of unique_vertex_indices, the position of its last occurrence in vertex_indices.
+
+    Examples
+    --------
+    >>> unique_indices, last_occurrences = bw.unique_last_vertex_occurrences(np.array([5, 2, 5]))
+    >>> print(unique_indices, last_occurrences)
+    [2 5] [1 2]
+    """
+    vertex_indices = np.asarray(vertex_indices)
+    unique_vertex_indices, first_index_reversed = np.unique(vertex_indices[::-1], return_index=True)
+    return unique_vertex_indices, vertex_indices.shape[0] - 1 - first_index_reversed
+
+
+def write_surface_vertices_overlay_text_file(file_name, overlay_rgb):
+    """
+    Write a per-vertex RGB color buffer to a text file.
+
+    Writes one line per vertex that contains the 3 RGB values, separated by a comma and a space. This is the same format as the lines returned by get_surface_vertices_overlay_text_file_lines. You can load the result as a surface colormap in Freeview: load a surface like ```lh.pial```, select it on the left pane and then click ```Color -> Load RGB Map...```.
+
+    Parameters
+    ----------
+    file_name: str or file-like object
+        Path to output file. Will be overwritten if it exists. Alternatively, a file object opened for writing, e.g., ```sys.stdout```. It is not closed.
+
+    overlay_rgb: numpy 2D array
+        Array with shape (n, 3) for the n vertices of the surface, see get_surface_vertices_overlay_rgb.
+    """
+    # Format the rows of each chunk with a single string formatting operation: np.savetxt formats each row separately. The chunks keep the intermediate strings small.
+    if hasattr(file_name, 'write'):
+        _write_overlay_rgb_rows(file_name, overlay_rgb)
+    else:
+        with open(file_name, 'w') as f:
+            _write_overlay_rgb_rows(f, overlay_rgb)
+
+
+def _write_overlay_rgb_rows(out, overlay_rgb):
+    """
+    Write the lines of an RGB overlay text file to a file object, in chunks of ```_ROWS_PER_CHUNK``` rows.
+
+    Parameters
+    ----------
+    out: file-like object
+        A file object opened for writing in text mode.
+
+    overlay_rgb: numpy 2D array
+        Array with shape (n, 3) for the n vertices of the surface, see get_surface_vertices_overlay_rgb.
+    """
+    for chunk_start in range(0, overlay_rgb.shape[0], _ROWS_PER_CHUNK):
+        chunk = overlay_rgb[chunk_start:chunk_start + _ROWS_PER_CHUNK]
+        out.write(("%d, %d, %d\n" * chunk.shape[0]) % tuple(chunk.ravel().tolist()))
 
 
 def get_surface_vertices_overlay_volume_data_1color(num_verts, vertex_mark_list, background_value=0, dtype=np.uint8):
@@ -157,15 +292,13 @@ def get_surface_vertices_overlay_volume_data_1color(num_verts, vertex_mark_list,
     ```get_surface_vertices_overlay_volume_data```: the same data, but for writing to a similar file in text format
     """
     shape = (num_verts, 1, 1)
-    voxel_data = np.zeros(shape, dtype=dtype)
     # set background color for all voxels/verts
-    voxel_data[:,0,0] = background_value
+    voxel_data = np.full(shape, background_value, dtype=dtype)
     # overwrite the color for the marked ones with the requested colors.
     for val_tuple in vertex_mark_list:
         target_vertex_indices = val_tuple[0]
         target_vertex_rgb = val_tuple[1]
-        for vert_idx in target_vertex_indices:
-            voxel_data[vert_idx,0,0] = target_vertex_rgb
+        voxel_data[target_vertex_indices,0,0] = target_vertex_rgb
     return voxel_data
 
 
@@ -194,12 +327,13 @@ def get_surface_vertices_overlay_text_file_lines(num_verts, vertex_mark_list, ba
     -------
     lines: list of str
         A list of lines that can be written to a text file as a surface overlay. Each line represents the color of a single vertex. Vertex order is the same as the order of vertices in the surface file that this overlay is for.
+
+    See also
+    --------
+    ```write_surface_vertices_overlay_text_file```: writes the same lines directly to a file, in chunks, without building the list of lines.
     """
     voxel_data = get_surface_vertices_overlay_volume_data(num_verts, vertex_mark_list, background_rgb=background_rgb, dtype=dtype)
-    lines = []
-    for row in voxel_data:
-        lines.append("%d, %d, %d" % (row[0][0], row[1][0], row[2][0]))
-    return lines
+    return ["%d, %d, %d" % (r, g, b) for (r, g, b) in voxel_data[:,:,0].tolist()]
 
 
 def write_voldata_to_nifti_file(file_name, vol_data, affine=None, header=None):
@@ -221,6 +355,7 @@ def write_voldata_to_nifti_file(file_name, vol_data, affine=None, header=None):
     header: nibabel.Nifti1Header, optional
         The nifti header. If not given, an almost empty default header will be used.
     """
+    import nibabel as nib
     if header is None:
         header = nib.Nifti1Header()
         header.set_data_shape(vol_data.shape)
@@ -247,6 +382,7 @@ def write_voldata_to_mgh_file(mgh_file_name, vol_data, affine=None, header=None)
     header: nibabel.freesurfer.mghformat.MGHHeader, optional
         The MGH file header. If not given, an empty default header will be used.
     """
+    import nibabel.freesurfer.mghformat as fsmgh
     if header is None:
         header = fsmgh.MGHHeader()
     image = fsmgh.MGHImage(vol_data, affine, header=header)
@@ -2,8 +2,6 @@
 from __future__ import print_function
 import sys
 import numpy as np
-import nibabel.freesurfer.io as fsio
-import brainload.nitools as nit
 import brainload.freesurferdata as fsd
 import argparse
 
@@ -23,10 +21,11 @@ def brain_morph_info():
     epilog_example_text = '''examples:
  brain_morph_info ~/studyA/subject1/surf/lh.area -i 10 --verbose
  brain_morph_info ~/studyA/subject1/surf/lh.thickness -a -q describe
- brain_morph_info ~/studyA/subject1/surf/rh.curv -f ~/vertices_of_interest.txt -q sortasc'''
+ brain_morph_info ~/studyA/subject1/surf/rh.curv -f ~/vertices_of_interest.txt -q sortasc
+ brain_morph_info ~/studyA/subject*/surf/lh.thickness -i 10,20,30'''
 
     parser = argparse.ArgumentParser(description="Query brain surface morphometry data from a curv file.", epilog=epilog_example_text, formatter_class=argparse.RawDescriptionHelpFormatter)
-    parser.add_argument("curv_file", help="The curv file to load. Must be in Freesurfer curv format. Example files are 'lh.area' or 'rh.thickness'.")
+    parser.add_argument("curv_file", nargs='+', help="The curv file to load. Must be in Freesurfer curv format. Example files are 'lh.area' or 'rh.thickness'. Several files can be given to run the same query on all of them in one go, e.g., for all subjects of a study. In that case, every output line is prefixed with the respective file name.")
     index_group = parser.add_mutually_exclusive_group(required=True)
     index_group.add_argument("-i", "--index", help="The index of the vertex to query. A single integer or several integers separated by commata (no spaces allowed).")
     index_group.add_argument("-f", "--index-file", help="A file containing the list of vertex indices to query.")
@@ -36,55 +35,72 @@ def brain_morph_info():
     parser.add_argument("-v", "--verbose", help="Increase output verbosity.", action="store_true")
     args = parser.parse_args()
 
-    curv_file = args.curv_file
+    curv_files = args.curv_file
     verbose = args.verbose
     sep = args.separator
+    is_batch = len(curv_files) > 1
 
     if verbose:
         print("---Brain Surface Morphometry Info---")
 
-    hemisphere_label, is_default = fsd._deduce_hemisphere_label_from_file_path(curv_file)
-    morphometry_data, meta_data = fsd.read_fs_morphometry_data_file_and_record_meta_data(curv_file, hemisphere_label)
-
     if args.index:
         query_indices = np.array([int(s) for s in args.index.split(',')], dtype=int)
         if verbose:
             print("Querying curv file for the %d vertex indices from the command line." % (query_indices.shape[0]))
     elif args.index_file:
+        import brainload.nitools as nit
         query_indices = nit.load_vertex_indices(args.index_file)
         if verbose:
             print("Querying curv file for the %d vertex indices from file '%s'. (File should contain indices separated by '%s'.)" % (query_indices.shape[0], args.index_file, args.separator))
     else:
-        if verbose:
-            print("Querying curv file for all its %d vertex indices." % (morphometry_data.shape[0]))
-        query_indices = np.arange(morphometry_data.shape[0])
+        query_indices = None
 
-    if verbose:
-        print("Morphometry file '%s' contains %d values." % (curv_file, morphometry_data.shape[0]))
+    if query_indices is not None and query_indices.shape[0] > 0 and np.min(query_indices) < 0:
+        print("ERROR: All query indices must be >= 0, but encountered negative index '%d'. Exiting." % (np.min(query_indices)), file=sys.stderr)
+        sys.exit(1)
+
+    for curv_file in curv_files:
+        hemisphere_label, is_default = fsd._deduce_hemisphere_label_from_file_path(curv_file)
+        morphometry_data, meta_data = fsd.read_fs_morphometry_data_file_and_record_meta_data(curv_file, hemisphere_label)
+
+        if args.all:
+            if verbose:
+                print("Querying curv file for all its %d vertex indices." % (morphometry_data.shape[0]))
+            query_indices = np.arange(morphometry_data.shape[0])
 
-    d = morphometry_data[query_indices]
-    if args.query == "values":
-        res = sep.join(str(x) for x in d)
-        if verbose:
-            print("Morphometry values of vertices # %s are: %s" % ([str(x) for x in query_indices], res))
-        else:
-            print(res)
-    elif args.query == "sortasc":
-        if verbose:
-            print("Printing vertex indices and their data values in ascending order.")
-        sorted_indices = np.argsort(d)
-        for idx in sorted_indices:
-            print("%d, %f" % (idx, d[idx]))
-    elif args.query == "sortdsc":
-        if verbose:
-            print("Printing vertex indices and their data values in descending order.")
-        sorted_indices = np.argsort(-d)
-        for idx in sorted_indices:
-            print("%d, %f" % (idx, d[idx]))
-    else:   # descriptive stats
         if verbose:
-            print("count, mean, median, .25 quantile, .75 quantile, min, max")
-        print("%d, %f, %f, %f, %f, %f, %f" % (d.shape[0], np.mean(d), np.median(d), np.quantile(d, 0.25), np.quantile(d, 0.75), np.min(d), np.max(d)))
+            print("Morphometry file '%s' contains %d values." % (curv_file, morphometry_data.shape[0]))
+
+        if query_indices.shape[0] > 0 and np.max(query_indices) >= morphometry_data.shape[0]:
+            print("ERROR: All query indices must be < %d (i.e., the number of values in the morphometry file '%s'), but encountered larger index '%d'. Exiting." % (morphometry_data.shape[0], curv_file, np.max(query_indices)), file=sys.stderr)
+            sys.exit(1)
+
+        line_prefix = "%s, " % (curv_file) if is_batch else ""
+        d = morphometry_data[query_indices]
+        if args.query == "values":
+            res = sep.join(str(x) for x in d)
+            if verbose:
+                print("Morphometry values of vertices # %s are: %s" % ([str(x) for x in query_indices], res))
+            elif is_batch:
+                print("%s%s%s" % (curv_file, sep, res))
+            else:
+                print(res)
+        elif args.query == "sortasc":
+            if verbose:
+                print("Printing vertex indices and their data values in ascending order.")
+            sorted_indices = np.argsort(d)
+            for idx in sorted_indices:
+                print("%s%d, %f" % (line_prefix, idx, d[idx]))
+        elif args.query == "sortdsc":
+            if verbose:
+                print("Printing vertex indices and their data values in descending order.")
+            sorted_indices = np.argsort(-d)
+            for idx in sorted_indices:
+                print("%s%d, %f" % (line_prefix, idx, d[idx]))
+        else:   # descriptive stats
+            if verbose:
+                print("count, mean, median, .25 quantile, .75 quantile, min, max")
+            print("%s%d, %f, %f, %f, %f, %f, %f" % (line_prefix, d.shape[0], np.mean(d), np.median(d), np.quantile(d, 0.25), np.quantile(d, 0.75), np.min(d), np.max(d)))
 
     sys.exit(0)
 
@@ -2,14 +2,33 @@
 from __future__ import print_function
 import sys
 import numpy as np
-import nibabel as nib
 import argparse
-import brainload.nitools as nit
 import warnings
 
 # To run this in dev mode (in virtual env, pip -e install of brainload active) from REPO_ROOT:
 # PYTHONPATH=./src/brainload python src/brainload/clients/brain_vol_info.py tests/test_data/subject1/mri/orig.mgz --crs 10 10 10 -v
 
+def _check_voxel_indices_in_bounds(voxel_indices, vol_shape):
+    """
+    Exit with an error message if any of the voxel indices lies outside of the volume.
+
+    Parameters
+    ----------
+    voxel_indices: numpy 2D int array
+        The query voxels, with shape (n, d) for n voxels with d dimensions each.
+
+    vol_shape: tuple of int
+        The shape of the volume.
+    """
+    voxel_indices = np.atleast_2d(voxel_indices)
+    num_dims = min(voxel_indices.shape[1], len(vol_shape))
+    vol_dims = np.array(vol_shape[:num_dims], dtype=int)
+    query_indices = voxel_indices[:, :num_dims].astype(int)
+    if np.any(query_indices < 0) or np.any(query_indices >= vol_dims):
+        print("ERROR: All query voxel indices must be >= 0 and smaller than the volume shape %s, but encountered out of bounds voxel index. Exiting." % (str(vol_shape)), file=sys.stderr)
+        sys.exit(1)
+
+
 def brain_vol_info():
     """
     Brain volume information.
@@ -33,7 +52,19 @@ def brain_vol_info():
     verbose = args.verbose
     sep = args.separator
 
-    vol_data = nib.load(volume_file).get_data()
+    import nibabel as nib       # Imported only after argument parsing succeeded, so that '--help' and usage errors return quickly.
+    vol_image = nib.load(volume_file)
+
+    # Check the query voxels against the volume shape from the header before loading the voxel data.
+    if args.crs:
+        voxel_index = tuple([int(x) for x in args.crs])
+        _check_voxel_indices_in_bounds(np.array([voxel_index], dtype=int), vol_image.shape)
+    elif args.crs_file:
+        import brainload.nitools as nit
+        voxel_indices = nit.load_voxel_indices(args.crs_file)
+        _check_voxel_indices_in_bounds(voxel_indices, vol_image.shape)
+
+    vol_data = np.asanyarray(vol_image.dataobj)     # get_data() has been removed from nibabel
     if verbose:
         print("---Brain Vol Info---")
         print("Volume has %d dimensions, shape %s and data type %s. It contains %d voxels." % (len(vol_data.shape), vol_data.shape, vol_data.dtype, len(np.ravel(vol_data))))
@@ -48,24 +79,24 @@ def brain_vol_info():
         voxel_value_print_format = "%d"
         vol_data = np.rint(vol_data).astype(int)    # Force integer values. For floats, you would get as many values of there are voxels, and this does not make sense.
         vol_data_flat = np.ravel(vol_data)
-        occuring_values = dict()
-        for value in vol_data_flat:
-            if value in occuring_values:
-                occuring_values[value] = occuring_values[value] + 1
-            else:
-                occuring_values[value] = 1
+        if vol_data_flat.shape[0] > 0 and vol_data_flat.min() >= 0 and vol_data_flat.max() < (1 << 20):
+            # Label volumes like aseg have non-negative values in a small range: counting them with bincount is a single linear pass.
+            counts = np.bincount(vol_data_flat)
+            occuring_values = np.flatnonzero(counts)
+            occuring_value_counts = counts[occuring_values]
+        else:
+            occuring_values, occuring_value_counts = np.unique(vol_data_flat, return_counts=True)
         if args.all_values:
             if verbose:
-                print("Printing all %d different intensity values that occur within the volume." % (len(occuring_values)))
-            print(sep.join([str(k) for k in sorted(occuring_values.keys())]))
+                print("Printing all %d different intensity values that occur within the volume." % (occuring_values.shape[0]))
+            print(sep.join([str(v) for v in occuring_values.tolist()]))
         else:
             if verbose:
-                print("Printing the counts for the %d different intensity values that occur within the volume. Sum of counts is %d." % (len(occuring_values), sum(occuring_values.values())))
-            print(sep.join([str(pair[1]) for pair in sorted(occuring_values.items(), key=lambda pair: pair[0])]))
+                print("Printing the counts for the %d different intensity values that occur within the volume. Sum of counts is %d." % (occuring_values.shape[0], np.sum(occuring_value_counts)))
+            print(sep.join([str(c) for c in occuring_value_counts.tolist()]))
 
     else:
         if args.crs:
-            voxel_index = tuple([int(x) for x in args.crs])
             voxel_display_string = " ".join(args.crs)
             if verbose:
                 print("Received 1 voxel index (with %d dimensions) from the command line. Printing intensity value of the voxel '%s' in the volume." % (len(voxel_index), voxel_display_string))
@@ -73,7 +104,6 @@ def brain_vol_info():
                 warnings.warn("Dimension mismatch: Received query voxel with %d dimenions, but the volume has %d." % (len(voxel_index), len(vol_data.shape)))
             print(voxel_value_print_format % (vol_data[voxel_index]))
         else:
-            voxel_indices = nit.load_voxel_indices(args.crs_file)
             voxel_values = []
             if voxel_indices.shape[1] != len(vol_data.shape):
                 warnings.warn("Dimension mismatch: Received query voxels with %d dimensions, but the volume has %d." % (voxel_indices.shape[1], len(vol_data.shape)))
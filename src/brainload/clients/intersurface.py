@@ -169,22 +169,17 @@ def get_expected_volume_per_vertex(vert_coords, faces, cortical_thickness, verbo
         print("Computed %d areas for all %d faces of the surface." % (face_areas.shape[0], faces.shape[0]))
 
     num_vertices = vert_coords.shape[0]
-    area_all_faces_around_vertex = np.zeros((num_vertices,))
 
     if verbose:
         print("Computing expected volume at each of the %d vertices of the surface." % (num_vertices))
 
-    for vert_idx in range(num_vertices):
-        mask = np.any(faces == vert_idx, axis=1)
-        all_face_indices = np.nonzero(mask)[0]
-        #faces_with_vert_at_pos0 = np.nonzero(faces_surf1[:,0]==vert_idx)[0]
-        #faces_with_vert_at_pos1 = np.nonzero(faces_surf1[:,1]==vert_idx)[0]
-        #faces_with_vert_at_pos2 = np.nonzero(faces_surf1[:,2]==vert_idx)[0]
-        #all_face_indices = np.unique(np.concatenate((faces_with_vert_at_pos0, faces_with_vert_at_pos1, faces_with_vert_at_pos2)))
-        summed_area = face_areas[all_face_indices].sum()
-        area_all_faces_around_vertex[vert_idx] = summed_area
-        if verbose and vert_idx % verbose_print_each == 0:
-            print('At vertex %d. Vertex is part of the following %d faces with total area %f: %s' % (vert_idx, len(all_face_indices), summed_area, ','.join([str(x) for x in all_face_indices])))
+    # Each face adds its area to each of its 3 vertices, so a single bincount over the flattened faces sums the areas of all faces around each vertex.
+    area_all_faces_around_vertex = np.bincount(faces.ravel(), weights=np.repeat(face_areas, 3), minlength=num_vertices)
+
+    if verbose:
+        for vert_idx in range(0, num_vertices, verbose_print_each):
+            all_face_indices = np.nonzero(np.any(faces == vert_idx, axis=1))[0]
+            print('At vertex %d. Vertex is part of the following %d faces with total area %f: %s' % (vert_idx, len(all_face_indices), area_all_faces_around_vertex[vert_idx], ','.join([str(x) for x in all_face_indices])))
     expected_volume = area_all_faces_around_vertex * cortical_thickness
     return expected_volume
 
@@ -201,15 +196,13 @@ def get_convex_polygon_volume(points):
 def get_mesh_face_areas(vert_coords, faces):
     """
     Compute the area of all faces.
+
+    Computes the cross products of the edge vectors of all faces at once, so there is no Python loop over the faces. See ```face_area``` for a single face.
     """
-    num_faces = faces.shape[0]
     all_faces_first_vert_coords_xyz = vert_coords[faces[:,0]]
     all_faces_second_vert_coords_xyz = vert_coords[faces[:,1]]
     all_faces_third_vert_coords_xyz = vert_coords[faces[:,2]]
-    areas = np.zeros((num_faces,))
-    for i in range(num_faces):
-        areas[i] = face_area(all_faces_first_vert_coords_xyz[i,:], all_faces_second_vert_coords_xyz[i,:], all_faces_third_vert_coords_xyz[i,:])
-    return areas
+    return 0.5 * norm(np.cross(all_faces_second_vert_coords_xyz - all_faces_first_vert_coords_xyz, all_faces_third_vert_coords_xyz - all_faces_first_vert_coords_xyz), axis=1)
 
 
 def face_area(a, b, c):
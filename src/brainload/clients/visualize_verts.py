@@ -1,10 +1,8 @@
 #!/usr/bin/env python
 from __future__ import print_function
+import os
 import sys
 import numpy as np
-import nibabel.freesurfer.io as fsio
-import brainload.nitools as nit
-import brainload.freesurferdata as fsd
 import brainload.brainwrite as brw
 import argparse
 
@@ -13,6 +11,31 @@ import argparse
 # PYTHONPATH=./src/brainload python src/brainload/clients/visualize_verts.py -t $SURF -f tests/test_data/subject1/derived/verts_with_color.txt -e $SURF 1 -v -c 255 0 0
 
 
+def _colors_to_uint8(colors, colors_source):
+    """
+    Convert color values to uint8, or exit with an error message if any of them lies outside of the range 0..255.
+
+    Parameters
+    ----------
+    colors: numpy int array or list
+        The color values, e.g., a (n, 3) array of RGB colors. Elements may also be strings that represent integers, as received from the command line.
+
+    colors_source: str
+        A description of where the colors come from, used in the error message. E.g., "the vertex index file 'verts.txt'".
+
+    Returns
+    -------
+    numpy uint8 array
+        The color values, with the same shape as the input.
+    """
+    colors = np.asarray(colors).astype(int)
+    is_out_of_range = (colors < 0) | (colors > 255)
+    if np.any(is_out_of_range):
+        print("ERROR: All color values must be between 0 and 255, but %s contains the value '%d'. Exiting." % (colors_source, colors[is_out_of_range][0]), file=sys.stderr)
+        sys.exit(1)
+    return colors.astype(np.uint8)
+
+
 def visualize_verts():
     """
     Visualize brain surface vertices.
@@ -32,11 +55,12 @@ def visualize_verts():
     parser.add_argument('-c', '--color', nargs=3, help="The color to use for the vertices as 3 RGB values between 0 and 255, e.g., '255 0 0' for red. Must be given unless an index file is used that contains the color values.", default=None)
     parser.add_argument('-b', '--background-color', nargs=3, help="The background color to use for all the vertices which are NOT listed on the command line or in the index file. 3 RGB values between 0 and 255. Defaults to '128 128 128', a gray.", default=[128, 128, 128])
     parser.add_argument('-e', '--extend-neighborhood', nargs=2, help="In addition to the given vertices, also color their neighbors in the given mesh file, up to the given graph distance in hops.")
+    parser.add_argument('-k', '--cache-dir', help="Directory in which the vertex adjacency of the mesh given with '-e' is cached between runs, so that later runs on the same, unchanged mesh do not have to compute it again. Defaults to no caching.", default=None)
     parser.add_argument('-o', '--output-file', help="Ouput file. The format is an RGB overlay that can be loaded into Freeview.", default="surface_RGB_map.txt")
     args = parser.parse_args()
 
     verbose = args.verbose
-    fallback_color = [255, 0, 0]    # red
+    fallback_color = np.array([255, 0, 0], dtype=np.uint8)    # red
     is_using_fallback_color = False
 
     print("---Brain Surface Vertices Visualization---")
@@ -47,10 +71,11 @@ def visualize_verts():
     colors = None
 
     if args.index:
-        query_indices = np.array([int(s) for s in args.index.split(',')], dtype=int)
+        query_indices = np.array([int(s) for s in args.index.split(',')], dtype=np.int32)
         if verbose:
             print("Using the %d vertex indices from the command line." % (query_indices.shape[0]))
     else:
+        import brainload.nitools as nit
         query_indices = nit.load_vertex_indices(args.index_file)
         # The vertex index file may not only contain either only a vertex index per line, or 3 additional RGB values. Parse colors if it does have them:
         if len(query_indices.shape) == 2:
@@ -58,7 +83,7 @@ def visualize_verts():
             if num_fields_per_row < 4:
                 print("ERROR: Lines in the vertex index must must contain either a single integer (the vertex index), or at least four (the index and the 3 RGB color values). Found %d." % (num_fields_per_row))
                 sys.exit(1)
-            colors = query_indices[:,1:4]
+            colors = _colors_to_uint8(query_indices[:,1:4], "the vertex index file '%s'" % (args.index_file))
             query_indices = query_indices[:,0]
             if verbose:
                 if args.color:
@@ -71,84 +96,96 @@ def visualize_verts():
 
     if not args.color and colors is None:
         print("No foreground color given on the command line (-c) and vertex index file contains no color values. Falling back to internal default color red (255 0 0).")
-        colors = np.zeros((query_indices.shape[0], 3), dtype=int)
-        colors[:,0:3] = fallback_color
+        colors = np.tile(fallback_color, (query_indices.shape[0], 1))
         is_using_fallback_color = True
 
+    if args.target_surface_file or args.extend_neighborhood:
+        import brainload.freesurferdata as fsd
+
+    vert_coords = None
     if args.num_verts:
         num_verts = int(args.num_verts)
     else:
         mesh_file = args.target_surface_file
-        vert_coords, faces = fsio.read_geometry(mesh_file)
+        hemi_label, is_default = fsd._deduce_hemisphere_label_from_file_path(mesh_file)
+        vert_coords, faces, meta_data = fsd.read_fs_surface_file_and_record_meta_data(mesh_file, hemi_label)
         num_verts = vert_coords.shape[0]
 
     # Check whether one of the query indices is out of bounds
     if verbose:
         print("Surface has %d vertices (with indices 0 to %d)." % (num_verts, num_verts-1))
-    min_query_idx = np.min(query_indices)
-    if min_query_idx < 0:
-        print("ERROR: All query indices must be >= 0, but encountered negative index '%d'. Exiting." % (min_query_idx), file=sys.stderr)
-        sys.exit(1)
-    max_query_idx = np.max(query_indices)
-    if max_query_idx >= num_verts:
-        print("ERROR: All query indices must be < %d (i.e., the number of vertices in the mesh), but encountered larger index '%d'. Exiting." % (num_verts, max_query_idx), file=sys.stderr)
+    is_out_of_bounds = (query_indices < 0) | (query_indices >= num_verts)     # single pass over the indices for both bounds
+    if np.any(is_out_of_bounds):
+        out_of_bounds_indices = query_indices[is_out_of_bounds]
+        min_query_idx = np.min(out_of_bounds_indices)
+        if min_query_idx < 0:
+            print("ERROR: All query indices must be >= 0, but encountered negative index '%d'. Exiting." % (min_query_idx), file=sys.stderr)
+        else:
+            print("ERROR: All query indices must be < %d (i.e., the number of vertices in the mesh), but encountered larger index '%d'. Exiting." % (num_verts, np.max(out_of_bounds_indices)), file=sys.stderr)
         sys.exit(1)
 
-    background_color = [int(x) for x in args.background_color]
+    background_color = _colors_to_uint8(args.background_color, "the background color (-b)")
 
     if args.extend_neighborhood:
         extend_mesh_file = args.extend_neighborhood[0]
         extend_num_hops = int(args.extend_neighborhood[1])
         print("Extension of neighborhood by %d requested based on surface mesh file '%s'. Computing surface graph." % (extend_num_hops, extend_mesh_file))
         import brainload.surfacegraph as sg
-        hemi_label, is_default = fsd._deduce_hemisphere_label_from_file_path(extend_mesh_file)
-        vert_coords, faces, meta_data = fsd.read_fs_surface_file_and_record_meta_data(extend_mesh_file, hemi_label)
-        mesh_graph = sg.SurfaceGraph(vert_coords, faces)
+        if vert_coords is None or not os.path.samefile(mesh_file, extend_mesh_file):    # Re-use the target surface mesh if it is the same file.
+            hemi_label, is_default = fsd._deduce_hemisphere_label_from_file_path(extend_mesh_file)
+            vert_coords, faces, meta_data = fsd.read_fs_surface_file_and_record_meta_data(extend_mesh_file, hemi_label)
+        adjacency_cache_file = None
+        if args.cache_dir:
+            adjacency_cache_file = sg.get_adjacency_cache_file(extend_mesh_file, args.cache_dir)
+            if verbose:
+                print("Using vertex adjacency cache file '%s'." % (adjacency_cache_file))
+        mesh_graph = sg.SurfaceGraph(vert_coords, faces, adjacency_cache_file=adjacency_cache_file)
 
 
     if args.color:
-        color_all = [int(x) for x in args.color]
+        color_all = _colors_to_uint8(args.color, "the foreground color (-c)")
         if verbose:
             print("Using foreground color '%s' from command line for all %d foreground vertices." % (" ".join(args.color), query_indices.shape[0]))
-        vertex_mark_list = []
-        for i, vertex in enumerate(query_indices):
-            vertex_mark_list.append(([query_indices[i]], color_all))
-
+        marked_colors = color_all
     else:
         if verbose:
             if is_using_fallback_color:
                 print("No foreground color given on command line, using fallback color.")
             else:
                 print("No foreground color given on command line, using per-vertex colors from vertex index file.")
-        vertex_mark_list = []
-        for i, vertex in enumerate(query_indices):
-            vertex_mark_list.append(([query_indices[i]], colors[i]))
+        marked_colors = colors
+    marked_indices = query_indices
 
     if verbose:
         print("Using background color '%s'." % (" ".join([str(x) for x in args.background_color])))
 
+    is_deduplicated = False
     if args.extend_neighborhood:
-        for t_idx, mark_tuple in enumerate(vertex_mark_list):
-            tuple_vert_indices = mark_tuple[0]
-            tuple_colors = mark_tuple[1]
-            for marked_vertex_index in tuple_vert_indices:
-                neighbors = mesh_graph.get_neighbors_up_to_dist(marked_vertex_index, extend_num_hops)
-                new_mark_tuple_verts = np.concatenate((np.array(mark_tuple[0], dtype=int), np.array(neighbors, dtype=int)))
-                new_mark_tuple = (new_mark_tuple_verts, tuple_colors)
-                vertex_mark_list[t_idx] = new_mark_tuple
+        if args.color:
+            # All vertices share the same color, so a single search from all of them at once yields the union of their neighborhoods.
+            marked_indices = mesh_graph.get_neighbors_up_to_dist(query_indices, extend_num_hops)
+        else:
+            # Where the neighborhoods of several sources overlap, the source given last wins, just like when marking the neighborhood of each source in order. Finding the last source within reach of each vertex takes one pass over the mesh edges per hop, independent of the number of sources.
+            last_source_of_vertex = sg.get_last_source_up_to_dist_csr(mesh_graph.adjacency_indptr, mesh_graph.adjacency_indices, query_indices, extend_num_hops)
+            marked_indices = np.flatnonzero(last_source_of_vertex >= 0).astype(np.int32)
+            marked_colors = colors[last_source_of_vertex[marked_indices]]
+            num_foreground_verts = marked_indices.shape[0]
+            is_deduplicated = True
+
+    # Deduplicate the marked vertices once. The result is used for the scatter into the overlay and for the verbose summary.
+    if not is_deduplicated:
+        num_foreground_verts = marked_indices.shape[0]
+        marked_indices, last_occurrences = brw.unique_last_vertex_occurrences(marked_indices)
+        if marked_colors.ndim == 2:
+            marked_colors = marked_colors[last_occurrences]
 
     if verbose:
-        all_foreground_verts = np.empty((0,), dtype=int)
-        for mark_tuple in vertex_mark_list:
-            all_foreground_verts = np.concatenate((all_foreground_verts, mark_tuple[0]))
-        num_foreground_verts = all_foreground_verts.shape[0]
-        num_unique_foreground_verts = np.unique(all_foreground_verts).shape[0]
-        print("Resulting surface RGB map contains %d marked vertices (%d unique)." % (num_foreground_verts, num_unique_foreground_verts))
+        print("Resulting surface RGB map contains %d marked vertices (%d unique)." % (num_foreground_verts, marked_indices.shape[0]))
 
-    lines = brw.get_surface_vertices_overlay_text_file_lines(num_verts, vertex_mark_list, background_rgb=background_color)
+    overlay_rgb = brw.get_surface_vertices_overlay_rgb(num_verts, marked_indices, marked_colors, background_rgb=background_color, assume_unique=True)
 
     print("Writing surface RGB map to output file '%s'. To use it, load and select the respective surface in Freeview, then click 'Color -> Load RGB Map'." % (args.output_file))
-    nit.write_lines_to_text_file(lines, args.output_file)
+    brw.write_surface_vertices_overlay_text_file(args.output_file, overlay_rgb)
     sys.exit(0)
 
 
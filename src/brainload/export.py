@@ -12,22 +12,21 @@ import numpy as np
 
 def export_mesh_nocolor_to_file(filename, vertex_coords, faces):
     export_format, matched = _mesh_export_nc_format_from_filename(filename)
-    export_string = _get_export_nc_string(export_format, vertex_coords, faces)
 
     with open(filename, "w") as text_file:
-        text_file.write(export_string)
+        _get_export_nc_string(export_format, vertex_coords, faces, out=text_file)      # streams the parts to the file instead of building the full string
 
 
-def _get_export_nc_string(export_format, vertex_coords, faces):
+def _get_export_nc_string(export_format, vertex_coords, faces, out=None):
     if export_format not in ('obj', 'ply', 'off'):
         raise ValueError("ERROR: export_format must be one of {'obj', 'ply', 'off'} but is '%s'." % export_format)
 
     if export_format == 'obj':
-        return bl.mesh_to_obj(vertex_coords, faces)
+        return bl.mesh_to_obj(vertex_coords, faces, out=out)
     elif export_format == 'off':
-        return bl.mesh_to_off(vertex_coords, faces)
+        return bl.mesh_to_off(vertex_coords, faces, out=out)
     else:
-        return bl.mesh_to_ply(vertex_coords, faces)
+        return bl.mesh_to_ply(vertex_coords, faces, out=out)
 
 
 
@@ -8,8 +8,15 @@ import os
 import sys
 import errno
 import numpy as np
-import collections
+import collections.abc
 import gzip
+import string
+import functools
+import hashlib
+import json
+import warnings
+import concurrent.futures
+import threading
 import nibabel.freesurfer.io as fsio
 import nibabel.freesurfer.mghformat as fsmgh
 from . import nitools as nit
@@ -18,6 +25,13 @@ import nibabel as nib
 import numpy.linalg as npl  # for matrix inversion
 import struct   # for reading binary data
 
+# Valid values for the hemi, hemisphere_label and format parameters of the functions in this module.
+_VALID_HEMIS = frozenset(('lh', 'rh', 'both'))
+_VALID_HEMISPHERE_LABELS = frozenset(('lh', 'rh'))
+_VALID_MORPHOMETRY_FORMATS = frozenset(('curv', 'mgh'))
+_HEMISPHERE_READ_EXECUTOR = None     # created on first use by _get_hemisphere_read_executor
+_HEMISPHERE_READ_EXECUTOR_LOCK = threading.Lock()
+
 
 def read_m3z_file(m3z_file):
     """
@@ -218,18 +232,22 @@ def read_mgh_header_matrices(mgh_file_name):
     >>> mgh_file = os.path.join(TEST_DATA_DIR, 'subject1', 'mri', 'orig.mgh')
     >>> ras2vox, vox2ras, vox2ras_tkr = fsd.read_mgh_header_matrices(mgh_file)
     """
-    _, mgh_meta_data = read_mgh_file(mgh_file_name, collect_data=False)
-    ras2vox = mgh_meta_data['ras2vox']
-    vox2ras = mgh_meta_data['vox2ras']
-    vox2ras_tkr = mgh_meta_data['vox2ras_tkr']
+    header = fsmgh.load(mgh_file_name).header      # Only the header is read. Query just the 3 matrices, not all the meta data that read_mgh_file collects.
+    ras2vox = header.get_ras2vox()
+    vox2ras = header.get_vox2ras()
+    vox2ras_tkr = header.get_vox2ras_tkr()
     return ras2vox, vox2ras, vox2ras_tkr
 
 
+# The meta data collected from the MGH header by read_mgh_file. For each key, the header method 'get_<key>' is called.
+_MGH_HEADER_META_DATA_KEYS = ('data_shape', 'affine', 'data_bytespervox', 'data_dtype', 'data_offset', 'data_size', 'footer_offset', 'ras2vox', 'slope_inter', 'vox2ras', 'vox2ras_tkr', 'zooms')    # MGH format has a header, then data, then a footer. The zooms are the voxel dimensions (along all 3 axes in space).
+
+
 def read_mgh_file(mgh_file_name, collect_meta_data=True, collect_data=True):
     """
     Read data from a FreeSurfer output file in mgh format.
 
-    Read all data from the MGH file and return it as a numpy array. Optionally, collect meta data from the mgh file header.
+    Read all data from the MGH file and return it as a numpy array. Optionally, collect meta data from the mgh file header. The file is opened in binary mode by nibabel. The data of uncompressed MGH files is memory-mapped instead of being copied into memory, so only the parts which are actually accessed are read from disk.
 
     Parameters
     ----------
@@ -245,7 +263,7 @@ def read_mgh_file(mgh_file_name, collect_meta_data=True, collect_data=True):
     Returns
     -------
     mgh_data: numpy array
-        The data from the MGH file, usually one scalar value per voxel.
+        The data from the MGH file, usually one scalar value per voxel. For uncompressed MGH files, this is a copy-on-write ```numpy.memmap```. None if the argument `collect_data` was 'False'.
 
     mgh_meta_data: dictionary
         The meta data collected from the header, or an empty dictionary if the argument `collect_meta_data` was 'False'. The keys correspond to the names of the respective nibabel function used to retrieve the data. The values are the data as returned by nibabel.
@@ -266,33 +284,17 @@ def read_mgh_file(mgh_file_name, collect_meta_data=True, collect_data=True):
         - https://surfer.nmr.mgh.harvard.edu/fswiki/FileFormats
     """
     mgh_meta_data = {}
-    if mgh_file_name.endswith(".mgz") or mgh_file_name.endswith(".gz"):
-        mgh_file_handle = gzip.open(mgh_file_name, 'rb')
-    else:
-        mgh_file_handle = open(mgh_file_name, 'rb')
-
-    header = fsmgh.MGHHeader.from_fileobj(mgh_file_handle)
+    # nibabel only reads the header here, and handles gzipped files based on the file extension. The data is read on demand from the data object.
+    mgh_image = fsmgh.load(mgh_file_name)
+    header = mgh_image.header
 
     if collect_meta_data:
-        mgh_meta_data['data_shape'] = header.get_data_shape()
-        mgh_meta_data['affine'] = header.get_affine()
-        mgh_meta_data['best_affine'] = header.get_best_affine()             # identical to get_affine for MGH format
-        mgh_meta_data['data_bytespervox'] = header.get_data_bytespervox()
-        mgh_meta_data['data_dtype'] = header.get_data_dtype()
-        mgh_meta_data['data_offset'] =  header.get_data_offset()            # MGH format has a header, then data, then a footer
-        mgh_meta_data['data_shape'] =  header.get_data_shape()
-        mgh_meta_data['data_size'] = header.get_data_size()
-        mgh_meta_data['footer_offset'] =  header.get_footer_offset()
-        mgh_meta_data['ras2vox'] =  header.get_ras2vox()
-        mgh_meta_data['slope_inter'] =  header.get_slope_inter()
-        mgh_meta_data['vox2ras'] =  header.get_vox2ras()
-        mgh_meta_data['vox2ras_tkr'] =  header.get_vox2ras_tkr()
-        mgh_meta_data['zooms'] =  header.get_zooms()                        # the voxel dimensions (along all 3 axes in space)
+        mgh_meta_data = {key: getattr(header, 'get_' + key)() for key in _MGH_HEADER_META_DATA_KEYS}
+        mgh_meta_data['best_affine'] = mgh_meta_data['affine'].copy()         # identical to get_affine for MGH format
 
     mgh_data = None
     if collect_data:
-        mgh_data = header.data_from_fileobj(mgh_file_handle)
-    mgh_file_handle.close()
+        mgh_data = np.asanyarray(mgh_image.dataobj)
     return mgh_data, mgh_meta_data
 
 
@@ -310,7 +312,7 @@ def get_num_fsaverage_verts_per_hemi(fsversion=6):
     else:
         raise ValueError("Currently the only supported FreeSurfer version is 6.")
 
-def merge_morphometry_data(morphometry_data_arrays, dtype=float):
+def merge_morphometry_data(morphometry_data_arrays, dtype=None):
     """
     Merge morphometry data horizontally.
 
@@ -318,11 +320,11 @@ def merge_morphometry_data(morphometry_data_arrays, dtype=float):
 
     Parameters
     ----------
-    morphometry_data_arrays: 2D array
-        An array of arrays, each of which represents morphometry data from different hemispheres of the same subject.
+    morphometry_data_arrays: list of numpy 1D arrays
+        A list (or tuple) of arrays, each of which represents morphometry data from different hemispheres of the same subject. The arrays may differ in length.
 
     dtype: data type, optional
-        Data type for the output numpy array. Defaults to float.
+        Data type for the output numpy array. Defaults to None, which means the smallest float type that can hold the data of all input arrays. That is float32 for data read from FreeSurfer curv files, as they store 32 bit floats. Pass float to always get float64.
 
     Returns
     -------
@@ -335,19 +337,25 @@ def merge_morphometry_data(morphometry_data_arrays, dtype=float):
 
     >>> lh_morphometry_data = np.array([0.0, 0.1, 0.2, 0.3])   # some fake data
     >>> rh_morphometry_data = np.array([0.5, 0.6])
-    >>> merged_data = fsd.merge_morphometry_data(np.array([lh_morphometry_data, rh_morphometry_data]))
-    >>> print merged_data.shape
+    >>> merged_data = fsd.merge_morphometry_data([lh_morphometry_data, rh_morphometry_data])
+    >>> print(merged_data.shape)
     (6, )
 
     Typically, the `lh_morphometry_data` and `rh_morphometry_data` come from calls to `read_fs_morphometry_data_file_and_record_meta_data` as shown here:
 
     >>> lh_morphometry_data, meta_data = read_fs_morphometry_data_file_and_record_meta_data(lh_morphometry_data_file, 'lh')
     >>> rh_morphometry_data, meta_data = read_fs_morphometry_data_file_and_record_meta_data(rh_morphometry_data_file, 'rh', meta_data=meta_data)
-    >>> both_hemis_morphometry_data = merge_morphometry_data(np.array([lh_morphometry_data, rh_morphometry_data]))
+    >>> both_hemis_morphometry_data = merge_morphometry_data([lh_morphometry_data, rh_morphometry_data])
     """
-    merged_data = np.empty((0), dtype=dtype)
+    # Allocate the result once and copy each input into its slice, instead of re-stacking the accumulated data for every input.
+    morphometry_data_arrays = [np.ravel(morphometry_data) for morphometry_data in morphometry_data_arrays]
+    if dtype is None:
+        dtype = np.result_type(np.float32, *morphometry_data_arrays)
+    merged_data = np.empty((sum([morphometry_data.shape[0] for morphometry_data in morphometry_data_arrays]), ), dtype=dtype)
+    offset = 0
     for morphometry_data in morphometry_data_arrays:
-        merged_data = np.hstack((merged_data, morphometry_data))
+        merged_data[offset:offset + morphometry_data.shape[0]] = morphometry_data
+        offset += morphometry_data.shape[0]
     return merged_data
 
 
@@ -370,7 +378,7 @@ def _get_morphometry_data_suffix_for_surface(surf):
     Examples
     --------
     >>> import brainload.freesurferdata as fsd
-    >>> print fsd._get_morphometry_data_suffix_for_surface('pial')
+    >>> print(fsd._get_morphometry_data_suffix_for_surface('pial'))
     .pial
     """
     if surf == 'white':
@@ -386,7 +394,7 @@ def read_fs_surface_file_and_record_meta_data(surf_file, hemisphere_label, meta_
 
     Parameters
     ----------
-    surf_file: string
+    surf_file: string | os.PathLike
         A string representing an absolute path to a surface (or 'mesh') file (e.g., the path to 'lh.white').
 
     hemisphere_label: {'lh' or 'rh'}
@@ -398,10 +406,10 @@ def read_fs_surface_file_and_record_meta_data(surf_file, hemisphere_label, meta_
     Returns
     -------
     vert_coords: numpy array
-        A 2D array containing 3 coordinates for each vertex in the `surf_file`.
+        A 2D float32 array containing 3 coordinates for each vertex in the `surf_file`.
 
     faces: numpy array
-        A 2D array containing 3 vertex indices per face. Look at the respective indices in `vert_coords` to get the vertex coordinates.
+        A 2D int32 array containing 3 vertex indices per face. Look at the respective indices in `vert_coords` to get the vertex coordinates.
 
     meta_data: dictionary
         Contains detailed information on the data that was loaded. The following keys are available (replace `?h` with the value of the argument `hemisphere_label`, which must be 'lh' or 'rh').
@@ -412,16 +420,20 @@ def read_fs_surface_file_and_record_meta_data(surf_file, hemisphere_label, meta_
     Examples
     --------
     >>> vert_coords, faces, meta_data = fsd.read_fs_surface_file_and_record_meta_data(surf_file, 'lh')
-    >>> print meta_data['lh.num_vertices']
+    >>> print(meta_data['lh.num_vertices'])
     121567                  # arbitrary number, depends on the subject mesh
     """
-    if hemisphere_label not in ('lh', 'rh'):
+    if hemisphere_label not in _VALID_HEMISPHERE_LABELS:
         raise ValueError("ERROR: hemisphere_label must be one of {'lh', 'rh'} but is '%s'." % hemisphere_label)
 
     if meta_data is None:
         meta_data = {}
 
-    vert_coords, faces = fsio.read_geometry(surf_file)
+    surf_file = os.fspath(surf_file)
+    vert_coords, faces = _read_geometry_cached(surf_file, os.path.getmtime(surf_file))
+    # Return copies, so that callers which modify the arrays do not alter the cached ones.
+    vert_coords = vert_coords.copy()
+    faces = faces.copy()
 
     label_num_vertices = hemisphere_label + '.num_vertices'
     meta_data[label_num_vertices] = vert_coords.shape[0]
@@ -434,6 +446,80 @@ def read_fs_surface_file_and_record_meta_data(surf_file, hemisphere_label, meta_
 
     return vert_coords, faces, meta_data
 
+@functools.lru_cache(maxsize=8)
+def _read_geometry_cached(surf_file, mtime):
+    """
+    Read a surface file, caching the result per file path and modification time.
+
+    Studies usually display the data of many subjects on the same (average subject) surface, so the same surface file is read over and over again. The modification time is part of the cache key, so a changed file is read again. Callers must not modify the returned arrays, they are shared between all calls with the same arguments.
+
+    Parameters
+    ----------
+    surf_file: string
+        Path to a surface file in FreeSurfer format, e.g., 'lh.white'.
+
+    mtime: float
+        The modification time of the file, as returned by ```os.path.getmtime```. Only used as part of the cache key.
+
+    Returns
+    -------
+    vert_coords: numpy 2D float32 array
+        The vertex coordinates. The file stores 32 bit floats, but nibabel returns them as float64.
+
+    faces: numpy 2D int32 array
+        The faces, in native byte order (the file stores them in big endian byte order).
+    """
+    vert_coords, faces = fsio.read_geometry(surf_file)
+    return vert_coords.astype(np.float32), faces.astype(np.int32)
+
+
+@functools.lru_cache(maxsize=8)
+def _read_morph_data_cached(curv_file, mtime):
+    """
+    Read a morphometry data file in curv format, caching the result per file path and modification time.
+
+    See ```_read_geometry_cached```. Callers must not modify the returned array.
+
+    Parameters
+    ----------
+    curv_file: string
+        Path to a morphometry data file in FreeSurfer curv format, e.g., 'lh.area'.
+
+    mtime: float
+        The modification time of the file, as returned by ```os.path.getmtime```. Only used as part of the cache key.
+
+    Returns
+    -------
+    numpy 1D array
+        The per-vertex data.
+    """
+    return _read_curv_file(curv_file)
+
+
+def _read_curv_file(curv_file):
+    """
+    Read a morphometry data file in the new FreeSurfer curv format with a single read call.
+
+    Reads the whole file into memory and interprets the data as an array, without parsing the header field by field. The new curv format starts with the 3 byte magic number 0xFFFFFF, followed by the big endian int32 values for the vertex count, the face count and the number of values per vertex, and then the big endian float32 data. Files in the old format are read with nibabel.
+
+    Parameters
+    ----------
+    curv_file: string
+        Path to a morphometry data file in FreeSurfer curv format, e.g., 'lh.area'.
+
+    Returns
+    -------
+    numpy 1D array
+        The per-vertex data. For files in the new format, this is a read-only big endian float32 array.
+    """
+    with open(curv_file, 'rb') as curv_file_handle:
+        curv_data = curv_file_handle.read()
+    if curv_data[:3] != b'\xff\xff\xff':
+        return fsio.read_morph_data(curv_file)
+    num_verts = struct.unpack('>i', curv_data[3:7])[0]
+    return np.frombuffer(curv_data, dtype='>f4', count=num_verts, offset=15)
+
+
 def _deduce_hemisphere_label_from_file_path(file_path, default="lh"):
     """
     Guess a hemisphere label from a file path.
@@ -473,7 +559,7 @@ def read_fs_morphometry_data_file_and_record_meta_data(curv_file, hemisphere_lab
 
     Parameters
     ----------
-    curv_file: string
+    curv_file: string | os.PathLike
         A string representing a path to a morphometry file (e.g., the path to 'lh.area').
 
     hemisphere_label: {'lh' or 'rh'}
@@ -501,31 +587,96 @@ def read_fs_morphometry_data_file_and_record_meta_data(curv_file, hemisphere_lab
     >>> import brainload.freesurferdata as fsd; import os
     >>> lh_morphometry_file = os.path.join('my_subjects_dir', 'subject1', 'surf', 'lh.area')
     >>> lh_morphometry_data, meta_data = read_fs_morphometry_data_file_and_record_meta_data(lh_morphometry_file, 'lh')
-    >>> print meta_data['lh.num_data_points']
+    >>> print(meta_data['lh.num_data_points'])
     121567                  # arbitrary number, depends on the subject mesh
-    >>> print meta_data['lh.morphometry_file']
+    >>> print(meta_data['lh.morphometry_file'])
     my_subjects_dir/subject1/surf/lh.area             # on UNIX-like systems
     """
-    if format not in ('curv', 'mgh'):
+    if format not in _VALID_MORPHOMETRY_FORMATS:
         raise ValueError("ERROR: format must be one of {'curv', 'mgh'} but is '%s'." % format)
 
-    if hemisphere_label not in ('lh', 'rh'):
+    if hemisphere_label not in _VALID_HEMISPHERE_LABELS:
         raise ValueError("ERROR: hemisphere_label must be one of {'lh', 'rh'} but is '%s'." % hemisphere_label)
 
     if meta_data is None:
         meta_data = {}
 
+    curv_file = os.fspath(curv_file)
+    per_vertex_data = _read_morphometry_data_file(curv_file, format).astype(float)      # always a copy, so the cached data is never altered
+    meta_data = _record_morphometry_meta_data(meta_data, hemisphere_label, curv_file, format, per_vertex_data.shape[0])
+    return per_vertex_data, meta_data
+
+
+_MGH_DATA_TYPES = {0: '>u1', 1: '>i4', 3: '>f4', 4: '>i2'}     # MGH type codes: MRI_UCHAR, MRI_INT, MRI_FLOAT, MRI_SHORT
+_MGH_HEADER_SIZE = 284
+
+
+def _read_mgh_per_vertex_data(mgh_file):
+    """
+    Read the per-vertex data from an MGH or MGZ file, without parsing the full header.
+
+    Per-vertex data is stored in a volume with shape (num_verts, 1, 1). The MGH format stores the volume dimensions and data type in the first 24 bytes of the 284 byte header, followed by the voxel data in big endian column-major order. So the per-vertex data are the first num_verts values after the header, and only these are read. For MGZ files, this means that only the start of the file is decompressed. The values are read directly into the result array. Files with an unknown version or data type are read with nibabel.
+
+    Parameters
+    ----------
+    mgh_file: string
+        Path to a file in MGH or MGZ format, e.g., 'lh.area.fwhm10.fsaverage.mgh'.
+
+    Returns
+    -------
+    numpy 1D array
+        The per-vertex data, i.e., the first column of the volume. This is a big endian array in the data type of the file.
+    """
+    open_function = gzip.open if mgh_file.endswith(".mgz") else open
+    with open_function(mgh_file, 'rb') as mgh_file_handle:
+        header = mgh_file_handle.read(_MGH_HEADER_SIZE)
+        if len(header) == _MGH_HEADER_SIZE:
+            version, width, height, depth, num_frames, data_type = struct.unpack('>6i', header[:24])
+            if version == 1 and data_type in _MGH_DATA_TYPES:
+                per_vertex_data = np.empty((width, ), dtype=_MGH_DATA_TYPES[data_type])
+                num_bytes_read = mgh_file_handle.readinto(per_vertex_data)     # reads straight into the array, without an intermediate bytes object
+                if num_bytes_read != per_vertex_data.nbytes:
+                    raise ValueError("ERROR: The MGH file '%s' is truncated: expected %d data bytes, but found %d." % (mgh_file, per_vertex_data.nbytes, num_bytes_read))
+                return per_vertex_data
+    mgh_image = fsmgh.load(mgh_file)
+    return np.asarray(mgh_image.dataobj[(slice(None), ) + (0, ) * (len(mgh_image.shape) - 1)])
+
+
+def _read_morphometry_data_file(curv_file, format):
+    """
+    Read the per-vertex data from a morphometry file, without copying or converting it.
+
+    Parameters
+    ----------
+    curv_file: string
+        A string representing a path to a morphometry file (e.g., the path to 'lh.area').
+
+    format: {'curv', 'mgh'}
+        The file format. Files ending with '.mgh' or '.mgz' are always read in mgh format.
+
+    Returns
+    -------
+    numpy 1D array
+        The per-vertex data, in the data type of the file. This may be cached or memory-mapped data, so callers must not modify it.
+    """
     if format == 'mgh' or curv_file.endswith(".mgh") or curv_file.endswith(".mgz"):
-        full_mgh_data, mgh_meta_data = read_mgh_file(curv_file, collect_meta_data=False)
-        relevant_data_inner_array = full_mgh_data[:,0]
-        per_vertex_data = relevant_data_inner_array[:,0]
-    else:
-        per_vertex_data = fsio.read_morph_data(curv_file)
+        return _read_mgh_per_vertex_data(curv_file)
+    return _read_morph_data_cached(curv_file, os.path.getmtime(curv_file))
 
-    per_vertex_data = per_vertex_data.astype(float)
 
+def _record_morphometry_meta_data(meta_data, hemisphere_label, curv_file, format, num_data_points):
+    """
+    Record the meta data on a morphometry file that was read for a hemisphere.
+
+    See ```read_fs_morphometry_data_file_and_record_meta_data``` for the keys that are written.
+
+    Returns
+    -------
+    meta_data: dictionary
+        The input meta_data, with the keys for the hemisphere added.
+    """
     label_num_values = hemisphere_label + '.num_data_points'
-    meta_data[label_num_values] = per_vertex_data.shape[0]
+    meta_data[label_num_values] = num_data_points
 
     label_file = hemisphere_label + '.morphometry_file'
     meta_data[label_file] = curv_file
@@ -533,10 +684,10 @@ def read_fs_morphometry_data_file_and_record_meta_data(curv_file, hemisphere_lab
     label_file_format = hemisphere_label + '.morphometry_file_format'
     meta_data[label_file_format] = format
 
-    return per_vertex_data, meta_data
+    return meta_data
 
 
-def load_subject_mesh_files(lh_surf_file, rh_surf_file, hemi='both', meta_data=None):
+def load_subject_mesh_files(lh_surf_file, rh_surf_file, hemi='both', meta_data=None, parallel=True):
     """
     Load mesh files for a subject.
 
@@ -544,10 +695,10 @@ def load_subject_mesh_files(lh_surf_file, rh_surf_file, hemi='both', meta_data=N
 
     Parameters
     ----------
-    lh_surf_file: string | None
+    lh_surf_file: string | os.PathLike | None
         A string representing an absolute path to a mesh file for the left hemisphere (e.g., the path to 'lh.white'). If `hemi` is 'rh', this will be ignored and can thus be None.
 
-    rh_surf_file: string | None
+    rh_surf_file: string | os.PathLike | None
         A string representing an absolute path to a mesh file for the right hemisphere (e.g., the path to 'rh.white'). If `hemi` is 'lh', this will be ignored and can thus be None.
 
     hemi: {'both', 'lh', 'rh'}, optional
@@ -556,6 +707,9 @@ def load_subject_mesh_files(lh_surf_file, rh_surf_file, hemi='both', meta_data=N
     meta_data: dictionary | None, optional
         Meta data to merge into the output `meta_data`. Defaults to the empty dictionary.
 
+    parallel: bool, optional
+        Whether to read the files of the two hemispheres concurrently in two threads if `hemi` is 'both'. Defaults to True.
+
     Returns
     -------
     vert_coords: numpy array of floats
@@ -577,7 +731,7 @@ def load_subject_mesh_files(lh_surf_file, rh_surf_file, hemi='both', meta_data=N
     >>> rh_surf_file = os.path.join('my_subjects_dir', 'subject1', 'surf', 'rh.white')
     >>> vert_coords, faces, meta_data = fsd.load_subject_mesh_files(lh_surf_file, rh_surf_file)
     """
-    if hemi not in ('lh', 'rh', 'both'):
+    if hemi not in _VALID_HEMIS:
         raise ValueError("ERROR: hemi must be one of {'lh', 'rh', 'both'} but is '%s'." % hemi)
 
     if meta_data is None:
@@ -588,9 +742,12 @@ def load_subject_mesh_files(lh_surf_file, rh_surf_file, hemi='both', meta_data=N
     elif hemi == 'rh':
         vert_coords, faces, meta_data = read_fs_surface_file_and_record_meta_data(rh_surf_file, 'rh', meta_data=meta_data)
     else:
-        lh_vert_coords, lh_faces, meta_data = read_fs_surface_file_and_record_meta_data(lh_surf_file, 'lh', meta_data=meta_data)
-        rh_vert_coords, rh_faces, meta_data = read_fs_surface_file_and_record_meta_data(rh_surf_file, 'rh', meta_data=meta_data)
-        vert_coords, faces = _merge_meshes(np.array([[lh_vert_coords, lh_faces], [rh_vert_coords, rh_faces]]))
+        lh_result, rh_result = _read_both_hemispheres(functools.partial(read_fs_surface_file_and_record_meta_data, lh_surf_file, 'lh'), functools.partial(read_fs_surface_file_and_record_meta_data, rh_surf_file, 'rh'), parallel)
+        lh_vert_coords, lh_faces, lh_meta_data = lh_result
+        rh_vert_coords, rh_faces, rh_meta_data = rh_result
+        meta_data.update(lh_meta_data)
+        meta_data.update(rh_meta_data)
+        vert_coords, faces = _merge_meshes([(lh_vert_coords, lh_faces), (rh_vert_coords, rh_faces)])
     return vert_coords, faces, meta_data
 
 
@@ -616,11 +773,11 @@ def rhi(rh_relative_index, meta_data):
     --------
     >>> import brainload as bl
     >>> morphometry_data, meta_data = bl.subject('heinz', hemi='both')[2:4]
-    >>> print "rh value at index 10, relative to start of right hemisphere: %d." % morphometry_data[bl.rhi(10, meta_data)]
+    >>> print("rh value at index 10, relative to start of right hemisphere: %d." % morphometry_data[bl.rhi(10, meta_data)])
     """
     lh_key = 'lh.num_data_points'
     rh_key = 'rh.num_data_points'
-    if not isinstance(meta_data, collections.Mapping):
+    if not isinstance(meta_data, collections.abc.Mapping):
         raise ValueError("rhi: meta_data must be a meta data dictionary containing the keys '%s' and '%s'." % (lh_key, rh_key))
 
     if not ('lh.num_data_points' in meta_data and 'rh.num_data_points' in meta_data):
@@ -661,7 +818,7 @@ def hemi_range(morphometry_meta_data, hemi):
     >>> s, e = bl.hemi_range(meta_data, 'lh')
     >>> print("Mean lh thickness value is: %f" % (np.mean(morphometry_data[s:e])))
     """
-    if hemi not in ('lh', 'rh'):
+    if hemi not in _VALID_HEMISPHERE_LABELS:
         raise ValueError("ERROR: hemi must be one of {'lh', 'rh'} but is '%s'." % hemi)
 
     if hemi == 'lh':
@@ -695,14 +852,99 @@ def rhv(rh_relative_index, morphometry_data, meta_data):
     --------
     >>> import brainload as bl
     >>> morphometry_data, meta_data = bl.subject('heinz', hemi='both')[2:4]
-    >>> print "rh value at index 10, relative to start of right hemisphere: %d." % bl.rhv(10, morphometry_data, meta_data)
+    >>> print("rh value at index 10, relative to start of right hemisphere: %d." % bl.rhv(10, morphometry_data, meta_data))
     """
     abs_index = rhi(rh_relative_index, meta_data)
     return morphometry_data[abs_index]
 
 
 
-def load_subject_morphometry_data_files(lh_morphometry_data_file, rh_morphometry_data_file, hemi='both', format='curv', meta_data=None):
+def _get_hemisphere_read_executor():
+    """
+    Return the executor for parallel hemisphere reads, creating it on first use.
+
+    The executor has 2 worker threads and is shared by all calls of _read_both_hemispheres, so its threads are reused instead of being started and joined for every subject.
+
+    Returns
+    -------
+    concurrent.futures.ThreadPoolExecutor
+        The shared executor.
+    """
+    global _HEMISPHERE_READ_EXECUTOR
+    with _HEMISPHERE_READ_EXECUTOR_LOCK:
+        if _HEMISPHERE_READ_EXECUTOR is None:
+            _HEMISPHERE_READ_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+        return _HEMISPHERE_READ_EXECUTOR
+
+
+def _read_both_hemispheres(lh_read_function, rh_read_function, parallel):
+    """
+    Call the read functions for the left and the right hemisphere, optionally concurrently.
+
+    If parallel is True, the left hemisphere is read by the shared executor with 2 worker threads (see _get_hemisphere_read_executor) while the right hemisphere is read in the calling thread. Reading is mostly file I/O and decompression, during which the GIL is released, so the two reads overlap. If several threads call this function at the same time, at most 2 left hemisphere reads run concurrently and the others wait for a free worker. If the read functions record meta data, each must use a new dictionary, so that the threads do not share any state.
+
+    Parameters
+    ----------
+    lh_read_function: callable
+        A function without parameters that reads the data for the left hemisphere.
+
+    rh_read_function: callable
+        A function without parameters that reads the data for the right hemisphere.
+
+    parallel: bool
+        Whether to run the two functions concurrently.
+
+    Returns
+    -------
+    lh_result: any
+        The return value of lh_read_function.
+
+    rh_result: any
+        The return value of rh_read_function.
+    """
+    if not parallel:
+        return lh_read_function(), rh_read_function()
+    lh_future = _get_hemisphere_read_executor().submit(lh_read_function)
+    rh_result = rh_read_function()
+    return lh_future.result(), rh_result
+
+
+def _copy_morphometry_data_into(out, morphometry_data_arrays, morphometry_data_files):
+    """
+    Copy the morphometry data of one or two hemispheres into consecutive slices of an output array.
+
+    Parameters
+    ----------
+    out: numpy 1D array
+        The output array. Its length must equal the summed length of the input arrays.
+
+    morphometry_data_arrays: list of numpy 1D arrays
+        The data to copy, in order.
+
+    morphometry_data_files: list of strings
+        The files the data was read from. Only used in the error message.
+
+    Returns
+    -------
+    numpy 1D array
+        The output array.
+
+    Raises
+    ------
+    ValueError
+        If the shape of the output array does not match the data.
+    """
+    num_data_points = sum([morphometry_data.shape[0] for morphometry_data in morphometry_data_arrays])
+    if out.shape != (num_data_points, ):
+        raise ValueError("ERROR: The output array must have shape (%d, ) to hold the %d morphometry data values from the file(s) %s, but has shape %s." % (num_data_points, num_data_points, ", ".join(["'%s'" % (morphometry_data_file) for morphometry_data_file in morphometry_data_files]), str(out.shape)))
+    start_index = 0
+    for morphometry_data in morphometry_data_arrays:
+        out[start_index:start_index + morphometry_data.shape[0]] = morphometry_data
+        start_index += morphometry_data.shape[0]
+    return out
+
+
+def load_subject_morphometry_data_files(lh_morphometry_data_file, rh_morphometry_data_file, hemi='both', format='curv', meta_data=None, parallel=True, out=None):
     """
     Load morphometry data files for a subject.
 
@@ -710,10 +952,10 @@ def load_subject_morphometry_data_files(lh_morphometry_data_file, rh_morphometry
 
     Parameters
     ----------
-    lh_morphometry_data_file: string | None
+    lh_morphometry_data_file: string | os.PathLike | None
         A string representing an absolute path to a morphometry data file for the left hemisphere. If `hemi` is 'rh', this will be ignored and can thus be None.
 
-    rh_morphometry_data_file: string | None
+    rh_morphometry_data_file: string | os.PathLike | None
         A string representing an absolute path to a morphometry data file for the right hemisphere. If `hemi` is 'lh', this will be ignored and can thus be None.
 
     hemi: {'both', 'lh', 'rh'}, optional
@@ -725,10 +967,21 @@ def load_subject_morphometry_data_files(lh_morphometry_data_file, rh_morphometry
     meta_data: dictionary | None, optional
         Meta data to merge into the output `meta_data`. Defaults to the empty dictionary.
 
+    parallel: bool, optional
+        Whether to read the files of the two hemispheres concurrently in two threads if `hemi` is 'both'. Defaults to True.
+
+    out: numpy 1D array, optional
+        An array into which the data is written, instead of allocating a new one. Its length must equal the number of values in the loaded file(s), and the data is converted to its dtype. This allows callers like `group` to read the data of a subject directly into a row of a larger array. Defaults to None, which returns a new float array.
+
     Returns
     -------
     morphometry_data: numpy array
-        An array containing the scalar per-vertex data loaded from the file(s).
+        An array containing the scalar per-vertex data loaded from the file(s). This is `out` if it was given.
+
+    Raises
+    ------
+    ValueError
+        If `out` is given and its shape does not match the loaded data.
 
     meta_data: dictionary
         Contains detailed information on the data that was loaded. The following keys are available (depending on the value of the `hemi` argument, you can replace ?h with 'lh' or 'rh' or both 'lh' and 'rh'):
@@ -747,20 +1000,20 @@ def load_subject_morphometry_data_files(lh_morphometry_data_file, rh_morphometry
 
     Now let's look at the area value for the vertex at index 10:
 
-    >>> print "lh value at index 10: %d." % morphometry_data[10]
+    >>> print("lh value at index 10: %d." % morphometry_data[10])
 
     But what about the value of vertex 10 at the right hemisphere? We loaded 2 hemispheres, so the data is concatinated. But you can use the `meta_data` to get the correct index relative to the right hemisphere:
 
-    >>> print "rh value at index 10: %d." % morphometry_data[fsd.rhi(10, meta_data)]
+    >>> print("rh value at index 10: %d." % morphometry_data[fsd.rhi(10, meta_data)])
 
     You could also get the value directly using the `rhv` function:
 
-    >>> print "rh value at index 10: %d." % fsd.rhv(10, morphometry_data, meta_data)
+    >>> print("rh value at index 10: %d." % fsd.rhv(10, morphometry_data, meta_data))
     """
-    if hemi not in ('lh', 'rh', 'both'):
+    if hemi not in _VALID_HEMIS:
         raise ValueError("ERROR: hemi must be one of {'lh', 'rh', 'both'} but is '%s'." % hemi)
 
-    if format not in ('curv', 'mgh'):
+    if format not in _VALID_MORPHOMETRY_FORMATS:
         raise ValueError("ERROR: format must be one of {'curv', 'mgh'} but is '%s'." % format)
 
     if meta_data is None:
@@ -769,13 +1022,24 @@ def load_subject_morphometry_data_files(lh_morphometry_data_file, rh_morphometry
     if hemi == 'lh':
         morphometry_data, meta_data = read_fs_morphometry_data_file_and_record_meta_data(lh_morphometry_data_file, 'lh', meta_data=meta_data, format=format)
         meta_data['rh.num_data_points'] = 0
+        if out is not None:
+            morphometry_data = _copy_morphometry_data_into(out, [morphometry_data], [lh_morphometry_data_file])
     elif hemi == 'rh':
         morphometry_data, meta_data = read_fs_morphometry_data_file_and_record_meta_data(rh_morphometry_data_file, 'rh', meta_data=meta_data, format=format)
         meta_data['lh.num_data_points'] = 0
+        if out is not None:
+            morphometry_data = _copy_morphometry_data_into(out, [morphometry_data], [rh_morphometry_data_file])
     else:
-        lh_morphometry_data, meta_data = read_fs_morphometry_data_file_and_record_meta_data(lh_morphometry_data_file, 'lh', meta_data=meta_data, format=format)
-        rh_morphometry_data, meta_data = read_fs_morphometry_data_file_and_record_meta_data(rh_morphometry_data_file, 'rh', meta_data=meta_data, format=format)
-        morphometry_data = merge_morphometry_data(np.array([lh_morphometry_data, rh_morphometry_data]))
+        lh_morphometry_data_file = os.fspath(lh_morphometry_data_file)
+        rh_morphometry_data_file = os.fspath(rh_morphometry_data_file)
+        # Read the data of both hemispheres as stored in the files, and convert it to float while copying it into the merged array. This skips the float copy of each hemisphere that read_fs_morphometry_data_file_and_record_meta_data would make.
+        lh_morphometry_data, rh_morphometry_data = _read_both_hemispheres(functools.partial(_read_morphometry_data_file, lh_morphometry_data_file, format), functools.partial(_read_morphometry_data_file, rh_morphometry_data_file, format), parallel)
+        num_lh_data_points = lh_morphometry_data.shape[0]
+        if out is None:
+            out = np.empty((num_lh_data_points + rh_morphometry_data.shape[0], ), dtype=float)
+        morphometry_data = _copy_morphometry_data_into(out, [lh_morphometry_data, rh_morphometry_data], [lh_morphometry_data_file, rh_morphometry_data_file])
+        meta_data = _record_morphometry_meta_data(meta_data, 'lh', lh_morphometry_data_file, format, num_lh_data_points)
+        meta_data = _record_morphometry_meta_data(meta_data, 'rh', rh_morphometry_data_file, format, rh_morphometry_data.shape[0])
     return morphometry_data, meta_data
 
 
@@ -796,7 +1060,7 @@ def subject_mesh(subject_id, subjects_dir, surf='white', hemi='both'):
     hemi : {'both', 'lh', 'rh'}, optional
         The hemisphere that should be loaded. Defaults to 'both'.
 
-    subjects_dir: string
+    subjects_dir: string | os.PathLike
         A string representing the full path to a directory. This should be the directory containing all subjects of your study.
 
     Returns
@@ -848,7 +1112,7 @@ def fsaverage_mesh(subject_id='fsaverage', surf='white', hemi='both', subjects_d
     hemi : {'both', 'lh', 'rh'}, optional
         The hemisphere that should be loaded. Defaults to 'both'.
 
-    subjects_dir: string, optional
+    subjects_dir: string | os.PathLike, optional
         A string representing the full path to a directory. This should be the directory containing all subjects of your study. Defaults to the environment variable SUBJECTS_DIR if omitted. If that is not set, used the current working directory instead. This is the directory from which the application was executed.
 
     use_freesurfer_home_if_missing: boolean, optional
@@ -880,6 +1144,7 @@ def fsaverage_mesh(subject_id='fsaverage', surf='white', hemi='both', subjects_d
     >>> import brainload as bl
     >>> verts, faced, meta_data = bl.fsaverage_mesh()
     """
+    subjects_dir = _fspath_or_none(subjects_dir)
     if subjects_dir is None:
         subjects_dir = os.getenv('SUBJECTS_DIR', os.getcwd())
 
@@ -909,7 +1174,7 @@ def subject_data_native(subject_id, subjects_dir, measure, hemi, surf='white'):
     hemi : {'both', 'lh', 'rh'}
         The hemisphere that should be loaded.
 
-    subjects_dir: string
+    subjects_dir: string | os.PathLike
         A string representing the full path to a directory. This should be the directory containing all subjects of your study.
 
     Returns
@@ -959,7 +1224,7 @@ def subject_data_standard(subject_id, subjects_dir, measure, hemi, fwhm, average
     fwhm : string or None
         Which averaging version of the data should be loaded. FreeSurfer usually generates different standard space files with a number of smoothing settings. If None is passed, the `.fwhmX` part is omitted from the file name completely. Set this to '0' to get the unsmoothed version.
 
-    subjects_dir: string
+    subjects_dir: string | os.PathLike
         A string representing the full path to a directory. This should be the directory containing all subjects of your study.
 
     average_subject: string, optional
@@ -986,7 +1251,7 @@ def subject_data_standard(subject_id, subjects_dir, measure, hemi, fwhm, average
     return morphometry_data, meta_data
 
 
-def subject(subject_id, surf='white', measure='area', hemi='both', subjects_dir=None, meta_data=None, load_surface_files=True, load_morphometry_data=True):
+def subject(subject_id, surf='white', measure='area', hemi='both', subjects_dir=None, meta_data=None, load_surface_files=True, load_morphometry_data=True, load_morhology_data=None):
     """
     Load FreeSurfer brain morphometry and/or mesh data for a single subject.
 
@@ -1006,7 +1271,7 @@ def subject(subject_id, surf='white', measure='area', hemi='both', subjects_dir=
     hemi : {'both', 'lh', 'rh'}, optional
         The hemisphere that should be loaded. Defaults to 'both'.
 
-    subjects_dir: string, optional
+    subjects_dir: string | os.PathLike, optional
         A string representing the full path to a directory. This should be the directory containing all subjects of your study. Defaults to the environment variable SUBJECTS_DIR if omitted. If that is not set, used the current working directory instead. This is the directory from which the application was executed.
 
     meta_data: dictionary, optional
@@ -1018,6 +1283,9 @@ def subject(subject_id, surf='white', measure='area', hemi='both', subjects_dir=
     load_morphometry_data: boolean, optional
         Whether to load morphometry data. If set to `False`, the first return value `morphometry_data` will be `None`. Defaults to `True`.
 
+    load_morhology_data: boolean, optional
+        Deprecated alias for `load_morphometry_data`, the name used by brainload 0.3.0. If given, it overrides `load_morphometry_data` and a `DeprecationWarning` is issued. Defaults to `None`.
+
     Returns
     -------
     vert_coords: numpy array
@@ -1073,12 +1341,14 @@ def subject(subject_id, surf='white', measure='area', hemi='both', subjects_dir=
 
 
     """
-    if hemi not in ('lh', 'rh', 'both'):
+    if hemi not in _VALID_HEMIS:
         raise ValueError("ERROR: hemi must be one of {'lh', 'rh', 'both'} but is '%s'." % hemi)
 
     if meta_data is None:
         meta_data = {}
 
+    load_morphometry_data = _resolve_deprecated_load_morhology_data(load_morphometry_data, load_morhology_data)
+    subjects_dir = _fspath_or_none(subjects_dir)
     if subjects_dir is None:
         subjects_dir = os.getenv('SUBJECTS_DIR', os.getcwd())
     subject_surf_dir = os.path.join(subjects_dir, subject_id, 'surf')
@@ -1097,8 +1367,9 @@ def subject(subject_id, surf='white', measure='area', hemi='both', subjects_dir=
 
     morphometry_data = None
     if load_morphometry_data:
-        lh_morphometry_file = os.path.join(subject_surf_dir, ('lh.' + measure + _get_morphometry_data_suffix_for_surface(surf)))
-        rh_morphometry_file = os.path.join(subject_surf_dir, ('rh.' + measure + _get_morphometry_data_suffix_for_surface(surf)))
+        morphometry_file_name_part = measure + _get_morphometry_data_suffix_for_surface(surf)     # identical for both hemispheres
+        lh_morphometry_file = os.path.join(subject_surf_dir, 'lh.' + morphometry_file_name_part)
+        rh_morphometry_file = os.path.join(subject_surf_dir, 'rh.' + morphometry_file_name_part)
         morphometry_data, meta_data = load_subject_morphometry_data_files(lh_morphometry_file, rh_morphometry_file, hemi=hemi, format='curv', meta_data=meta_data)
     else:
         measure = None
@@ -1127,15 +1398,41 @@ def get_standard_space_morphometry_file_path(subjects_dir, subject_id, hemi, mea
     """
     Determine the path to a standard space morphometry file, e.g., `lh.area.fwhm10.fsaverage.mgh`.
     """
-    fwhm_tag = _get_fwhm_tag(fwhm)
-    return os.path.join(subjects_dir, subject_id, subdir, (hemi + '.' + measure + _get_morphometry_data_suffix_for_surface(surf) + fwhm_tag + '.' + average_subject + '.' + file_ext))
+    return os.path.join(subjects_dir, subject_id, subdir, _get_standard_space_morphometry_file_name(hemi, measure, fwhm=fwhm, average_subject=average_subject, surf=surf, file_ext=file_ext))
+
+
+def _get_standard_space_morphometry_file_name(hemi, measure, fwhm="10", average_subject="fsaverage", surf='white', file_ext='mgh'):
+    """
+    Determine the file name (without directory) of a standard space morphometry file, e.g., `lh.area.fwhm10.fsaverage.mgh`.
+    """
+    return hemi + _get_standard_space_morphometry_file_name_part(measure, fwhm=fwhm, average_subject=average_subject, surf=surf, file_ext=file_ext)
+
+
+def _get_standard_space_morphometry_file_names(measure, fwhm="10", average_subject="fsaverage", surf='white', file_ext='mgh'):
+    """
+    Determine the file names (without directory) of the standard space morphometry files of both hemispheres.
+
+    Returns
+    -------
+    dictionary
+        The file names, with the keys 'lh' and 'rh'. See `_get_standard_space_morphometry_file_name`.
+    """
+    file_name_part = _get_standard_space_morphometry_file_name_part(measure, fwhm=fwhm, average_subject=average_subject, surf=surf, file_ext=file_ext)     # identical for both hemispheres
+    return {'lh': 'lh' + file_name_part, 'rh': 'rh' + file_name_part}
+
+
+def _get_standard_space_morphometry_file_name_part(measure, fwhm="10", average_subject="fsaverage", surf='white', file_ext='mgh'):
+    """
+    Determine the hemisphere independent part of the file name of a standard space morphometry file, e.g., `.area.fwhm10.fsaverage.mgh`.
+    """
+    return ".%s%s%s.%s.%s" % (measure, _get_morphometry_data_suffix_for_surface(surf), _get_fwhm_tag(fwhm), average_subject, file_ext)
 
 
 def get_morphometry_file_path(subjects_dir, subject_id, surf, hemi, measure, subdir='surf'):
     """
     Determine the path to a native space morphometry file, e.g., `lh.area`.
     """
-    return os.path.join(subjects_dir, subject_id, subdir, (hemi + '.' + measure + _get_morphometry_data_suffix_for_surface(surf)))
+    return os.path.join(subjects_dir, subject_id, subdir, "%s.%s%s" % (hemi, measure, _get_morphometry_data_suffix_for_surface(surf)))
 
 
 def _get_fwhm_tag(fwhm_string):
@@ -1146,6 +1443,74 @@ def _get_fwhm_tag(fwhm_string):
     return fwhm_tag
 
 
+def _resolve_deprecated_load_morhology_data(load_morphometry_data, load_morhology_data):
+    """
+    Resolve the deprecated keyword argument `load_morhology_data` of `subject` and `subject_avg`.
+
+    Parameters
+    ----------
+    load_morphometry_data: boolean
+        The value of the keyword argument `load_morphometry_data`.
+
+    load_morhology_data: boolean or None
+        The value of the deprecated keyword argument `load_morhology_data`, or `None` if it was not given.
+
+    Returns
+    -------
+    boolean
+        Whether to load the morphometry data. The deprecated argument wins if it was given.
+    """
+    if load_morhology_data is None:
+        return load_morphometry_data
+    warnings.warn("The keyword argument 'load_morhology_data' is deprecated, use 'load_morphometry_data' instead.", DeprecationWarning, stacklevel=3)
+    return load_morhology_data
+
+
+def _advise_files_will_be_needed(file_paths):
+    """
+    Tell the operating system that the files will be read soon.
+
+    Calls `posix_fadvise` with `POSIX_FADV_WILLNEED` for each file, which makes the kernel start reading the files into the page cache in the background. This does nothing on platforms without `posix_fadvise`. Files that cannot be opened are skipped, the error will surface when they are actually read.
+
+    Parameters
+    ----------
+    file_paths: list of str
+        The paths of the files.
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    for file_path in file_paths:
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _fspath_or_none(path):
+    """
+    Convert a path-like object to a string once, at the boundary of the public API.
+
+    Parameters
+    ----------
+    path: string | os.PathLike | None
+        A path, e.g., a ```pathlib.Path```.
+
+    Returns
+    -------
+    string | None
+        The path as a string, or None if the input was None.
+    """
+    if path is None:
+        return None
+    return os.fspath(path)
+
+
 def _merge_meshes(meshes):
     """
     Merge several meshes into a single one.
@@ -1154,33 +1519,36 @@ def _merge_meshes(meshes):
 
     Parameters
     ----------
-    meshes: array-like
-        A array of meshes. Each mesh is represented as an array of length 2, where the entry at index 0 is the vertex list, and the one at index 2 is the face list.
+    meshes: list of tuples
+        A list of meshes. Each mesh is represented as a tuple (or list) of length 2, where the entry at index 0 is the vertex list, and the one at index 1 is the face list.
 
     Returns
     -------
     all_vert_coords: numpy array
-        An array of vertex coordinates with shape(3, n), where n is the sum of the vertex counts of all input meshes.
+        An array of vertex coordinates with shape(3, n), where n is the sum of the vertex counts of all input meshes. The data type is float32 if all input coordinates fit into it, float64 otherwise.
 
     all_faces: numpy_array (2d)
-        An array of faces with shape(3, m), where m is the sum of the face counts of all input meshes. For each face, each of its 3 values represent the vertex at the respective index in the `all_vert_coords` array.
+        An int32 array of faces with shape(3, m), where m is the sum of the face counts of all input meshes. For each face, each of its 3 values represent the vertex at the respective index in the `all_vert_coords` array.
     """
-    all_vert_coords = np.empty((0, 3), dtype=float)
-    all_faces = np.empty((0, 3), dtype=int)
-
-    for mesh in meshes:
-        new_vert_coords = mesh[0]
-        new_faces = mesh[1]
-        # Keep track of the total number of vertices we had *before* adding the new ones. This is the shift we need for the faces.
-        vertex_index_shift = all_vert_coords.shape[0]
-        all_vert_coords = np.vstack((all_vert_coords, new_vert_coords))
-
-        new_faces_shifted = new_faces + vertex_index_shift
-        all_faces = np.vstack((all_faces, new_faces_shifted))
+    # Allocate the merged arrays once and fill them mesh by mesh, instead of re-stacking the accumulated data for every mesh.
+    # The vertex coordinates keep single precision if all inputs have it (FreeSurfer stores them as 32 bit floats), and 32 bit vertex indices are more than enough for brain meshes.
+    all_vert_coords = np.empty((sum([vert_coords.shape[0] for vert_coords, faces in meshes]), 3), dtype=np.result_type(np.float32, *[vert_coords for vert_coords, faces in meshes]))
+    all_faces = np.empty((sum([faces.shape[0] for vert_coords, faces in meshes]), 3), dtype=np.int32)
+
+    if len(meshes) > 0:
+        np.concatenate([vert_coords for vert_coords, faces in meshes], axis=0, out=all_vert_coords)    # one copy per mesh, straight into the result
+
+    vertex_index_shift = 0
+    face_offset = 0
+    for new_vert_coords, new_faces in meshes:
+        # The vertex indices of the new faces are shifted by the total number of vertices we had *before* adding the new ones.
+        np.add(new_faces, vertex_index_shift, out=all_faces[face_offset:face_offset + new_faces.shape[0]])
+        vertex_index_shift += new_vert_coords.shape[0]
+        face_offset += new_faces.shape[0]
     return all_vert_coords, all_faces
 
 
-def subject_avg(subject_id, measure='area', surf='white', display_surf='white', hemi='both', fwhm='10', subjects_dir=None, average_subject='fsaverage', subjects_dir_for_average_subject=None, meta_data=None, load_surface_files=True, load_morphometry_data=True, custom_morphometry_files=None):
+def subject_avg(subject_id, measure='area', surf='white', display_surf='white', hemi='both', fwhm='10', subjects_dir=None, average_subject='fsaverage', subjects_dir_for_average_subject=None, meta_data=None, load_surface_files=True, load_morphometry_data=True, custom_morphometry_files=None, load_morhology_data=None, parallel=True, morphometry_data_out=None):
     """
     Load morphometry data that has been mapped to an average subject for a subject, i.e., standard space data.
 
@@ -1203,7 +1571,7 @@ def subject_avg(subject_id, measure='area', surf='white', display_surf='white',
     fwhm : string or None, optional
         Which averaging version of the data should be loaded. FreeSurfer usually generates different standard space files with a number of smoothing settings. Defaults to '10'. If None is passed, the `.fwhmX` part is omitted from the file name completely. Set this to '0' to get the unsmoothed version.
 
-    subjects_dir: string, optional
+    subjects_dir: string | os.PathLike, optional
         A string representing the full path to a directory. This should be the directory containing all subjects of your study. Defaults to the environment variable SUBJECTS_DIR if omitted. If that is not set, used the current working directory instead. This is the directory from which the application was executed.
 
     average_subject: string, optional
@@ -1212,7 +1580,7 @@ def subject_avg(subject_id, measure='area', surf='white', display_surf='white',
     display_surf: string, optional
         The surface of the average subject for which the mesh should be loaded, e.g., 'white', 'pial', 'inflated', or 'sphere'. Defaults to 'white'. Ignored if `load_surface_files` is `False`.
 
-    subjects_dir_for_average_subject: string, optional
+    subjects_dir_for_average_subject: string | os.PathLike, optional
         A string representing the full path to a directory. This can be used if the average subject is not in the same directory as all your study subjects. Defaults to the setting of `subjects_dir`.
 
     meta_data: dictionary, optional
@@ -1227,6 +1595,15 @@ def subject_avg(subject_id, measure='area', surf='white', display_surf='white',
     custom_morphometry_files: dictionary, optional
         Cutom filenames for the left and right hemispjere data files that should be loaded. A dictionary of strings with exactly the following two keys: `lh` and `rh`. The value strings must contain hardcoded file names or template strings for them. As always, the files will be loaded relative to the `surf/` directory of the respective subject. Example: `{'lh': 'lefthemi.nonstandard.mymeasure44.mgh', 'rh': 'righthemi.nonstandard.mymeasure44.mgh'}`.
 
+    load_morhology_data: boolean, optional
+        Deprecated alias for `load_morphometry_data`, the name used by brainload 0.3.0. If given, it overrides `load_morphometry_data` and a `DeprecationWarning` is issued. Defaults to `None`.
+
+    parallel: bool, optional
+        Whether to read the files of the two hemispheres concurrently in two threads if `hemi` is 'both'. Defaults to True.
+
+    morphometry_data_out: numpy 1D array, optional
+        An array into which the morphometry data is written, instead of allocating a new one. See the `out` parameter of `load_subject_morphometry_data_files`. Defaults to None.
+
     Returns
     -------
     vert_coords: numpy array
@@ -1266,7 +1643,7 @@ def subject_avg(subject_id, measure='area', surf='white', display_surf='white',
 
     >>> import brainload as bl
     >>> v, f, data, md = bl.subject_avg('subject1')
-    >>> print md['surf']
+    >>> print(md['surf'])
     white
 
     Here, we are a bit more picky and explicit about what we want to load:
@@ -1283,9 +1660,12 @@ def subject_avg(subject_id, measure='area', surf='white', display_surf='white',
     >>> data, md = bl.subject_avg('subject1', hemi='rh', fwhm='15', load_surface_files=False)[2:4]
 
     """
-    if hemi not in ('lh', 'rh', 'both'):
+    if hemi not in _VALID_HEMIS:
         raise ValueError("ERROR: hemi must be one of {'lh', 'rh', 'both'} but is '%s'." % hemi)
 
+    load_morphometry_data = _resolve_deprecated_load_morhology_data(load_morphometry_data, load_morhology_data)
+    subjects_dir = _fspath_or_none(subjects_dir)
+    subjects_dir_for_average_subject = _fspath_or_none(subjects_dir_for_average_subject)
     if subjects_dir is None:
         subjects_dir = os.getenv('SUBJECTS_DIR', os.getcwd())
 
@@ -1303,7 +1683,7 @@ def subject_avg(subject_id, measure='area', surf='white', display_surf='white',
         fsaverage_surf_dir = os.path.join(subjects_dir_for_average_subject, average_subject, 'surf')
         lh_surf_file = os.path.join(fsaverage_surf_dir, ('lh.' + display_surf))
         rh_surf_file = os.path.join(fsaverage_surf_dir, ('rh.' + display_surf))
-        vert_coords, faces, meta_data = load_subject_mesh_files(lh_surf_file, rh_surf_file, hemi=hemi, meta_data=meta_data)
+        vert_coords, faces, meta_data = load_subject_mesh_files(lh_surf_file, rh_surf_file, hemi=hemi, meta_data=meta_data, parallel=parallel)
     else:
         display_surf = None
         display_subject = None
@@ -1311,22 +1691,35 @@ def subject_avg(subject_id, measure='area', surf='white', display_surf='white',
     # Parse the subject's morphometry data, mapped to standard space by FreeSurfer's recon-all.
     morphometry_data = None
     if load_morphometry_data:
-        subject_surf_dir = os.path.join(subjects_dir, subject_id, 'surf')
+        subject_surf_dir = os.path.join(subjects_dir, subject_id, 'surf')     # joined once, the file names below are only appended to it
 
         if custom_morphometry_files is None:
             meta_data['custom_morphometry_files_used'] = False
-            lh_morphometry_data_mapped_to_fsaverage = get_standard_space_morphometry_file_path(subjects_dir, subject_id, 'lh', measure, fwhm=fwhm, average_subject=average_subject, surf=surf)
-            rh_morphometry_data_mapped_to_fsaverage = get_standard_space_morphometry_file_path(subjects_dir, subject_id, 'rh', measure, fwhm=fwhm, average_subject=average_subject, surf=surf)
+            morphometry_file_names = _get_standard_space_morphometry_file_names(measure, fwhm=fwhm, average_subject=average_subject, surf=surf)
         else:
             meta_data['custom_morphometry_files_used'] = True
-            lh_morphometry_data_mapped_to_fsaverage = os.path.join(subject_surf_dir, custom_morphometry_files['lh'])
-            rh_morphometry_data_mapped_to_fsaverage = os.path.join(subject_surf_dir, custom_morphometry_files['rh'])
+            morphometry_file_names = custom_morphometry_files
+        morphometry_files_mapped_to_fsaverage = {h: os.path.join(subject_surf_dir, morphometry_file_names[h]) for h in ('lh', 'rh')}
 
-        morphometry_data, meta_data = load_subject_morphometry_data_files(lh_morphometry_data_mapped_to_fsaverage, rh_morphometry_data_mapped_to_fsaverage, hemi=hemi, format='mgh', meta_data=meta_data)
+        morphometry_data, meta_data = load_subject_morphometry_data_files(morphometry_files_mapped_to_fsaverage['lh'], morphometry_files_mapped_to_fsaverage['rh'], hemi=hemi, format='mgh', meta_data=meta_data, parallel=parallel, out=morphometry_data_out)
     else:
         measure = None
 
+    _record_standard_space_meta_data(meta_data, measure, subject_id, subjects_dir, display_surf, display_subject, subjects_dir_for_average_subject, surf, average_subject, fwhm, hemi)
+    return vert_coords, faces, morphometry_data, meta_data
+
+
+def _record_standard_space_meta_data(meta_data, measure, subject_id, subjects_dir, display_surf, display_subject, subjects_dir_for_average_subject, surf, average_subject, fwhm, hemi):
+    """
+    Record the settings used to load standard space data of a subject in its meta data.
+
+    Parameters
+    ----------
+    meta_data: dictionary
+        The meta data of the subject. It is modified in place.
 
+    All other parameters are the values to record, see `subject_avg` for their meaning.
+    """
     meta_data['measure'] = measure
     meta_data['subject_id'] = subject_id
     meta_data['subjects_dir'] = subjects_dir
@@ -1339,8 +1732,6 @@ def subject_avg(subject_id, measure='area', surf='white', display_surf='white',
     meta_data['fwhm'] = fwhm
     meta_data['hemi'] = hemi
 
-    return vert_coords, faces, morphometry_data, meta_data
-
 
 def group_native(measure, subjects_dir, subjects_list, surf='white', hemi='both'):
     """
@@ -1360,7 +1751,7 @@ def group_native(measure, subjects_dir, subjects_list, surf='white', hemi='both'
     hemi : {'both', 'lh', 'rh'}, optional
         The hemisphere that should be loaded. Defaults to 'both'.
 
-    subjects_dir: string, optional
+    subjects_dir: string | os.PathLike, optional
         A string representing the full path to a directory. Defaults to the environment variable SUBJECTS_DIR if omitted. If that is not set, used the current working directory instead. This is the directory from which the application was executed.
 
     subjects_list: list of strings, optional (unless `subjects_detection_mode` is set to `list`)
@@ -1384,7 +1775,7 @@ def group_native(measure, subjects_dir, subjects_list, surf='white', hemi='both'
     return morphdata_by_subject, metadata_by_subject
 
 
-def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, average_subject='fsaverage', group_meta_data=None, subjects_list=None, subjects_file='subjects.txt', subjects_file_dir=None, custom_morphometry_file_templates=None, subjects_detection_mode='auto'):
+def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, average_subject='fsaverage', group_meta_data=None, subjects_list=None, subjects_file='subjects.txt', subjects_file_dir=None, custom_morphometry_file_templates=None, subjects_detection_mode='auto', num_workers=None, dtype=np.float32, output_memmap=None, cache_dir=None, cache_invalidate=False, light_meta_data=False):
     """
     Load standard space morphometry data for a number of subjects.
 
@@ -1405,7 +1796,7 @@ def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, aver
     fwhm : string or None, optional
         Which averaging version of the data should be loaded. FreeSurfer usually generates different standard space files with a number of smoothing settings. Defaults to '10'. If None is passed, the `.fwhmX` part is omitted from the file name completely. Set this to '0' to get the unsmoothed version.
 
-    subjects_dir: string, optional
+    subjects_dir: string | os.PathLike, optional
         A string representing the full path to a directory. Defaults to the environment variable SUBJECTS_DIR if omitted. If that is not set, used the current working directory instead. This is the directory from which the application was executed.
 
     average_subject: string, optional
@@ -1418,7 +1809,7 @@ def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, aver
         A list of subject identifiers or directory names that should be loaded from the `subjects_dir`. Example list: `['subject1', 'subject2']`. Defaults to None. Only allowed if `subjects_detection_mode` is `auto` or `list`. In `auto` mode, this takes
         precedence over all other options, i.e., if a `subjects_list` *and* the (default or custom) `subjects_file` are given, the `subjects_list` will be used.
 
-    subjects_file_dir: string, optional
+    subjects_file_dir: string | os.PathLike, optional
         A string representing the full path to a directory. This directory must contain the `subjects_file` (see below). Defaults to the `subjects_dir`.
 
     subjects_file: string, optional
@@ -1447,10 +1838,28 @@ def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, aver
 
             - 'search_dir': In this mode, the `subjects_dir` (default or explicitely given) is searched for sub directories which look as if they could contain FreeSurfer data. The latter means that they contain a sub directory named 'surf'. There is one exception though: if the name of one such directory equals the name of the `average_subject`, the directory is skipped. You are not allowed to supply a `subjects_list` in this mode, or an error will be raised.
 
+    num_workers: int or None, optional
+        The number of threads used to load the data of the subjects concurrently. Loading is mostly file I/O and decompression, during which the GIL is released. Set this to 1 to load the subjects one after the other in the calling thread. Defaults to None, which uses one thread per subject, but at most as many as there are CPUs. The order of the subjects in the result does not depend on this setting. With a single thread, the two hemispheres of a subject are read concurrently instead, see the `parallel` parameter of `subject_avg`.
+
+    dtype: numpy dtype, optional
+        The data type of the returned `group_morphometry_data`. Defaults to `np.float32`, which is the precision in which FreeSurfer stores morphometry data, so no information is lost. Compared to `np.float64`, this halves the memory needed for the group data, e.g., from about 1.3 GB to about 650 MB for 500 subjects with both hemispheres of fsaverage.
+
+    output_memmap: string | os.PathLike or None, optional
+        Path to a file in which the group data is stored. If given, the data of each subject is written to this file as soon as it is loaded, and `group_morphometry_data` is a memory-mapped array backed by the file. This allows loading groups that do not fit into memory. The file is in the `.npy` format, so it can be opened again later with `np.load(output_memmap, mmap_mode='r')`. An existing file is overwritten. Defaults to None, which keeps the group data in memory. If the subjects list is empty, no file is written.
+
+    cache_dir: string | os.PathLike or None, optional
+        Path to a directory in which the group data and the per-subject meta data are cached between calls. The cache file name is a hash of the settings and of the path, modification time and size of every morphometry file that is loaded, so a cached result is only used as long as none of the files has changed. If a cached result exists, it is returned without parsing any morphometry file. Otherwise, the data is loaded and written to the cache. The directory is created if it does not exist. Cannot be combined with `output_memmap`. Defaults to None, which disables the cache.
+
+    cache_invalidate: bool, optional
+        Whether to ignore an existing cached result for these settings and overwrite it with freshly loaded data. Only used if `cache_dir` is given. Defaults to False.
+
+    light_meta_data: bool, optional
+        Whether to store the meta data entries that are identical for all subjects only once. If True, the keys 'measure', 'subjects_dir', 'display_surf', 'display_subject', 'average_subjects_dir', 'surf', 'space', 'average_subject', 'fwhm', 'hemi', 'custom_morphometry_files_used', and '?h.morphometry_file_format' are removed from the meta data of each subject in `group_meta_data`, and stored once in `run_meta_data['common_subject_meta_data']` instead. This saves memory for large groups. Defaults to False.
+
     Returns
     -------
     group_morphometry_data: numpy array
-        An array filled with the morphometry data for the subjects. The array has shape `(n, m)` where `n` is the number of subjects, and `m` is the number of vertices of the standard subject. (If you load both hemispheres instead of one, m doubles.) To get the subject id for the entries, look at the respective index in the returned `subjects_list`.
+        An array filled with the morphometry data for the subjects. The array has shape `(n, m)` where `n` is the number of subjects, and `m` is the number of vertices of the standard subject. (If you load both hemispheres instead of one, m doubles.) The data type is given by the `dtype` parameter. To get the subject id for the entries, look at the respective index in the returned `subjects_list`.
 
     subjects_list: list of strings
         A list containing the subject identifiers in the same order as the data in `group_morphometry_data`. (If `subjects_detection_mode` is 'list' or 'file', the order in these is guaranteed to be preserved. But in mode 'search_dir' or 'auto' which may have chosen to fall back to 'search_dir' as a last resort, this is helpful: You can use the index of a subject in this list to find its data in `group_morphometry_data`, as it will have the same index. See the examples below.)
@@ -1488,12 +1897,12 @@ def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, aver
     Continuing the last example, we may want to have a look at the curv value of the vertex at index 100000 of the subject 'subject4':
 
     >>> subject4_idx = subjects.index('subject4')
-    >>> print data[subject4_idx][100000]
+    >>> print(data[subject4_idx][100000])
 
     """
 
 
-    if hemi not in ('lh', 'rh', 'both'):
+    if hemi not in _VALID_HEMIS:
         raise ValueError("ERROR: hemi must be one of {'lh', 'rh', 'both'} but is '%s'." % hemi)
 
     run_meta_data = {}
@@ -1507,6 +1916,8 @@ def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, aver
     if subjects_detection_mode in ('file', 'search_dir') and subjects_list is not None:
         raise ValueError("ERROR: subjects_detection_mode is set to '%s' but a subjects_list was given. Not supported in subjects_detection_mode 'file' and 'search_dir'." % subjects_detection_mode)
 
+    subjects_dir = _fspath_or_none(subjects_dir)
+    subjects_file_dir = _fspath_or_none(subjects_file_dir)
     if subjects_dir is None:
         subjects_dir = os.getenv('SUBJECTS_DIR', os.getcwd())
 
@@ -1527,7 +1938,11 @@ def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, aver
     else:
         # we are in modes 'auto' or 'file'
         subjects_file_with_path = os.path.join(subjects_file_dir, subjects_file)
-        assumed_subjects_file_exists = os.path.isfile(subjects_file_with_path)
+        try:    # just try to read the file instead of checking whether it exists first, which would need another file system round-trip
+            subjects_list = nit.read_subjects_file(subjects_file_with_path)
+            assumed_subjects_file_exists = True
+        except (FileNotFoundError, IsADirectoryError, NotADirectoryError):
+            assumed_subjects_file_exists = False
 
         # in file mode, the file has to exist.
         if subjects_detection_mode == 'file' and not assumed_subjects_file_exists:
@@ -1535,7 +1950,6 @@ def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, aver
 
         auto_mode_done = False
         if assumed_subjects_file_exists:    # we are still in modes 'auto' or 'file', and the file exists.
-            subjects_list = nit.read_subjects_file(subjects_file_with_path)
             run_meta_data['subjects_file_used'] = True
             run_meta_data['subjects_file'] = subjects_file_with_path
             if subjects_detection_mode == 'auto':   # in auto mode, we prefer/use the subject file if it exists. If it does not exist, we try to guess the list from the directory later.
@@ -1553,28 +1967,177 @@ def group(measure, surf='white', hemi='both', fwhm='10', subjects_dir=None, aver
     else:
         run_meta_data['custom_morphometry_file_templates_used'] = False
 
-    group_morphometry_data = []
+    surf_file_part = _get_morphometry_data_suffix_for_surface(surf)     # identical for all subjects
+
+    if custom_morphometry_file_templates is not None:
+        # Only the subject id changes between subjects: parse the templates and build the rest of the substitutions once.
+        custom_morphometry_file_template_lh = string.Template(custom_morphometry_file_templates['lh'])
+        custom_morphometry_file_template_rh = string.Template(custom_morphometry_file_templates['rh'])
+        substitution_dict_lh = {'MEASURE': measure, 'SURF_RAW': surf, 'SURF': surf_file_part, 'HEMI': 'lh', 'FWHM': fwhm, 'AVERAGE_SUBJECT': average_subject}
+        substitution_dict_rh = dict(substitution_dict_lh, HEMI='rh')
+    else:
+        standard_space_morphometry_file_names = _get_standard_space_morphometry_file_names(measure, fwhm=fwhm, average_subject=average_subject, surf=surf)
+
+    # Plan the files of all subjects in one pass, so the cache key, the prefetching and the loading all use the same paths and do not each fill the templates and build the paths again.
+    hemis = ('lh', 'rh') if hemi == 'both' else (hemi, )
+    morphometry_files_by_subject = []
     for subject_id in subjects_list:
+        if custom_morphometry_file_templates is None:
+            morphometry_file_names = standard_space_morphometry_file_names
+        else:
+            morphometry_file_names = {'lh': custom_morphometry_file_template_lh.substitute(substitution_dict_lh, SUBJECT_ID=subject_id), 'rh': custom_morphometry_file_template_rh.substitute(substitution_dict_rh, SUBJECT_ID=subject_id)}
+        subject_surf_dir = os.path.join(subjects_dir, subject_id, 'surf')
+        morphometry_files_by_subject.append({h: os.path.join(subject_surf_dir, morphometry_file_names[h]) for h in ('lh', 'rh')})
+
+    def _advise_subject_files_will_be_needed(subject_idx):
+        if subject_idx >= len(subjects_list):
+            return
+        _advise_files_will_be_needed([morphometry_files_by_subject[subject_idx][h] for h in hemis])
+
+    def _load_one_subject(subject_idx, morphometry_data_out=None):
+        # Does what subject_avg does without loading surface files, but reads the planned files.
+        subject_id = subjects_list[subject_idx]
+        morphometry_files = morphometry_files_by_subject[subject_idx]
+        subject_meta_data = {'custom_morphometry_files_used': custom_morphometry_file_templates is not None}
+        morphometry_data, subject_meta_data = load_subject_morphometry_data_files(morphometry_files['lh'], morphometry_files['rh'], hemi=hemi, format='mgh', meta_data=subject_meta_data, parallel=(num_workers <= 1), out=morphometry_data_out)     # the hemispheres are only read in parallel if the subjects are not, so at most max(num_workers, 2) threads read files
+        _record_standard_space_meta_data(subject_meta_data, measure, subject_id, subjects_dir, None, None, subjects_dir, surf, average_subject, fwhm, hemi)
+        return morphometry_data, subject_meta_data
+
+    if len(subjects_list) == 0:
+        return np.array([], dtype=dtype), subjects_list, group_meta_data, run_meta_data
+
+    if cache_dir is not None:
+        if output_memmap is not None:
+            raise ValueError("ERROR: The parameters cache_dir and output_memmap cannot be combined.")
+        group_cache_file = _get_group_cache_file(os.fspath(cache_dir), (subjects_dir, subjects_list, measure, surf, hemi, fwhm, average_subject, custom_morphometry_file_templates, np.dtype(dtype).str), [morphometry_files[h] for morphometry_files in morphometry_files_by_subject for h in hemis])
+        if not cache_invalidate and os.path.isfile(group_cache_file) and os.path.isfile(group_cache_file + '.json'):
+            with open(group_cache_file + '.json', 'r') as meta_data_file_handle:
+                group_meta_data.update(json.load(meta_data_file_handle))
+            if light_meta_data:
+                _move_common_subject_meta_data(group_meta_data, subjects_list, run_meta_data)
+            return np.load(group_cache_file), subjects_list, group_meta_data, run_meta_data
+
+    if num_workers is None:
+        num_workers = min(len(subjects_list) - 1, os.cpu_count() or 8)
+    prefetch_distance = max(num_workers, 1)     # while a subject is loaded, the OS reads the files of the subject that is loaded when this load has finished
+    for subject_idx in range(1, prefetch_distance + 1):
+        _advise_subject_files_will_be_needed(subject_idx)
+
+    # The number of vertices is only known once the first subject has been loaded. Allocate the result for all subjects then, and let the loads of all other subjects write their data directly into their row.
+    first_subject_morphometry_data, first_subject_meta_data = _load_one_subject(0)
+    group_morphometry_data_shape = (len(subjects_list), first_subject_morphometry_data.shape[0])
+    if output_memmap is None:
+        group_morphometry_data = np.empty(group_morphometry_data_shape, dtype=dtype)
+    else:
+        group_morphometry_data = np.lib.format.open_memmap(os.fspath(output_memmap), mode='w+', dtype=dtype, shape=group_morphometry_data_shape)
+    group_morphometry_data[0] = first_subject_morphometry_data
 
-        custom_morphometry_files = None
-        subject_meta_data = {}
-        if custom_morphometry_file_templates is not None:
-            surf_file_part = _get_morphometry_data_suffix_for_surface(surf)
-            substitution_dict_lh = {'MEASURE': measure, 'SURF_RAW': surf, 'SURF': surf_file_part, 'HEMI': 'lh', 'FWHM': fwhm, 'SUBJECT_ID': subject_id, 'AVERAGE_SUBJECT': average_subject}
-            substitution_dict_rh = {'MEASURE': measure, 'SURF_RAW': surf, 'SURF': surf_file_part, 'HEMI': 'rh', 'FWHM': fwhm, 'SUBJECT_ID': subject_id, 'AVERAGE_SUBJECT': average_subject}
-            custom_morphometry_file_lh = nit.fill_template_filename(custom_morphometry_file_templates['lh'], substitution_dict_lh)
-            custom_morphometry_file_rh = nit.fill_template_filename(custom_morphometry_file_templates['rh'], substitution_dict_rh)
-            custom_morphometry_files = {'lh': custom_morphometry_file_lh, 'rh': custom_morphometry_file_rh}
+    def _load_one_subject_into_row(subject_idx):
+        _advise_subject_files_will_be_needed(subject_idx + prefetch_distance)
+        return _load_one_subject(subject_idx, morphometry_data_out=group_morphometry_data[subject_idx])[1]     # the data is read directly into the row of the subject
 
-        # In the next function call, we discard the first two return values (vert_coords and faces), as these are None anyways because we did not load surface files.
-        subject_morphometry_data, subject_meta_data = subject_avg(subject_id, measure=measure, surf=surf, hemi=hemi, fwhm=fwhm, subjects_dir=subjects_dir, average_subject=average_subject, meta_data=subject_meta_data, load_surface_files=False, custom_morphometry_files=custom_morphometry_files)[2:4]
+    if num_workers > 1:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=num_workers) as executor:
+            subject_meta_data_list = list(executor.map(_load_one_subject_into_row, range(1, len(subjects_list))))     # map keeps the order of subjects_list
+    else:
+        subject_meta_data_list = [_load_one_subject_into_row(subject_idx) for subject_idx in range(1, len(subjects_list))]
 
+    for subject_id, subject_meta_data in zip(subjects_list, [first_subject_meta_data] + subject_meta_data_list):
         group_meta_data[subject_id] = subject_meta_data
-        group_morphometry_data.append(subject_morphometry_data)
-    group_morphometry_data = np.array(group_morphometry_data)
+    if output_memmap is not None:
+        group_morphometry_data.flush()
+    if cache_dir is not None:
+        _write_group_cache_file(group_cache_file, group_morphometry_data, {subject_id: group_meta_data[subject_id] for subject_id in subjects_list})
+    if light_meta_data:
+        _move_common_subject_meta_data(group_meta_data, subjects_list, run_meta_data)
     return group_morphometry_data, subjects_list, group_meta_data, run_meta_data
 
 
+_GROUP_COMMON_SUBJECT_META_DATA_KEYS = ('measure', 'subjects_dir', 'display_surf', 'display_subject', 'average_subjects_dir', 'surf', 'space', 'average_subject', 'fwhm', 'hemi', 'custom_morphometry_files_used', 'lh.morphometry_file_format', 'rh.morphometry_file_format')
+
+
+def _move_common_subject_meta_data(group_meta_data, subjects_list, run_meta_data):
+    """
+    Move the meta data entries that are identical for all subjects of a group from the per-subject meta data to the run meta data.
+
+    Parameters
+    ----------
+    group_meta_data: dictionary
+        The group meta data, see `group`. The dictionaries of the subjects are modified in place.
+
+    subjects_list: list of strings
+        The subjects in the group. Must not be empty.
+
+    run_meta_data: dictionary
+        The run meta data, see `group`. The key 'common_subject_meta_data' is added.
+    """
+    first_subject_meta_data = group_meta_data[subjects_list[0]]
+    run_meta_data['common_subject_meta_data'] = {key: first_subject_meta_data[key] for key in _GROUP_COMMON_SUBJECT_META_DATA_KEYS if key in first_subject_meta_data}
+    for subject_id in subjects_list:
+        subject_meta_data = group_meta_data[subject_id]
+        for key in run_meta_data['common_subject_meta_data']:
+            del subject_meta_data[key]
+
+
+def _get_group_cache_file(cache_dir, settings, morphometry_files):
+    """
+    Get the path of the file that caches the result of `group` for the given settings and files.
+
+    Parameters
+    ----------
+    cache_dir: string
+        The cache directory. It is created if it does not exist.
+
+    settings: tuple
+        All settings that determine the result, in a form that has a stable `repr`.
+
+    morphometry_files: list of strings
+        The paths of all morphometry files that are loaded. Their modification times and sizes become part of the key, so changed files invalidate the cached result. A missing file is part of the key as well, loading will fail with the usual error for it.
+
+    Returns
+    -------
+    string
+        The path of the npy cache file. The per-subject meta data is stored next to it, in a file with the additional extension '.json'. The files may or may not exist.
+    """
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    file_states = []
+    for morphometry_file in morphometry_files:
+        try:
+            morphometry_file_stat = os.stat(morphometry_file)
+            file_states.append((morphometry_file, morphometry_file_stat.st_mtime, morphometry_file_stat.st_size))
+        except OSError:
+            file_states.append((morphometry_file, None, None))
+    key = repr((settings, file_states))
+    return os.path.join(cache_dir, "group_%s.npy" % (hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()))
+
+
+def _write_group_cache_file(group_cache_file, group_morphometry_data, group_meta_data):
+    """
+    Write the result of `group` to its cache files.
+
+    The files are first written under temporary names and then renamed, so that a concurrent call never reads a partially written cache file.
+
+    Parameters
+    ----------
+    group_cache_file: string
+        The path of the npy cache file, see `_get_group_cache_file`.
+
+    group_morphometry_data: numpy 2D array
+        The group data.
+
+    group_meta_data: dictionary
+        The per-subject meta data. Must be serializable to JSON.
+    """
+    temp_suffix = '.%d.tmp' % (os.getpid())
+    with open(group_cache_file + temp_suffix, 'wb') as data_file_handle:
+        np.save(data_file_handle, group_morphometry_data)
+    with open(group_cache_file + '.json' + temp_suffix, 'w') as meta_data_file_handle:
+        json.dump(group_meta_data, meta_data_file_handle)
+    os.replace(group_cache_file + '.json' + temp_suffix, group_cache_file + '.json')
+    os.replace(group_cache_file + temp_suffix, group_cache_file)
+
+
 def parse_talairach_file(file_name):
     """
     Parse a talairach matrix from a talairach.xfm file.
@@ -6,9 +6,13 @@ Functions for exporting brain meshes to formats used by common 3D modeling softw
 
 import os
 import sys
+import io
 import numpy as np
 
-def mesh_to_obj(vertex_coords, faces):
+_ROWS_PER_CHUNK = 10000     # the number of rows formatted at once by _format_rows
+
+
+def mesh_to_obj(vertex_coords, faces, out=None):
     """
     Write an OBJ format string of a mesh.
 
@@ -22,18 +26,24 @@ def mesh_to_obj(vertex_coords, faces):
     faces: numpy array of integers
         A 2D array containing 3 vertex indices per face. Dimension is (m, 3) for m faces.
 
+    out: file-like object or None, optional
+        If given, the OBJ format string is written to this object (e.g., a file opened in text mode) piece by piece, and nothing is returned. The vertices and faces are formatted and written in chunks of rows, so the string for the whole mesh is never built in memory. Defaults to None, which returns the string.
+
     Returns
     -------
-    string
-        The OBJ format string for the mesh.
+    string or None
+        The OBJ format string for the mesh, or None if `out` is given.
     """
-    verts_rep = _obj_verts(vertex_coords)
-    faces_rep = _obj_faces(faces)
-    hdr = "# Generated by Brainload\n"
-    return ''.join([hdr, verts_rep, faces_rep])
+    stream = io.StringIO() if out is None else out
+    stream.write("# Generated by Brainload\n")
+    _obj_verts(vertex_coords, out=stream)
+    _obj_faces(faces, out=stream)
+    if out is None:
+        return stream.getvalue()
+    return None
 
 
-def mesh_to_off(vertex_coords, faces):
+def mesh_to_off(vertex_coords, faces, out=None):
     """
     Write an OFF format string of a mesh.
 
@@ -48,19 +58,25 @@ def mesh_to_off(vertex_coords, faces):
     faces: numpy array of integers
         A 2D array containing 3 vertex indices per face. Dimension is (m, 3) for m faces.
 
+    out: file-like object or None, optional
+        If given, the OFF string is written to this object (e.g., a file opened in text mode) piece by piece, and nothing is returned. The vertices and faces are formatted and written in chunks of rows, so the string for the whole mesh is never built in memory. Defaults to None, which returns the string.
+
     Returns
     -------
-    string
-        The OFF string for the mesh.
+    string or None
+        The OFF string for the mesh, or None if `out` is given.
     """
-    verts_rep = _off_verts(vertex_coords)
-    faces_rep = _off_faces(faces)
-    hdr = "OFF\n"
-    counts =  "%d %d %d\n" % (vertex_coords.shape[0], faces.shape[0], faces.shape[0] * 3)
-    return ''.join([hdr, counts, verts_rep, faces_rep])
+    stream = io.StringIO() if out is None else out
+    stream.write("OFF\n")
+    stream.write("%d %d %d\n" % (vertex_coords.shape[0], faces.shape[0], faces.shape[0] * 3))
+    _off_verts(vertex_coords, out=stream)
+    _off_faces(faces, out=stream)
+    if out is None:
+        return stream.getvalue()
+    return None
 
 
-def _obj_verts(vertex_coords):
+def _obj_verts(vertex_coords, out=None):
     """
     Return a string representing the vertices in OBJ format.
 
@@ -69,18 +85,18 @@ def _obj_verts(vertex_coords):
     vertex_coords: numpy array of floats
         A 2D array containing 3 coordinates for each vertex. Dimension is (n, 3) for n vertices.
 
+    out: file-like object or None, optional
+        If given, the string is written to this object instead of being returned. Defaults to None.
+
     Returns
     -------
-    string
-        The OBJ format string for the vertices.
+    string or None
+        The OBJ format string for the vertices, or None if `out` is given.
     """
-    if vertex_coords.shape[0] == 0:
-        return ''
-    vert_reps = ["v %f %f %f" % (v[0], v[1], v[2]) for v in vertex_coords]                      # x, y, z coords
-    return '\n'.join(vert_reps) + '\n'
+    return _format_rows("v %f %f %f\n", vertex_coords, out=out)                      # x, y, z coords
 
 
-def _obj_faces(faces):
+def _obj_faces(faces, out=None):
     """
     Return a string representing the faces in OBJ format.
 
@@ -89,18 +105,18 @@ def _obj_faces(faces):
     faces: numpy array of integers
         A 2D array containing 3 vertex indices per face. Dimension is (m, 3) for m faces.
 
+    out: file-like object or None, optional
+        If given, the string is written to this object instead of being returned. Defaults to None.
+
     Returns
     -------
-    string
-        The OBJ format string for the faces.
+    string or None
+        The OBJ format string for the faces, or None if `out` is given.
     """
-    if faces.shape[0] == 0:
-        return ''
-    face_reps = ["f %d %d %d" % (f[0]+1, f[1]+1, f[2]+1) for f in faces]                    # the 3 vertex indices defining the face, starting at 1
-    return '\n'.join(face_reps) + '\n'
+    return _format_rows("f %d %d %d\n", faces + 1, out=out)                    # the 3 vertex indices defining the face, starting at 1
 
 
-def _off_verts(vertex_coords):
+def _off_verts(vertex_coords, out=None):
     """
     Return a string representing the vertices in OFF format.
 
@@ -109,18 +125,18 @@ def _off_verts(vertex_coords):
     vertex_coords: numpy array of floats
         A 2D array containing 3 coordinates for each vertex. Dimension is (n, 3) for n vertices.
 
+    out: file-like object or None, optional
+        If given, the string is written to this object instead of being returned. Defaults to None.
+
     Returns
     -------
-    string
-        The OFF format string for the vertices.
+    string or None
+        The OFF format string for the vertices, or None if `out` is given.
     """
-    if vertex_coords.shape[0] == 0:
-        return ''
-    vert_reps = ["%f %f %f" % (v[0], v[1], v[2]) for v in vertex_coords]                      # x, y, z coords
-    return '\n'.join(vert_reps) + '\n'
+    return _format_rows("%f %f %f\n", vertex_coords, out=out)                      # x, y, z coords
 
 
-def _off_faces(faces):
+def _off_faces(faces, out=None):
     """
     Return a string representing the faces in OFF format.
 
@@ -129,19 +145,52 @@ def _off_faces(faces):
     faces: numpy array of integers
         A 2D array containing 3 vertex indices per face. Dimension is (m, 3) for m faces.
 
+    out: file-like object or None, optional
+        If given, the string is written to this object instead of being returned. Defaults to None.
+
     Returns
     -------
-    string
-        The OFF format string for the faces.
+    string or None
+        The OFF format string for the faces, or None if `out` is given.
     """
-    if faces.shape[0] == 0:
-        return ''
-    face_reps = ["3 %d %d %d" % (f[0], f[1], f[2]) for f in faces]         # vertex count and the 3 vertex indices defining the face, starting at 0
-    return '\n'.join(face_reps) + '\n'
+    return _format_rows("3 %d %d %d\n", faces, out=out)         # vertex count and the 3 vertex indices defining the face, starting at 0
+
+
+
+def _format_rows(row_format, data, out=None):
+    """
+    Format all rows of a 2D array with the same row format string, in chunks of rows.
+
+    For each chunk of ```_ROWS_PER_CHUNK``` rows, the format string is repeated once per row and applied to all values of the chunk in a single string formatting operation. This is a lot faster than formatting each row separately, while the memory needed for the intermediate strings stays bounded by the chunk size.
+
+    Parameters
+    ----------
+    row_format: string
+        The format string for a single row, including the line break. Must contain one conversion specifier per column, e.g., '%f %f %f\\n' for 3 columns.
+
+    data: numpy 2D array or tuple of numpy 2D arrays
+        The data, with shape (n, m) for n rows with m columns. If a tuple of arrays with n rows each is given, the rows of all arrays are formatted as a single row, in the order of the arrays.
 
+    out: file-like object or None, optional
+        If given, the formatted chunks are written to this object. Defaults to None, which returns the formatted rows.
 
+    Returns
+    -------
+    string or None
+        The formatted rows, or None if `out` is given.
+    """
+    stream = io.StringIO() if out is None else out
+    data_arrays = data if isinstance(data, tuple) else (data, )
+    num_rows = data_arrays[0].shape[0]
+    for chunk_start in range(0, num_rows, _ROWS_PER_CHUNK):
+        chunk = np.hstack([data_array[chunk_start:chunk_start + _ROWS_PER_CHUNK] for data_array in data_arrays])
+        stream.write((row_format * chunk.shape[0]) % tuple(chunk.ravel().tolist()))
+    if out is None:
+        return stream.getvalue()
+    return None
 
-def mesh_to_ply(vertex_coords, faces, vertex_colors=None):
+
+def mesh_to_ply(vertex_coords, faces, vertex_colors=None, binary=False, out=None):
     """
     Write a PLY format string of a mesh.
 
@@ -158,28 +207,44 @@ def mesh_to_ply(vertex_coords, faces, vertex_colors=None):
     vertex_colors: numpy array or None, optional
         A 2D array with shape (n, 4) assigning a color to each vertex (for the n vertices in vertex_coords). The 4 values in each column define the 4 channels of an RGBA color. Channel values should be given as integers in range 0..255. If omitted, no vertex colors will be included in the PLY format string.
 
+    binary: boolean, optional
+        Whether to write the binary little endian variant of the PLY format instead of the ASCII variant. The vertex and face data is then copied into the result as raw bytes, without any string formatting, which is a lot faster for large meshes and gives smaller files. The coordinates are stored as 32 bit floats, just like in the ASCII variant. Defaults to False.
+
+    out: file-like object or None, optional
+        If given, the PLY format string is written to this object (e.g., a file opened in text mode, or in binary mode if `binary` is True) piece by piece, and nothing is returned. The vertices and faces are formatted and written in chunks of rows, so the string for the whole mesh is never built in memory. Defaults to None, which returns the string.
+
     Returns
     -------
-    string
-        The PLY format string for the mesh.
+    string, bytes or None
+        The PLY format string for the mesh. If `binary` is True, this is a bytes object which must be written to a file opened in binary mode. None if `out` is given.
     """
     use_vertex_colors = vertex_colors is not None
     num_vertices = vertex_coords.shape[0]
     num_faces = faces.shape[0]
-    hdr = _ply_header(num_vertices, num_faces, use_vertex_colors=use_vertex_colors)
-    verts_rep = _ply_verts(vertex_coords, vertex_colors=vertex_colors)
-    faces_rep = _ply_faces(faces)
-    return ''.join([hdr, verts_rep, faces_rep])
+    hdr = _ply_header(num_vertices, num_faces, use_vertex_colors=use_vertex_colors, binary=binary)
+    if binary:
+        stream = io.BytesIO() if out is None else out
+        stream.write(hdr.encode('ascii'))
+        stream.write(_ply_verts_binary(vertex_coords, vertex_colors=vertex_colors))
+        stream.write(_ply_faces_binary(faces))
+    else:
+        stream = io.StringIO() if out is None else out
+        stream.write(hdr)
+        _ply_verts(vertex_coords, vertex_colors=vertex_colors, out=stream)
+        _ply_faces(faces, out=stream)
+    if out is None:
+        return stream.getvalue()
+    return None
 
 
-def _ply_header(num_vertices, num_faces, use_vertex_colors=False):
+def _ply_header(num_vertices, num_faces, use_vertex_colors=False, binary=False):
     """
     Return a string representing the PLY format header for the given data properties.
     """
     hdr_top = """ply
-format ascii 1.0
+format %s 1.0
 comment Generated by Brainload
-"""
+""" % ("binary_little_endian" if binary else "ascii")
 
     hdr_verts = """element vertex %d
 property float x
@@ -203,29 +268,52 @@ property uchar alpha
     return ''.join(hdr_elements)
 
 
-def _ply_verts(vertex_coords, vertex_colors=None):
+def _ply_verts(vertex_coords, vertex_colors=None, out=None):
     """
-    Return a string representing the vertices in PLY format. Vertex colors are optional.
+    Return a string representing the vertices in PLY format, or write it to `out`. Vertex colors are optional.
     """
-    if vertex_coords.shape[0] == 0:
-        return ''
-    vert_reps = ["%f %f %f" % (v[0], v[1], v[2]) for v in vertex_coords]                      # x, y, z coords
     if vertex_colors is not None:
-        col_reps = [" %d %d %d %d" % (c[0], c[1], c[2], c[3]) for c in vertex_colors]      # RGBA values of color
-        vert_col_reps = [i+j for i,j in zip(vert_reps, col_reps)]
-        return '\n'.join(vert_col_reps) + '\n'
+        return _format_rows("%f %f %f %d %d %d %d\n", (vertex_coords, vertex_colors), out=out)      # x, y, z coords and RGBA values of color
     else:
-        return '\n'.join(vert_reps) + '\n'
+        return _format_rows("%f %f %f\n", vertex_coords, out=out)                      # x, y, z coords
 
 
-def _ply_faces(faces):
+def _ply_faces(faces, out=None):
     """
-    Return a string representing the faces in PLY format.
+    Return a string representing the faces in PLY format, or write it to `out`.
+    """
+    return _format_rows("3 %d %d %d\n", faces, out=out)                    # the 3 vertex indices defining the face
+
+
+def _ply_verts_binary(vertex_coords, vertex_colors=None):
+    """
+    Return bytes representing the vertices in binary little endian PLY format. Vertex colors are optional.
+    """
+    if vertex_coords.shape[0] == 0:
+        return b''
+    vertex_fields = [('x', '<f4'), ('y', '<f4'), ('z', '<f4')]
+    if vertex_colors is not None:
+        vertex_fields += [('red', 'u1'), ('green', 'u1'), ('blue', 'u1'), ('alpha', 'u1')]
+    verts = np.empty((vertex_coords.shape[0], ), dtype=np.dtype(vertex_fields))
+    for coord_idx, field_name in enumerate(('x', 'y', 'z')):
+        verts[field_name] = vertex_coords[:, coord_idx]
+    if vertex_colors is not None:
+        for channel_idx, field_name in enumerate(('red', 'green', 'blue', 'alpha')):
+            verts[field_name] = vertex_colors[:, channel_idx]
+    return verts.tobytes()
+
+
+def _ply_faces_binary(faces):
+    """
+    Return bytes representing the faces in binary little endian PLY format.
     """
     if faces.shape[0] == 0:
-        return ''
-    face_reps = ["3 %d %d %d" % (f[0], f[1], f[2]) for f in faces]                    # the 3 vertex indices defining the face
-    return '\n'.join(face_reps) + '\n'
+        return b''
+    face_fields = np.dtype([('num_vertex_indices', 'u1'), ('vertex_indices', '<i4', (3, ))])
+    ply_faces = np.empty((faces.shape[0], ), dtype=face_fields)
+    ply_faces['num_vertex_indices'] = 3
+    ply_faces['vertex_indices'] = faces
+    return ply_faces.tobytes()
 
 
 def scalars_to_colors_matplotlib(data, matplotlib_cmap_name='viridis', data_normalization='linear', custom_cmap=None, scale=True):
@@ -330,19 +418,10 @@ def scalars_to_colors_clist(scalars, color_list):
         An array that assigns one color to each value from the scalars parameter (use the index).
     """
     num_colors = color_list.shape[0]
-    num_color_channels = color_list.shape[1]      # 3 or 4, depending on whether an alpha channel is included
     scalars = np.array(scalars)
     norm_scalars = _normalize_to_range_zero_one(scalars)
-    min_scalar = np.min(norm_scalars) # 0.0
-    max_scalar = np.max(norm_scalars) # 1.0
-    num_scalars = norm_scalars.shape[0]
-    assigned_colors = np.zeros((num_scalars, num_color_channels))
-
-    it = np.nditer(norm_scalars, flags=['f_index'])
-    while not it.finished:
-        assigned_colors[it.index][:] = _color_from_clist(it[0], color_list)
-        it.iternext()
-    return assigned_colors
+    color_list_indices = np.clip(np.floor(num_colors * norm_scalars).astype(int), 0, num_colors - 1)     # same mapping as _color_index_from_clist, for all scalars at once
+    return color_list[color_list_indices]
 
 
 def _color_from_clist(scalar_in_range_zero_to_one, color_list):
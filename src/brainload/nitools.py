@@ -5,9 +5,10 @@ Most of these functions interact with the filesystem to find data.
 """
 
 import os
+import io
 import csv
 import string
-import collections
+import collections.abc
 import numpy as np
 
 
@@ -84,14 +85,12 @@ def read_subjects_file(subjects_file, has_header_line=False, index_of_subject_id
     >>> import brainload.nitools as nit
     >>> subjects_ids = nit.read_subjects_file('/home/myuser/data/study5/subjects.txt')
     """
-    subject_ids = []
     with open(subjects_file, 'r') as sfh:
-        reader = csv.reader(sfh, **kwargs)
-        if has_header_line:
-            next(reader)
-        for row in reader:
-            subject_ids.append(row[index_of_subject_id_field])
-    return subject_ids
+        subjects_file_contents = sfh.read()     # a single read call for the whole file, instead of one per buffer of lines. The csv module still does the parsing, so quoting works as before.
+    reader = csv.reader(io.StringIO(subjects_file_contents), **kwargs)
+    if has_header_line:
+        next(reader)
+    return [row[index_of_subject_id_field] for row in reader]
 
 
 def detect_subjects_in_directory(subjects_dir, ignore_dir_names=None, required_subdirs_for_hits=None):
@@ -134,17 +133,18 @@ def detect_subjects_in_directory(subjects_dir, ignore_dir_names=None, required_s
     if required_subdirs_for_hits is None:
         required_subdirs_for_hits = [ 'surf' ]          # If you add more here, e.g., 'mri' and 'label', be sure to update the test data.
 
-    direct_sub_dirs = [os.path.join(subjects_dir, direct_child) for direct_child in os.listdir(subjects_dir) if os.path.isdir(os.path.join(subjects_dir, direct_child))]
+    # os.scandir gets the file type of the directory entries from the directory listing itself on most platforms, so this does not need a stat call per entry like os.path.isdir does.
+    direct_sub_dirs = [entry for entry in os.scandir(subjects_dir) if entry.is_dir()]
 
     for potential_subject_dir in direct_sub_dirs:
 
-        potential_subject_id = os.path.basename(potential_subject_dir)
+        potential_subject_id = potential_subject_dir.name
         if potential_subject_id in ignore_dir_names:
             continue
 
         is_missing_cruical_subdir = False           # Yes, we are using a programming language which cannot break out of nested for loops. ><
         for required_subdir in required_subdirs_for_hits:
-            if not os.path.isdir(os.path.join(potential_subject_dir, required_subdir)):
+            if not os.path.isdir(os.path.join(potential_subject_dir.path, required_subdir)):
                 is_missing_cruical_subdir = True
                 break
 
@@ -181,7 +181,7 @@ def fill_template_filename(template_string, substitution_dict):
     >>> import brainload.nitools as nit
     >>> template_str = '${HEMI}.white'
     >>> substitution_dict = {'HEMI' : 'lh'}
-    >>> print nit.fill_template_filename(template_str, substitution_dict)
+    >>> print(nit.fill_template_filename(template_str, substitution_dict))
     lh.white
     """
     return string.Template(template_string).substitute(substitution_dict)
@@ -211,10 +211,10 @@ def _check_hemi_dict(hemi_dict, both_required=True):
 
     >>> import brainload.nitools as nit
     >>> my_dict = {'lh' : 'lh.area', 'rh': 'rh.area'}
-    >>> print nit._check_hemi_dict(my_dict)
+    >>> print(nit._check_hemi_dict(my_dict))
     True
     """
-    if not isinstance(hemi_dict, collections.Mapping):
+    if not isinstance(hemi_dict, collections.abc.Mapping):
         return False
     if both_required:
         if not len(hemi_dict) == 2 or not ( 'lh' in hemi_dict and 'rh' in hemi_dict ):
@@ -262,7 +262,7 @@ def do_subject_files_exist(subjects_list, subjects_dir, filename=None, filename_
     >>> subjects_dir = subjects_dir = os.path.join(os.getenv('HOME'), 'data', 'my_study_x')
     >>> searched_file = 'lh.area'
     >>> missing = nit.do_subject_files_exist(subjects_list, subjects_dir, filename=searched_file)
-    >>> print "The file '%s' exists for %d of the %d subjects." % (searched_file, len(missing), len(subjects_list))
+    >>> print("The file '%s' exists for %d of the %d subjects." % (searched_file, len(missing), len(subjects_list)))
     """
     if filename is None and filename_template is None:
         raise ValueError("Exactly one of 'filename' or 'filename_template' must be given.")
@@ -293,8 +293,8 @@ def write_lines_to_text_file(lines, file_name, line_sep="\n"):
 
     Parameters
     ----------
-    lines: list of str
-        The lines, must not contain line ending.
+    lines: iterable of str
+        The lines, must not contain line ending. Can be a generator, the lines are streamed to the file.
 
     file_name: str
         Path to new text file to create (or overwrite if it exists).
@@ -304,8 +304,7 @@ def write_lines_to_text_file(lines, file_name, line_sep="\n"):
 
     """
     with open(file_name, 'w') as f:
-        for l in lines:
-            f.write("%s%s" % (l, line_sep))
+        f.writelines("%s%s" % (l, line_sep) for l in lines)
 
 
 
@@ -321,11 +320,41 @@ def write_BIDS_participants_file(file_name, subjects_list):
 
 
 def load_vertex_indices(vertex_indices_file):
-    return np.loadtxt(vertex_indices_file, dtype=np.uint32, delimiter=",")
+    """
+    Load vertex indices from a text file.
+
+    Load vertex indices from a text file that contains one vertex per line. Each line contains the vertex index, optionally followed by more integers (e.g., 3 RGB color values), separated by commata. The whole file is parsed by ```np.loadtxt``` in a single call.
+
+    Parameters
+    ----------
+    vertex_indices_file: str
+        Path to the text file.
+
+    Returns
+    -------
+    numpy 1D or 2D int32 array
+        If the lines contain only a vertex index, a 1D array with one entry per line. Otherwise, a 2D array with one row per line. A file with a single line still yields a 1D array of length 1 in the former case.
+    """
+    return np.loadtxt(vertex_indices_file, dtype=np.int32, delimiter=",", ndmin=1)
 
 
 def save_vertex_indices(vertex_indices_file, vertex_indices):
     np.savetxt(vertex_indices_file, vertex_indices, delimiter=",")
 
 def load_voxel_indices(vertex_indices_file):
-    return np.loadtxt(vertex_indices_file, dtype=np.uint32, delimiter=",")
+    """
+    Load voxel indices from a text file.
+
+    Load voxel indices from a text file that contains one voxel per line, given as integer indices into each dimension of the volume separated by commata. Example line: '0,23,188'.
+
+    Parameters
+    ----------
+    vertex_indices_file: str
+        Path to the text file.
+
+    Returns
+    -------
+    numpy 2D int array
+        Array with shape (n, d) for n voxels with d dimensions each. A file with a single line yields shape (1, d).
+    """
+    return np.loadtxt(vertex_indices_file, dtype=np.uint32, delimiter=",", ndmin=2)
@@ -133,7 +133,7 @@ def coords_a2s(coords):
     >>> import brainload.spatial as st; import numpy as np;
     >>> coords = np.array([[5, 7, 9], [6, 8, 10]])
     >>> x, y, z = st.coords_a2s(coords)
-    >>> print y[1]
+    >>> print(y[1])
     8
     """
     x = coords[:,0]
@@ -171,7 +171,7 @@ def coords_s2a(x, y, z):
     >>> y = np.array([7, 8])
     >>> z = np.array([9, 10])
     >>> coords = st.coords_s2a(x, y, z)
-    >>> print coords[1][2]
+    >>> print(coords[1][2])
     10
     """
     if np.isscalar(x) and np.isscalar(y) and np.isscalar(z):
@@ -225,8 +225,8 @@ def translate_3D_coordinates_along_axes(x, y, z, shift_x, shift_y, shift_z):
     >>> y = np.array([7, 8])
     >>> z = np.array([9, 10])
     >>> xt, yt, zt = st.translate_3D_coordinates_along_axes(x, y, z, 2, -4, 0)
-    >>> print "%d %d %d" % (xt[0], yt[0], zt[0])     # 7 3 9
-    >>> print "%d %d %d" % (xt[1], yt[1], zt[1])     # 8 4 10
+    >>> print("%d %d %d" % (xt[0], yt[0], zt[0]))     # 7 3 9
+    >>> print("%d %d %d" % (xt[1], yt[1], zt[1]))     # 8 4 10
     """
     x_shifted = x + shift_x
     y_shifted = y + shift_y
@@ -278,8 +278,8 @@ def scale_3D_coordinates(x, y, z, x_scale_factor, y_scale_factor=None, z_scale_f
     >>> y = np.array([7, 8])
     >>> z = np.array([9, 10])
     >>> xs, ys, zs = st.scale_3D_coordinates(x, y, z, 3.0)
-    >>> print "%d %d %d" % (xs[0], ys[0], zs[0])     # 15 21 27
-    >>> print "%d %d %d" % (xs[1], ys[1], zs[1])     # 18 24 30
+    >>> print("%d %d %d" % (xs[0], ys[0], zs[0]))     # 15 21 27
+    >>> print("%d %d %d" % (xs[1], ys[1], zs[1]))     # 18 24 30
     """
     if y_scale_factor is None:
         y_scale_factor = x_scale_factor
@@ -333,8 +333,8 @@ def mirror_3D_coordinates_at_axis(x, y, z, axis, mirror_at_axis_coordinate=None)
     >>> y = np.array([7, 8])
     >>> z = np.array([9, 10])
     >>> xm, ym, zm = st.mirror_3D_coordinates_at_axis(x, y, z, 'x', 0)
-    >>> print "%d %d %d" % (xm[0], ym[0], zm[0])     # -5 7 9
-    >>> print "%d %d %d" % (xm[1], ym[1], zm[1])     # -6 8 10
+    >>> print("%d %d %d" % (xm[0], ym[0], zm[0]))     # -5 7 9
+    >>> print("%d %d %d" % (xm[1], ym[1], zm[1]))     # -6 8 10
     """
     if axis not in ('x', 'y', 'z'):
         raise ValueError("ERROR: axis must be one of {'x', 'y', 'z'}")
@@ -403,8 +403,8 @@ def point_mirror_3D_coordinates(x, y, z, point_x, point_y, point_z):
     >>> y = np.array([7, 8])
     >>> z = np.array([9, 10])
     >>> xm, ym, zm = st.point_mirror_3D_coordinates(x, y, z, 0, 0, 0)
-    >>> print "%d %d %d" % (xm[0], ym[0], zm[0])     # -5 -7 -9
-    >>> print "%d %d %d" % (xm[1], ym[1], zm[1])     # -6 -8 -10
+    >>> print("%d %d %d" % (xm[0], ym[0], zm[0]))     # -5 -7 -9
+    >>> print("%d %d %d" % (xm[1], ym[1], zm[1]))     # -6 -8 -10
     """
     return _mirror_coordinates_at_axis(x, point_x), _mirror_coordinates_at_axis(y, point_y), _mirror_coordinates_at_axis(z, point_z)
 
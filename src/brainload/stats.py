@@ -58,11 +58,11 @@ def stat(file_name):
 
     And get some information on the table columns (the table header):
 
-    >>> print stats['table_meta_data']['NTableCols']   # will print "10" (from a simple table property stored directly in the dictionary).
+    >>> print(stats['table_meta_data']['NTableCols'])   # will print "10" (from a simple table property stored directly in the dictionary).
 
     Get the names of all the data columns:
 
-    >>> print ",".join(stats['table_column_headers'])
+    >>> print(",".join(stats['table_column_headers']))
 
     Get the name of the first column:
 
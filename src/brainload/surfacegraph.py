@@ -1,23 +1,22 @@
 # -*- coding: utf-8 -*-
 """
-Turn a surface mesh into a networkx graph. Useful for asking questions that can be answered using graph algorithms. An example would be to find, for a given source vertex, all vertices which are connected to it by a certain number of hops. Requires networkx.
+Turn a surface mesh into a networkx graph. Useful for asking questions that can be answered using graph algorithms. An example would be to find, for a given source vertex, all vertices which are connected to it by a certain number of hops. Building the networkx graph requires networkx, the neighborhood queries on the CSR adjacency only need numpy.
 """
 
+import os
+import hashlib
 import numpy as np
-import brainload as bl
-import brainload.freesurferdata as blfsd
-import networkx as nx
 
 class SurfaceGraph:
     """
     A graph representing the vertices and edges of a brain surface mesh.
     """
 
-    def __init__(self, verts, faces):
+    def __init__(self, verts, faces, adjacency_cache_file=None):
         """
         Init the graph from vertices and faces.
 
-        Init the graph from vertices and faces. Note that the faces are not stored directly in the graph, they are turned into edges and the information which edges form a face is lost (this is a graph, not a mesh representation). Also note that the verts and faces parameters which are required here fit the return values of any brainload function which loads a brain mesh, e.g., the ```subject_mesh``` function. When this constructor has finished, a networkx graph of the mesh is available at ```surface_graph_instance.graph```.
+        Init the graph from vertices and faces. Note that the faces are not stored directly in the graph, they are turned into edges and the information which edges form a face is lost (this is a graph, not a mesh representation). Also note that the verts and faces parameters which are required here fit the return values of any brainload function which loads a brain mesh, e.g., the ```subject_mesh``` function. When this constructor has finished, the adjacency of the vertices in compressed sparse row (CSR) format is available at ```surface_graph_instance.adjacency_indptr``` and ```surface_graph_instance.adjacency_indices```. A networkx graph of the mesh is available at ```surface_graph_instance.graph```, it is built on first access.
 
         Parameters
         ----------
@@ -26,31 +25,269 @@ class SurfaceGraph:
 
         faces: numpy 2D int array
             The faces in an array with shape (m, 3). Each of the m faces is identified by the indices of the 3 vertices that form it.
+
+        adjacency_cache_file: str or None, optional
+            Path to an npz file in which the CSR adjacency is cached between runs. If the file exists and matches the number of vertices, the adjacency is loaded from it instead of being computed. Otherwise, it is computed and written to the file. See ```get_adjacency_cache_file``` to get a suitable file name for a mesh file. Defaults to None, which disables the cache.
+        """
+        self.verts = verts
+        self.faces = faces
+        self.adjacency_indptr, self.adjacency_indices = _load_or_compute_adjacency_csr(faces, len(verts), adjacency_cache_file)
+        self._graph = None
+
+
+    @property
+    def graph(self):
         """
-        self.graph = nx.Graph()
-        for v_idx, v in enumerate(verts):
-            self.graph.add_node(v_idx, x=v[0], y=v[1], z=v[2])
-        for f_idx, f in enumerate(faces):
-            self.graph.add_edges_from([(f[0], f[1]), (f[1], f[2]), (f[2], f[0])])
+        The networkx graph of the mesh.
+
+        The graph is built on first access and then kept. Building it requires networkx and takes a lot longer than computing the CSR adjacency, so code that only runs neighborhood queries never pays for it.
+        """
+        if self._graph is None:
+            import networkx as nx
+            graph = nx.Graph()
+            for v_idx, v in enumerate(self.verts):
+                graph.add_node(v_idx, x=v[0], y=v[1], z=v[2])
+            for f_idx, f in enumerate(self.faces):
+                graph.add_edges_from([(f[0], f[1]), (f[1], f[2]), (f[2], f[0])])
+            self._graph = graph
+        return self._graph
 
 
-    def get_neighbors_up_to_dist(self, source_vert, dist):
+    def get_neighbors_up_to_dist(self, source_vert, dist, out=None):
         """
         Get all neighbors up to graph distance dist away.
 
-        Get all neighbors up to graph distance dist away. Note that dist is the number of edges to traverse in the graph to get from the source to the vertex. (It is NOT Euclidian distance.)
+        Get all neighbors up to graph distance dist away. Note that dist is the number of edges to traverse in the graph to get from the source to the vertex. (It is NOT Euclidian distance.) The search runs on the CSR adjacency of the mesh, see ```get_neighbors_up_to_dist_csr```.
 
         Parameters
         ----------
-        source_vert: int
-            Index of the source vertex.
+        source_vert: int or numpy 1D int array
+            Index of the source vertex. If several indices are given, the union of their neighborhoods is returned.
 
         dist: The distance up until which neighbors should be returned. This is the number of edges to traverse in the graph (along a shortest path of length dist from source to the respective neighbor).
 
+        out: numpy 1D int array, optional
+            A buffer with at least as many elements as there are vertices, into which the neighbors are written. See ```get_neighbors_up_to_dist_csr```.
+
         Returns
         -------
-        neighbors: list
-            The indices of all vertices which lie within distance dist of the source_vert.
+        neighbors: numpy 1D int array
+            The indices of all vertices which lie within distance dist of the source_vert, including the source_vert itself. If out is given, this is a view of its first elements.
         """
-        dist_dict = nx.single_source_shortest_path_length(self.graph, source_vert, cutoff=dist)
-        return dist_dict.keys()
+        return get_neighbors_up_to_dist_csr(self.adjacency_indptr, self.adjacency_indices, source_vert, dist, out=out)
+
+
+def get_adjacency_cache_file(mesh_file, cache_dir=None):
+    """
+    Get the path of the file that caches the CSR adjacency for a mesh file.
+
+    The file name is a BLAKE2b hash of the absolute path, the modification time and the size of the mesh file, so the cached adjacency is not used anymore once the mesh file has changed. The cache directory is created if it does not exist.
+
+    Parameters
+    ----------
+    mesh_file: str
+        Path to a mesh file, e.g., '<your_study>/subject1/surf/lh.white'.
+
+    cache_dir: str or None, optional
+        The directory holding the cache files. Defaults to None, which means the directory 'brainload' in $XDG_CACHE_HOME, or in '~/.cache' if that environment variable is not set.
+
+    Returns
+    -------
+    string
+        The path of the npz cache file for the mesh file. The file may or may not exist.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.getenv('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'brainload')
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    mesh_file_stat = os.stat(mesh_file)
+    key = "%s|%r|%d" % (os.path.abspath(mesh_file), mesh_file_stat.st_mtime, mesh_file_stat.st_size)
+    return os.path.join(cache_dir, "adjacency_%s.npz" % (hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()))
+
+
+def _load_or_compute_adjacency_csr(faces, num_verts, adjacency_cache_file):
+    """
+    Load the CSR adjacency from a cache file, or compute it and write it to the cache file.
+
+    Parameters
+    ----------
+    faces: numpy 2D int array
+        The faces in an array with shape (m, 3).
+
+    num_verts: int
+        The number of vertices of the mesh.
+
+    adjacency_cache_file: str or None
+        Path to the npz cache file. If None, the adjacency is computed and nothing is cached.
+
+    Returns
+    -------
+    adjacency_indptr: numpy 1D int32 array
+        See ```mesh_to_adjacency_csr```.
+
+    adjacency_indices: numpy 1D int32 array
+        See ```mesh_to_adjacency_csr```.
+    """
+    if adjacency_cache_file is not None and os.path.isfile(adjacency_cache_file):
+        with np.load(adjacency_cache_file) as cached:
+            adjacency_indptr, adjacency_indices = cached['adjacency_indptr'], cached['adjacency_indices']
+        if adjacency_indptr.shape[0] == num_verts + 1 and adjacency_indptr[-1] == adjacency_indices.shape[0]:
+            return adjacency_indptr, adjacency_indices
+    adjacency_indptr, adjacency_indices = mesh_to_adjacency_csr(faces, num_verts)
+    if adjacency_cache_file is not None:
+        np.savez_compressed(adjacency_cache_file, adjacency_indptr=adjacency_indptr, adjacency_indices=adjacency_indices)
+    return adjacency_indptr, adjacency_indices
+
+
+def mesh_to_adjacency_csr(faces, num_verts):
+    """
+    Compute the vertex adjacency of a mesh in compressed sparse row (CSR) format.
+
+    Compute the vertex adjacency of a mesh from its faces. The result is given as two flat arrays in CSR format: the neighbors of vertex i are ```adjacency_indices[adjacency_indptr[i]:adjacency_indptr[i+1]]```, sorted in ascending order. Edges shared by two faces are only listed once.
+
+    Parameters
+    ----------
+    faces: numpy 2D int array
+        The faces in an array with shape (m, 3). Each of the m faces is identified by the indices of the 3 vertices that form it.
+
+    num_verts: int
+        The number of vertices of the mesh.
+
+    Returns
+    -------
+    adjacency_indptr: numpy 1D int32 array
+        Array with shape (num_verts + 1, ). The offsets of the neighbor lists of the vertices in adjacency_indices.
+
+    adjacency_indices: numpy 1D int32 array
+        The concatenated neighbor lists of all vertices.
+    """
+    faces = np.asarray(faces)
+    edge_sources = np.concatenate((faces[:,0], faces[:,1], faces[:,2], faces[:,1], faces[:,2], faces[:,0]))
+    edge_targets = np.concatenate((faces[:,1], faces[:,2], faces[:,0], faces[:,0], faces[:,1], faces[:,2]))
+    order = np.lexsort((edge_targets, edge_sources))
+    edge_sources = edge_sources[order]
+    edge_targets = edge_targets[order]
+    is_first_occurrence = np.ones(edge_sources.shape[0], dtype=bool)
+    is_first_occurrence[1:] = (edge_sources[1:] != edge_sources[:-1]) | (edge_targets[1:] != edge_targets[:-1])
+    edge_sources = edge_sources[is_first_occurrence]
+    adjacency_indices = edge_targets[is_first_occurrence]
+    adjacency_indptr = np.zeros(num_verts + 1, dtype=np.int32)
+    np.cumsum(np.bincount(edge_sources, minlength=num_verts), out=adjacency_indptr[1:])
+    return adjacency_indptr, adjacency_indices.astype(np.int32, copy=False)
+
+
+def get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, source_verts, dist, out=None):
+    """
+    Get all neighbors up to graph distance dist away from the source vertices, based on a CSR adjacency.
+
+    Performs a breadth-first search on the CSR adjacency computed by ```mesh_to_adjacency_csr```, one hop at a time for the whole frontier: the neighbor lists of all frontier vertices are gathered with a single fancy index per hop, and already reached vertices are filtered out with a boolean mask over all vertices. This works on plain numpy arrays and does not require networkx.
+
+    Parameters
+    ----------
+    adjacency_indptr: numpy 1D int array
+        The CSR offsets, see ```mesh_to_adjacency_csr```.
+
+    adjacency_indices: numpy 1D int array
+        The CSR neighbor lists, see ```mesh_to_adjacency_csr```.
+
+    source_verts: int or numpy 1D int array
+        Index of the source vertex, or indices of several source vertices.
+
+    dist: int
+        The distance up until which neighbors should be returned. This is the number of edges to traverse in the graph.
+
+    out: numpy 1D int array, optional
+        A buffer with at least as many elements as there are vertices. If given, the neighbors are written into its first elements, hop by hop as they are reached, and a view of these elements is returned. This allows callers which run many searches to re-use one buffer instead of getting a new array for every search. Defaults to None, which returns a new array.
+
+    Returns
+    -------
+    neighbors: numpy 1D int array
+        The indices of all vertices which lie within distance dist of any of the source_verts, including the source vertices. Each vertex is listed once. The indices are sorted in ascending order if out is None, and ordered by graph distance from the sources (then by index) otherwise.
+
+    Raises
+    ------
+    ValueError
+        If the out buffer is smaller than the number of vertices.
+    """
+    num_verts = adjacency_indptr.shape[0] - 1
+    if out is not None and out.shape[0] < num_verts:
+        raise ValueError("ERROR: The out buffer must have at least %d elements (the number of vertices), but has %d." % (num_verts, out.shape[0]))
+    is_reached = np.zeros((num_verts, ), dtype=bool)
+    frontier = np.unique(np.asarray(source_verts, dtype=adjacency_indices.dtype))
+    is_reached[frontier] = True
+    num_reached = 0
+    for hop in range(dist + 1):
+        if hop > 0:
+            candidates = adjacency_indices[_csr_row_positions(adjacency_indptr, frontier)]
+            frontier = np.unique(candidates[~is_reached[candidates]])
+            is_reached[frontier] = True
+        if out is not None:
+            out[num_reached:num_reached + frontier.shape[0]] = frontier
+        num_reached += frontier.shape[0]
+        if frontier.shape[0] == 0:
+            break
+    if out is not None:
+        return out[:num_reached]
+    return np.flatnonzero(is_reached).astype(adjacency_indices.dtype)
+
+
+def get_last_source_up_to_dist_csr(adjacency_indptr, adjacency_indices, source_verts, dist):
+    """
+    For each vertex, find the last of several source vertices which lies within graph distance dist of it, based on a CSR adjacency.
+
+    Useful if every source vertex marks its neighborhood, and the marks of sources given later take precedence where neighborhoods overlap. Instead of one search per source, the index of the last source is spread over the mesh one hop at a time: in each hop, every vertex takes the maximum of its own value and the values of its neighbors. This takes dist passes over all edges, independent of the number of sources.
+
+    Parameters
+    ----------
+    adjacency_indptr: numpy 1D int array
+        The CSR offsets, see ```mesh_to_adjacency_csr```.
+
+    adjacency_indices: numpy 1D int array
+        The CSR neighbor lists, see ```mesh_to_adjacency_csr```.
+
+    source_verts: numpy 1D int array
+        The indices of the source vertices, in order. May contain duplicates.
+
+    dist: int
+        The distance up until which a source reaches a vertex. This is the number of edges to traverse in the graph.
+
+    Returns
+    -------
+    last_source: numpy 1D int array
+        Array with one entry per vertex: the position in source_verts of the last source which lies within distance dist of the vertex, or -1 if no source does.
+    """
+    num_verts = adjacency_indptr.shape[0] - 1
+    source_verts = np.asarray(source_verts)
+    last_source = np.full((num_verts, ), -1, dtype=np.intp)
+    np.maximum.at(last_source, source_verts, np.arange(source_verts.shape[0]))
+    edge_sources = np.repeat(np.arange(num_verts), np.diff(adjacency_indptr))
+    for hop in range(dist):
+        reached = last_source.copy()
+        np.maximum.at(reached, edge_sources, last_source[adjacency_indices])
+        if np.array_equal(reached, last_source):
+            break
+        last_source = reached
+    return last_source
+
+
+def _csr_row_positions(adjacency_indptr, rows):
+    """
+    Compute the positions of the entries of several CSR rows in the indices array.
+
+    Parameters
+    ----------
+    adjacency_indptr: numpy 1D int array
+        The CSR offsets, see ```mesh_to_adjacency_csr```.
+
+    rows: numpy 1D int array
+        The row (vertex) indices.
+
+    Returns
+    -------
+    numpy 1D int array
+        The positions of all entries of the given rows, concatenated in the order of the rows. Use it to index the CSR indices array.
+    """
+    row_starts = adjacency_indptr[rows]
+    row_lengths = adjacency_indptr[rows + 1] - row_starts
+    row_offsets_in_result = np.cumsum(row_lengths) - row_lengths
+    return np.arange(np.sum(row_lengths)) + np.repeat(row_starts - row_offsets_in_result, row_lengths)
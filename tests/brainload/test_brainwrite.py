@@ -70,6 +70,13 @@ def test_get_surface_vertices_overlay_volume_data():
     assert_array_equal(vol_data[9,:,0], [200, 200, 200])
 
 
+def test_get_surface_vertices_overlay_volume_data_later_marks_take_precedence():
+    vertex_mark_list = [(np.array([0, 1], dtype=int), [20, 20, 20]), (np.array([1], dtype=int), [40, 40, 40]), (np.array([], dtype=int), [60, 60, 60])]
+    vol_data = bw.get_surface_vertices_overlay_volume_data(3, vertex_mark_list, background_rgb=[200, 200, 200])
+    assert vol_data.shape == (3, 3, 1)
+    assert_array_equal(vol_data[:,:,0], [[20, 20, 20], [40, 40, 40], [200, 200, 200]])
+
+
 def test_get_surface_vertices_overlay_text_file_lines():
     num_verts = 10
     vertex_mark_list = [(np.array([0, 2, 4], dtype=int), [20, 20, 20]), (np.array([1, 3, 5, 7], dtype=int), [40, 40, 40])]
@@ -83,6 +90,40 @@ def test_get_surface_vertices_overlay_text_file_lines():
     assert overlay_lines[6] == "200, 200, 200"
 
 
+def test_get_surface_vertices_overlay_rgb_single_color():
+    overlay_rgb = bw.get_surface_vertices_overlay_rgb(10, np.array([0, 2, 4], dtype=int), [20, 20, 20], background_rgb=[200, 200, 200])
+    assert overlay_rgb.shape == (10, 3)
+    assert overlay_rgb.dtype == np.uint8
+    assert_array_equal(overlay_rgb[0], [20, 20, 20])
+    assert_array_equal(overlay_rgb[4], [20, 20, 20])
+    assert_array_equal(overlay_rgb[1], [200, 200, 200])
+    assert_array_equal(overlay_rgb[9], [200, 200, 200])
+
+
+def test_get_surface_vertices_overlay_rgb_per_vertex_colors():
+    vertex_colors = np.array([[20, 20, 20], [40, 40, 40], [60, 60, 60]], dtype=np.uint8)
+    overlay_rgb = bw.get_surface_vertices_overlay_rgb(10, np.array([0, 2, 0], dtype=int), vertex_colors)
+    assert overlay_rgb.shape == (10, 3)
+    assert_array_equal(overlay_rgb[0], [60, 60, 60])    # last color wins for duplicate indices
+    assert_array_equal(overlay_rgb[2], [40, 40, 40])
+    assert_array_equal(overlay_rgb[1], [200, 200, 200])
+
+
+def test_unique_last_vertex_occurrences():
+    unique_indices, last_occurrences = bw.unique_last_vertex_occurrences(np.array([5, 2, 5, 7, 2, 5], dtype=int))
+    assert_array_equal(unique_indices, [2, 5, 7])
+    assert_array_equal(last_occurrences, [4, 5, 3])
+
+
+def test_write_surface_vertices_overlay_text_file(tmpdir):
+    overlay_rgb = bw.get_surface_vertices_overlay_rgb(5, np.array([1, 3], dtype=int), [255, 0, 0], background_rgb=[128, 128, 128])
+    overlay_file = str(tmpdir.join('surface_RGB_map.txt'))
+    bw.write_surface_vertices_overlay_text_file(overlay_file, overlay_rgb)
+    with open(overlay_file) as f:
+        lines = f.read().splitlines()
+    assert lines == ["128, 128, 128", "255, 0, 0", "128, 128, 128", "255, 0, 0", "128, 128, 128"]
+
+
 def test_get_surface_vertices_overlay_volume_data_1color():
     num_verts = 10
     vertex_mark_list = [(np.array([0, 2, 4], dtype=int), 20), (np.array([1, 3, 5, 7], dtype=int), 40)]
@@ -134,3 +175,22 @@ def test_write_voldata_to_mgh_file():
         assert mgh_data[0,0,1] == 20
         assert mgh_data[0,0,2] == 40
         assert mgh_data[3,3,3] == 60
+
+
+def test_write_surface_vertices_overlay_text_file_to_file_object():
+    from io import StringIO
+    overlay_rgb = bw.get_surface_vertices_overlay_rgb(3, np.array([2], dtype=int), [0, 255, 0], background_rgb=[10, 10, 10])
+    output = StringIO()
+    bw.write_surface_vertices_overlay_text_file(output, overlay_rgb)
+    assert output.getvalue() == "10, 10, 10\n10, 10, 10\n0, 255, 0\n"
+
+
+def test_write_surface_vertices_overlay_text_file_in_chunks_matches_savetxt(monkeypatch):
+    from io import StringIO
+    monkeypatch.setattr(bw, '_ROWS_PER_CHUNK', 2)
+    overlay_rgb = bw.get_surface_vertices_overlay_rgb(5, np.array([0, 3, 4], dtype=int), [1, 2, 3], background_rgb=[255, 128, 0])
+    output = StringIO()
+    bw.write_surface_vertices_overlay_text_file(output, overlay_rgb)
+    expected_output = StringIO()
+    np.savetxt(expected_output, overlay_rgb, fmt='%d', delimiter=', ')
+    assert output.getvalue() == expected_output.getvalue()
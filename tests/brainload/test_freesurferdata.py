@@ -46,7 +46,7 @@ def test_merge_meshes():
     m2_vertex_coords = np.array([[0, 0, 0], [10, -10, 0], [10, 10, 0], [15, 10, 0]])
     m2_faces = np.array([[0, 2, 1], [1, 3, 2]])
 
-    merged_verts, merged_faces = fsd._merge_meshes(np.array([[m1_vertex_coords, m1_faces], [m2_vertex_coords, m2_faces]]))
+    merged_verts, merged_faces = fsd._merge_meshes([(m1_vertex_coords, m1_faces), (m2_vertex_coords, m2_faces)])
     assert merged_verts.shape == (8, 3)
     assert merged_faces.shape == (4, 3)
 
@@ -65,17 +65,37 @@ def test_merge_meshes():
     assert_allclose(np.array([5, 7, 6]), merged_faces[3])
 
 
+def test_merge_meshes_uses_narrow_dtypes():
+    m1_vertex_coords = np.array([[0, 0, 0], [5, -5, 0], [5, 5, 0]], dtype=np.float32)
+    m1_faces = np.array([[0, 1, 2]], dtype=np.int32)
+    merged_verts, merged_faces = fsd._merge_meshes([(m1_vertex_coords, m1_faces), (m1_vertex_coords, m1_faces)])
+    assert merged_verts.dtype == np.float32
+    assert merged_faces.dtype == np.int32
+    assert_array_equal(merged_faces, [[0, 1, 2], [3, 4, 5]])
+    merged_verts, merged_faces = fsd._merge_meshes([(m1_vertex_coords, m1_faces), (m1_vertex_coords.astype(np.float64), m1_faces)])
+    assert merged_verts.dtype == np.float64
+
+
 def test_merge_morphometry_data():
     morph_data1 = np.array([0.0, 0.1, 0.2, 0.3])
     morph_data2 = np.array([0.4])
     morph_data3 = np.array([0.5, 0.6])
-    merged_data = fsd.merge_morphometry_data(np.array([morph_data1, morph_data2, morph_data3]))
+    merged_data = fsd.merge_morphometry_data([morph_data1, morph_data2, morph_data3])
     assert merged_data.shape == (7,)
     assert merged_data[0] == pytest.approx(0.0, 0.0001)
     assert merged_data[4] == pytest.approx(0.4, 0.0001)
     assert merged_data[6] == pytest.approx(0.6, 0.0001)
 
 
+def test_merge_morphometry_data_respects_dtype():
+    merged_data = fsd.merge_morphometry_data((np.array([1, 2, 3], dtype=np.float32), np.array([4, 5], dtype=np.float32)))
+    assert merged_data.dtype == np.float32
+    merged_data = fsd.merge_morphometry_data((np.array([1, 2, 3], dtype=np.int32), np.array([4, 5], dtype=np.int32)), dtype=np.int32)
+    assert merged_data.dtype == np.int32
+    assert_array_equal(merged_data, [1, 2, 3, 4, 5])
+    assert fsd.merge_morphometry_data([]).shape == (0, )
+
+
 def test_read_fs_surface_file_and_record_meta_data_without_existing_metadata():
     surf_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.white')
     vert_coords, faces, meta_data = fsd.read_fs_surface_file_and_record_meta_data(surf_file, 'lh')
@@ -84,9 +104,22 @@ def test_read_fs_surface_file_and_record_meta_data_without_existing_metadata():
     assert meta_data['lh.surf_file'] == surf_file
     assert vert_coords.shape == (SUBJECT1_SURF_LH_WHITE_NUM_VERTICES, 3)
     assert faces.shape == (SUBJECT1_SURF_LH_WHITE_NUM_FACES, 3)
+    assert vert_coords.dtype == np.float32
+    assert faces.dtype == np.int32
     assert len(meta_data) == 3
 
 
+def test_read_fs_surface_file_and_record_meta_data_returns_independent_copies():
+    surf_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.white')
+    vert_coords, faces, meta_data = fsd.read_fs_surface_file_and_record_meta_data(surf_file, 'lh')
+    first_vert_coord = vert_coords[0].copy()
+    vert_coords[0] = 1000.0
+    faces[0] = 0
+    vert_coords2, faces2, meta_data2 = fsd.read_fs_surface_file_and_record_meta_data(surf_file, 'lh')
+    assert_allclose(vert_coords2[0], first_vert_coord)
+    assert not np.all(faces2[0] == 0)
+
+
 def test_read_fs_surface_file_and_record_meta_data_with_existing_metadata():
     surf_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.white')
     vert_coords, faces, meta_data = fsd.read_fs_surface_file_and_record_meta_data(surf_file, 'lh', meta_data={'this_boy': 'still_exists'})
@@ -122,6 +155,54 @@ def test_read_fs_morphometry_data_file_and_record_meta_data_with_subj1_curv_file
     assert per_vertex_data.shape == (SUBJECT1_SURF_LH_WHITE_NUM_VERTICES, )
 
 
+def test_read_curv_file_matches_nibabel():
+    import nibabel.freesurfer.io as fsio
+    curv_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area')
+    per_vertex_data = fsd._read_curv_file(curv_file)
+    assert per_vertex_data.shape == (SUBJECT1_SURF_LH_WHITE_NUM_VERTICES, )
+    assert_array_equal(per_vertex_data, fsio.read_morph_data(curv_file))
+
+
+def test_read_curv_file_old_format(tmpdir):
+    curv_file = str(tmpdir.join('lh.oldformat'))
+    with open(curv_file, 'wb') as curv_file_handle:
+        curv_file_handle.write(b'\x00\x00\x03' + b'\x00\x00\x01' + np.array([100, 250, -50], dtype='>i2').tobytes())
+    assert_allclose(fsd._read_curv_file(curv_file), [1.0, 2.5, -0.5])
+
+
+@pytest.mark.parametrize("file_name", ['lh.area.fsaverage.mgh', 'lh.area.fsaverage.mgz'])
+def test_read_mgh_per_vertex_data_is_identical_to_nibabel(file_name):
+    import nibabel as nib
+    mgh_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', file_name)
+    per_vertex_data = fsd._read_mgh_per_vertex_data(mgh_file)
+    assert per_vertex_data.shape == (FSAVERAGE_NUM_VERTS_PER_HEMISPHERE, )
+    assert_array_equal(per_vertex_data, nib.load(mgh_file).get_fdata()[:, 0, 0])
+
+
+def test_read_mgh_per_vertex_data_reads_first_column_of_volume(tmpdir):
+    import gzip
+    import nibabel as nib
+    volume_data = np.arange(24, dtype=np.int32).reshape((4, 3, 2))
+    mgh_file = str(tmpdir.join('volume.mgz'))
+    nib.save(nib.MGHImage(volume_data, np.eye(4)), mgh_file)
+    per_vertex_data = fsd._read_mgh_per_vertex_data(mgh_file)
+    with open(mgh_file, 'rb') as mgh_file_handle:
+        mgh_bytes = mgh_file_handle.read()
+    truncated_mgh_file = str(tmpdir.join('truncated.mgh'))
+    with open(truncated_mgh_file, 'wb') as truncated_file_handle:
+        truncated_file_handle.write(gzip.decompress(mgh_bytes)[:fsd._MGH_HEADER_SIZE + 6])
+    with pytest.raises(ValueError) as exc_info:
+        fsd._read_mgh_per_vertex_data(truncated_mgh_file)
+    assert_array_equal(per_vertex_data, volume_data[:, 0, 0])
+    assert 'truncated' in str(exc_info.value)
+
+
+def test_get_standard_space_morphometry_file_names():
+    file_names = fsd._get_standard_space_morphometry_file_names('area', fwhm='10', average_subject='fsaverage', surf='pial')
+    assert file_names == {'lh': 'lh.area.pial.fwhm10.fsaverage.mgh', 'rh': 'rh.area.pial.fwhm10.fsaverage.mgh'}
+    assert file_names['rh'] == fsd._get_standard_space_morphometry_file_name('rh', 'area', fwhm='10', average_subject='fsaverage', surf='pial')
+
+
 def test_read_fs_morphometry_data_file_and_record_meta_data_with_fsavg_mgh_file_with_existing_metadata():
     morphometry_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area.fsaverage.mgh')
     per_vertex_data, meta_data = fsd.read_fs_morphometry_data_file_and_record_meta_data(morphometry_file, 'lh', format='mgh', meta_data={'this_boy': 'still_exists'})
@@ -131,6 +212,8 @@ def test_read_fs_morphometry_data_file_and_record_meta_data_with_fsavg_mgh_file_
     assert meta_data['lh.morphometry_file_format'] == 'mgh'
     assert meta_data['lh.num_data_points'] == FSAVERAGE_NUM_VERTS_PER_HEMISPHERE
     assert per_vertex_data.shape == (FSAVERAGE_NUM_VERTS_PER_HEMISPHERE, )
+    mgh_data, mgh_meta_data = fsd.read_mgh_file(morphometry_file)
+    assert_allclose(per_vertex_data, mgh_data[:, 0, 0])
 
 
 def test_read_fs_morphometry_data_file_and_record_meta_data_raises_on_wrong_hemisphere_value():
@@ -173,6 +256,38 @@ def test_load_subject_mesh_files():
     assert len(meta_data) == 6
 
 
+def test_read_both_hemispheres_reuses_the_shared_executor_with_two_workers(monkeypatch):
+    import threading
+    monkeypatch.setattr(fsd, '_HEMISPHERE_READ_EXECUTOR', None)
+    main_thread = threading.current_thread()
+    assert fsd._read_both_hemispheres(threading.current_thread, threading.current_thread, False) == (main_thread, main_thread)
+    assert fsd._HEMISPHERE_READ_EXECUTOR is None    # not created for sequential reads
+    lh_thread, rh_thread = fsd._read_both_hemispheres(threading.current_thread, threading.current_thread, True)
+    assert lh_thread is not main_thread
+    assert rh_thread is main_thread
+    executor = fsd._HEMISPHERE_READ_EXECUTOR
+    assert executor._max_workers == 2
+    def _fail_to_create_executor(*args, **kwargs):
+        raise AssertionError("a new executor was created")
+    monkeypatch.setattr(fsd.concurrent.futures, 'ThreadPoolExecutor', _fail_to_create_executor)
+    for _ in range(3):
+        lh_thread, rh_thread = fsd._read_both_hemispheres(threading.current_thread, threading.current_thread, True)
+        assert lh_thread is not main_thread
+    assert fsd._HEMISPHERE_READ_EXECUTOR is executor
+    executor.shutdown()
+
+
+def test_load_subject_mesh_files_parallel_and_sequential_results_are_identical():
+    lh_surf_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.white')
+    rh_surf_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'rh.white')
+    vert_coords, faces, meta_data = fsd.load_subject_mesh_files(lh_surf_file, rh_surf_file, meta_data={'this_boy': 'still_exists'}, parallel=True)
+    seq_vert_coords, seq_faces, seq_meta_data = fsd.load_subject_mesh_files(lh_surf_file, rh_surf_file, meta_data={'this_boy': 'still_exists'}, parallel=False)
+    assert_array_equal(vert_coords, seq_vert_coords)
+    assert_array_equal(faces, seq_faces)
+    assert meta_data == seq_meta_data
+    assert len(meta_data) == 7
+
+
 def test_load_subject_mesh_files_preserves_existing_meta_data():
     lh_surf_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.white')
     rh_surf_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'rh.white')
@@ -219,6 +334,38 @@ def test_load_subject_morphometry_data_files():
     assert morphometry_data.shape == (SUBJECT1_SURF_LH_WHITE_NUM_VERTICES + SUBJECT1_SURF_RH_WHITE_NUM_VERTICES, )
 
 
+def test_load_subject_morphometry_data_files_both_hemis_is_concatenation_of_single_hemis():
+    lh_morphometry_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area')
+    rh_morphometry_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'rh.area')
+    morphometry_data, meta_data = fsd.load_subject_morphometry_data_files(lh_morphometry_file, rh_morphometry_file)
+    lh_morphometry_data, lh_meta_data = fsd.load_subject_morphometry_data_files(lh_morphometry_file, None, hemi='lh')
+    rh_morphometry_data, rh_meta_data = fsd.load_subject_morphometry_data_files(None, rh_morphometry_file, hemi='rh')
+    assert morphometry_data.dtype == lh_morphometry_data.dtype
+    assert_array_equal(morphometry_data, np.concatenate((lh_morphometry_data, rh_morphometry_data)))
+    assert meta_data['lh.num_data_points'] == lh_meta_data['lh.num_data_points']
+    assert meta_data['rh.num_data_points'] == rh_meta_data['rh.num_data_points']
+    assert meta_data['rh.morphometry_file'] == rh_morphometry_file
+
+
+def test_load_subject_morphometry_data_files_writes_into_out_array():
+    lh_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area')
+    rh_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'rh.area')
+    expected, _ = fsd.load_subject_morphometry_data_files(lh_file, rh_file)
+    out = np.zeros((2, SUBJECT1_SURF_LH_WHITE_NUM_VERTICES + SUBJECT1_SURF_RH_WHITE_NUM_VERTICES), dtype=np.float32)
+    morphometry_data, meta_data = fsd.load_subject_morphometry_data_files(lh_file, rh_file, out=out[1])
+    assert np.shares_memory(morphometry_data, out)
+    assert np.all(out[0] == 0.0)
+    assert np.allclose(out[1], expected)
+
+
+def test_load_subject_morphometry_data_files_raises_on_out_array_with_wrong_shape():
+    lh_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area')
+    rh_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'rh.area')
+    with pytest.raises(ValueError) as exc_info:
+        fsd.load_subject_morphometry_data_files(lh_file, rh_file, hemi='lh', out=np.zeros((5, )))
+    assert "but has shape (5,)" in str(exc_info.value)
+
+
 def test_load_subject_morphometry_data_files_preserves_existing_meta_data():
     lh_morphometry_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area')
     rh_morphometry_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'rh.area')
@@ -263,6 +410,28 @@ def test_load_subject_morphometry_data_files_raises_on_invalid_hemisphere():
     assert 'invalid_hemisphere' in str(exc_info.value)
 
 
+def test_parse_subject_both_hemis_returns_plain_arrays_without_warnings():
+    import warnings
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')      # e.g., numpy's VisibleDeprecationWarning for ragged object arrays
+        vert_coords, faces, morphometry_data, meta_data = bl.subject('subject1', subjects_dir=TEST_DATA_DIR)
+    assert vert_coords.dtype != object
+    assert faces.dtype != object
+    assert morphometry_data.dtype != object
+    assert morphometry_data.shape == (SUBJECT1_SURF_LH_WHITE_NUM_VERTICES + SUBJECT1_SURF_RH_WHITE_NUM_VERTICES, )
+
+
+def test_parse_subject_accepts_pathlike_subjects_dir():
+    import pathlib
+    vert_coords, faces, morphometry_data, meta_data = bl.subject('subject1', subjects_dir=pathlib.Path(TEST_DATA_DIR))
+    assert meta_data['subjects_dir'] == TEST_DATA_DIR
+    assert meta_data['lh.surf_file'] == os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.white')
+    assert morphometry_data.shape == (SUBJECT1_SURF_LH_WHITE_NUM_VERTICES + SUBJECT1_SURF_RH_WHITE_NUM_VERTICES, )
+    morphometry_data, meta_data = fsd.read_fs_morphometry_data_file_and_record_meta_data(pathlib.Path(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area.fsaverage.mgh'), 'lh')
+    assert meta_data['lh.morphometry_file'] == os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area.fsaverage.mgh')
+    assert morphometry_data.shape == (FSAVERAGE_NUM_VERTS_PER_HEMISPHERE, )
+
+
 def test_parse_subject():
     vert_coords, faces, morphometry_data, meta_data = bl.subject('subject1', subjects_dir=TEST_DATA_DIR)
     assert len(meta_data) == 20
@@ -475,6 +644,20 @@ def test_parse_subject_does_not_load_morphometry_data_when_asked_not_to():
     assert morphometry_data is None
 
 
+def test_parse_subject_accepts_deprecated_load_morhology_data():
+    with pytest.warns(DeprecationWarning):
+        vert_coords, faces, morphometry_data, meta_data = bl.subject('subject1', subjects_dir=TEST_DATA_DIR, load_morhology_data=False)
+    assert vert_coords.shape == (SUBJECT1_SURF_LH_WHITE_NUM_VERTICES + SUBJECT1_SURF_RH_WHITE_NUM_VERTICES, 3)
+    assert morphometry_data is None
+
+
+def test_parse_subject_standard_space_data_accepts_deprecated_load_morhology_data():
+    with pytest.warns(DeprecationWarning):
+        vert_coords, faces, morphometry_data, meta_data = bl.subject_avg('subject1', subjects_dir=TEST_DATA_DIR, load_surface_files=False, load_morhology_data=False)
+    assert vert_coords is None
+    assert morphometry_data is None
+
+
 def test_parse_subject_standard_space_data():
     expected_subjects_dir = TEST_DATA_DIR
     expected_fsaverage_surf_dir = os.path.join(TEST_DATA_DIR, 'fsaverage', 'surf')
@@ -1003,6 +1186,126 @@ def test_test_data_rh_is_as_expected():
     assert per_vertex_data_orig[123000] == pytest.approx(per_vertex_data_mod[123000], 0.1)
 
 
+def _write_group_mgh_files(subjects_dir, subjects_list, num_verts):
+    import nibabel as nib
+    for subject_idx, subject_id in enumerate(subjects_list):
+        surf_dir = os.path.join(subjects_dir, subject_id, 'surf')
+        os.makedirs(surf_dir)
+        for hemi_idx, hemi in enumerate(['lh', 'rh']):
+            data = np.full((num_verts, 1, 1), 10.0 * subject_idx + hemi_idx, dtype=np.float32)
+            nib.save(nib.MGHImage(data, np.eye(4)), os.path.join(surf_dir, '%s.area.fwhm10.fsaverage.mgh' % hemi))
+
+
+def test_load_group_data_is_identical_with_and_without_threads(tmpdir):
+    subjects_list = ['s3', 's1', 's2', 's5', 's4']
+    _write_group_mgh_files(str(tmpdir), subjects_list, 7)
+    group_data, group_data_subjects, group_meta_data, run_meta_data = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list)
+    group_data_seq, group_data_subjects_seq, group_meta_data_seq, run_meta_data_seq = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list, num_workers=1)
+    assert group_data.shape == (5, 14)
+    assert group_data_subjects == subjects_list
+    assert_array_equal(group_data[:, 0], [0.0, 10.0, 20.0, 30.0, 40.0])
+    assert_array_equal(group_data[:, 7], [1.0, 11.0, 21.0, 31.0, 41.0])
+    assert_array_equal(group_data, group_data_seq)
+    assert group_meta_data == group_meta_data_seq
+
+
+def test_load_group_data_reads_the_files_it_prefetches_and_records_the_same_meta_data_as_subject_avg(tmpdir, monkeypatch):
+    subjects_list = ['s1', 's2', 's3']
+    _write_group_mgh_files(str(tmpdir), subjects_list, 7)
+    advised_files = []
+    monkeypatch.setattr(fsd, '_advise_files_will_be_needed', advised_files.extend)
+    group_data, group_data_subjects, group_meta_data, run_meta_data = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list, num_workers=1)
+    assert advised_files == [group_meta_data[subject_id][hemi + '.morphometry_file'] for subject_id in ['s2', 's3'] for hemi in ['lh', 'rh']]
+    for subject_id in subjects_list:
+        subject_meta_data = bl.subject_avg(subject_id, subjects_dir=str(tmpdir), load_surface_files=False)[3]
+        assert group_meta_data[subject_id] == subject_meta_data
+
+
+def test_load_group_data_output_memmap(tmpdir):
+    subjects_list = ['s1', 's2', 's3']
+    _write_group_mgh_files(str(tmpdir), subjects_list, 7)
+    output_memmap = str(tmpdir.join('group_area.npy'))
+    group_data_in_memory = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list)[0]
+    group_data = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list, output_memmap=output_memmap)[0]
+    assert isinstance(group_data, np.memmap)
+    assert_array_equal(group_data, group_data_in_memory)
+    del group_data
+    assert_array_equal(np.load(output_memmap), group_data_in_memory)
+
+
+def test_load_group_data_cache_dir(tmpdir):
+    import time
+    subjects_list = ['s1', 's2']
+    _write_group_mgh_files(str(tmpdir), subjects_list, 7)
+    cache_dir = str(tmpdir.join('cache'))
+    group_data, group_data_subjects, group_meta_data, run_meta_data = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+    group_data_cached, group_data_subjects_cached, group_meta_data_cached, run_meta_data_cached = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list, cache_dir=cache_dir)
+    assert_array_equal(group_data_cached, group_data)
+    assert group_data_cached.dtype == group_data.dtype
+    assert group_meta_data_cached == group_meta_data
+    assert run_meta_data_cached == run_meta_data
+
+    # Changing a morphometry file invalidates the cached result.
+    changed_file = str(tmpdir.join('s2', 'surf', 'lh.area.fwhm10.fsaverage.mgh'))
+    import nibabel as nib
+    nib.save(nib.MGHImage(np.full((7, 1, 1), 99.0, dtype=np.float32), np.eye(4)), changed_file)
+    os.utime(changed_file, (time.time() + 10, time.time() + 10))
+    group_data_changed = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list, cache_dir=cache_dir)[0]
+    assert group_data_changed[1, 0] == 99.0
+
+    with pytest.raises(ValueError) as exc_info:
+        bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list, cache_dir=cache_dir, output_memmap=str(tmpdir.join('out.npy')))
+    assert 'cannot be combined' in str(exc_info.value)
+
+
+def test_load_group_data_light_meta_data(tmpdir):
+    subjects_list = ['s1', 's2']
+    _write_group_mgh_files(str(tmpdir), subjects_list, 7)
+    group_meta_data = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list)[2]
+    group_meta_data_light, run_meta_data_light = bl.group('area', subjects_dir=str(tmpdir), subjects_list=subjects_list, light_meta_data=True)[2:4]
+    common_subject_meta_data = run_meta_data_light['common_subject_meta_data']
+    assert common_subject_meta_data['measure'] == 'area'
+    assert common_subject_meta_data['lh.morphometry_file_format'] == 'mgh'
+    assert 'subject_id' not in common_subject_meta_data
+    for subject_id in subjects_list:
+        assert set(group_meta_data_light[subject_id].keys()) == {'subject_id', 'lh.morphometry_file', 'rh.morphometry_file', 'lh.num_data_points', 'rh.num_data_points'}
+        assert dict(group_meta_data_light[subject_id], **common_subject_meta_data) == group_meta_data[subject_id]
+
+
+def test_load_group_data_dtype(tmpdir):
+    _write_group_mgh_files(str(tmpdir), ['s1', 's2'], 7)
+    group_data = bl.group('area', subjects_dir=str(tmpdir), subjects_list=['s1', 's2'])[0]
+    group_data_float64 = bl.group('area', subjects_dir=str(tmpdir), subjects_list=['s1', 's2'], dtype=np.float64)[0]
+    assert group_data.dtype == np.float32
+    assert group_data_float64.dtype == np.float64
+    assert_array_equal(group_data, group_data_float64)
+
+
+def test_load_group_data_fills_custom_morphometry_file_templates_for_each_subject(tmpdir):
+    morphometry_template = os.path.join('..', '..', '${SUBJECT_ID}', 'surf', '${HEMI}.${MEASURE}${SURF}.fwhm${FWHM}.${AVERAGE_SUBJECT}.mgh')
+    custom_morphometry_file_templates = {'lh': morphometry_template, 'rh': morphometry_template}
+    _write_group_mgh_files(str(tmpdir), ['s1', 's2'], 7)
+    group_data, group_data_subjects, group_meta_data, run_meta_data = bl.group('area', subjects_dir=str(tmpdir), subjects_list=['s2', 's1'], custom_morphometry_file_templates=custom_morphometry_file_templates)
+    assert_array_equal(group_data[:, 0], [10.0, 0.0])
+    assert_array_equal(group_data[:, 7], [11.0, 1.0])
+    assert group_meta_data['s2']['rh.morphometry_file'] == os.path.join(str(tmpdir), 's2', 'surf', '..', '..', 's2', 'surf', 'rh.area.fwhm10.fsaverage.mgh')
+
+
+def test_advise_files_will_be_needed_ignores_missing_files():
+    existing_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area')
+    fsd._advise_files_will_be_needed([existing_file, os.path.join(TEST_DATA_DIR, 'no_such_file')])
+
+
+def test_load_group_data_raises_on_subjects_with_different_vertex_counts(tmpdir):
+    _write_group_mgh_files(str(tmpdir), ['s1', 's2'], 7)
+    _write_group_mgh_files(str(tmpdir), ['s3'], 5)
+    with pytest.raises(ValueError) as exc_info:
+        bl.group('area', subjects_dir=str(tmpdir), subjects_list=['s1', 's2', 's3'], num_workers=1)
+    assert "but has shape (14,)" in str(exc_info.value)
+    assert str(tmpdir.join('s3')) in str(exc_info.value)
+
+
 def test_load_group_data_raises_on_invalid_hemisphere():
     with pytest.raises(ValueError) as exc_info:
         group_data, group_data_subjects, group_meta_data, run_meta_data = bl.group('area', hemi='invalid_hemisphere', subjects_dir=TEST_DATA_DIR)
@@ -1226,6 +1529,14 @@ def test_read_mgh_file_without_data():
     assert mgh_meta_data is not None
 
 
+def test_read_mgh_file_mgh_and_mgz_data_are_identical():
+    mgh_data, mgh_meta_data = fsd.read_mgh_file(os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area.fsaverage.mgh'))
+    mgz_data, mgz_meta_data = fsd.read_mgh_file(os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area.fsaverage.mgz'))
+    assert isinstance(mgh_data, np.memmap)     # uncompressed files are memory-mapped
+    assert mgh_data.shape == (FSAVERAGE_NUM_VERTS_PER_HEMISPHERE, 1, 1)
+    assert_array_equal(mgh_data, mgz_data)
+
+
 def test_read_mgh_header_matrices_mgh():
     mgh_file = os.path.join(TEST_DATA_DIR, 'subject1', 'mri', 'orig.mgh')
     ras2vox, vox2ras, vox2ras_tkr = fsd.read_mgh_header_matrices(mgh_file)
@@ -1,6 +1,8 @@
 import os
+import io
 import pytest
 import numpy as np
+from numpy.testing import assert_array_equal
 import brainload as bl
 import brainload.meshexport as me
 
@@ -69,6 +71,22 @@ def test_ply_verts_color():
     assert vert_rep == expected
 
 
+def test_format_rows():
+    data = np.array([[1, 2], [3, 4], [5, 6]])
+    rows_rep = me._format_rows("x %d %d\n", data)
+    expected = "x 1 2\nx 3 4\nx 5 6\n"
+    assert rows_rep == expected
+
+
+def test_format_rows_writes_chunks_to_out(monkeypatch):
+    monkeypatch.setattr(me, '_ROWS_PER_CHUNK', 2)
+    data = np.array([[1, 2], [3, 4], [5, 6]])
+    colors = np.array([[7], [8], [9]])
+    out = io.StringIO()
+    assert me._format_rows("x %d %d %d\n", (data, colors), out=out) is None
+    assert out.getvalue() == "x 1 2 7\nx 3 4 8\nx 5 6 9\n"
+
+
 def test_ply_faces():
     faces = np.array([[0, 1, 2], [2, 3, 4], [4, 5, 6]])
     face_rep = me._ply_faces(faces)
@@ -136,6 +154,45 @@ end_header
     assert ply == expected
 
 
+def test_mesh_to_ply_binary_with_vcolors():
+    verts = np.array([[1.5, 1.5, 1.5], [2.5, 2.5, 2.5], [3.5, 3.5, 3.5]])
+    faces = np.array([[0, 1, 2], [2, 3, 4], [4, 5, 6]])
+    colors = np.array([[255, 0, 0, 255], [0, 255, 0, 255], [0, 0, 255, 255]])
+    ply = me.mesh_to_ply(verts, faces, vertex_colors=colors, binary=True)
+    assert isinstance(ply, bytes)
+    header, data = ply.split(b"end_header\n")
+    assert header.startswith(b"ply\nformat binary_little_endian 1.0\n")
+    assert b"property uchar alpha\n" in header
+    assert len(data) == 3 * (3 * 4 + 4) + 3 * (1 + 3 * 4)
+    vert_data = np.frombuffer(data[:48], dtype=[('xyz', '<f4', (3, )), ('rgba', 'u1', (4, ))])
+    assert_array_equal(vert_data['xyz'], verts)
+    assert_array_equal(vert_data['rgba'], colors)
+    face_data = np.frombuffer(data[48:], dtype=[('n', 'u1'), ('indices', '<i4', (3, ))])
+    assert_array_equal(face_data['n'], [3, 3, 3])
+    assert_array_equal(face_data['indices'], faces)
+
+
+def test_mesh_to_ply_binary_no_vcolors_has_same_header_as_ascii_apart_from_format():
+    verts = np.array([[1.5, 1.5, 1.5], [2.5, 2.5, 2.5], [3.5, 3.5, 3.5]])
+    faces = np.array([[0, 1, 2], [2, 3, 4], [4, 5, 6]])
+    ply = me.mesh_to_ply(verts, faces, binary=True)
+    header, data = ply.split(b"end_header\n")
+    assert header.decode('ascii') + "end_header\n" == me._ply_header(3, 3).replace("format ascii 1.0", "format binary_little_endian 1.0")
+    assert len(data) == 3 * 3 * 4 + 3 * (1 + 3 * 4)
+
+
+def test_mesh_export_functions_write_to_out_object():
+    verts = np.array([[1.5, 1.5, 1.5], [2.5, 2.5, 2.5], [3.5, 3.5, 3.5]])
+    faces = np.array([[0, 1, 2], [2, 3, 4], [4, 5, 6]])
+    for mesh_to_format in (me.mesh_to_obj, me.mesh_to_off, me.mesh_to_ply):
+        out = io.StringIO()
+        assert mesh_to_format(verts, faces, out=out) is None
+        assert out.getvalue() == mesh_to_format(verts, faces)
+    out = io.BytesIO()
+    assert me.mesh_to_ply(verts, faces, binary=True, out=out) is None
+    assert out.getvalue() == me.mesh_to_ply(verts, faces, binary=True)
+
+
 def test_normalize_to_range_zero_one_nonconstant():
     values = np.array([1.5, 15.7, 37.5])
     values_norm = me._normalize_to_range_zero_one(values)
@@ -181,6 +238,15 @@ def test_scalars_to_colors_clist_all_except_one_first_color():
     assert np.array_equal(vertex_colors[4][:], np.array([255, 0, 0, 175]))
 
 
+def test_scalars_to_colors_clist_matches_color_from_clist():
+    scalars = np.array([-3.0, 0.0, 0.5, 1.1, 2.25, 7.0, 7.0, 9.99, 10.0])
+    clist = me._get_example_colorlist(n=7)
+    vertex_colors = me.scalars_to_colors_clist(scalars, clist)
+    norm_scalars = me._normalize_to_range_zero_one(scalars)
+    for idx, norm_scalar in enumerate(norm_scalars):
+        assert_array_equal(vertex_colors[idx], me._color_from_clist(norm_scalar, clist))
+
+
 def test_scalars_to_colors_matplotlib_linear():
     try:
         import matplotlib.cm as mpl_cm
@@ -134,6 +134,15 @@ def test_detect_subjects_in_directory_does_match_when_adding_existant_required_s
     assert 'subject6' in subject_ids
 
 
+def test_detect_subjects_in_directory_skips_files_and_dirs_without_surf(tmpdir):
+    for sub_dir in [os.path.join('s1', 'surf'), os.path.join('s2', 'mri'), os.path.join('fsaverage', 'surf')]:
+        os.makedirs(str(tmpdir.join(sub_dir)))
+    with open(str(tmpdir.join('subjects.txt')), 'w') as subjects_file:
+        subjects_file.write('s1\n')
+    subject_ids = nit.detect_subjects_in_directory(str(tmpdir))
+    assert subject_ids == ['s1']
+
+
 def test_detect_subjects_in_directory_without_any_subjects():
     subject1_dir = os.path.join(TEST_DATA_DIR, 'subject1')  # This contains the data for a single subject, so none of its sub directories are valid subject dirs.
     subject_ids = nit.detect_subjects_in_directory(subject1_dir)
@@ -310,6 +319,15 @@ def test_save_and_reload_vertex_indices():
     os.remove(vert_idx_file)
 
 
+def test_save_and_reload_single_vertex_index():
+    vert_idx_file = os.path.join(TEST_DATA_DIR, 'verts_single.txt')    # will be created by the test
+    nit.save_vertex_indices(vert_idx_file, np.array([7], dtype=int))
+    loaded = nit.load_vertex_indices(vert_idx_file)
+    assert loaded.shape == (1,)
+    assert_array_equal(loaded, [7])
+    os.remove(vert_idx_file)
+
+
 def test_load_existing_vertex_indices_file():
     vert_idx_file = os.path.join(TEST_DATA_DIR, 'subject1', 'derived', 'verts.txt')    # included in test data
     loaded = nit.load_vertex_indices(vert_idx_file)
@@ -31,3 +31,87 @@ def test_surface_graph():
     assert len(neighbors_dist_2) == 25
     neighbors_dist_3 = surface_graph.get_neighbors_up_to_dist(source_vertex, 3)
     assert len(neighbors_dist_3) == 48
+
+
+def test_mesh_to_adjacency_csr():
+    import brainload.surfacegraph as sg
+    faces = np.array([[0, 1, 2], [0, 2, 3]], dtype=int)
+    adjacency_indptr, adjacency_indices = sg.mesh_to_adjacency_csr(faces, 5)
+    assert_array_equal(adjacency_indptr, [0, 3, 5, 8, 10, 10])
+    assert_array_equal(adjacency_indices[adjacency_indptr[0]:adjacency_indptr[1]], [1, 2, 3])
+    assert_array_equal(adjacency_indices[adjacency_indptr[2]:adjacency_indptr[3]], [0, 1, 3])
+    assert_array_equal(adjacency_indices[adjacency_indptr[4]:adjacency_indptr[5]], [])
+
+
+def test_get_neighbors_up_to_dist_csr():
+    import brainload.surfacegraph as sg
+    vert_coords, faces, meta_data = bl.subject_mesh('subject1', TEST_DATA_DIR, surf='white', hemi='lh')
+    adjacency_indptr, adjacency_indices = sg.mesh_to_adjacency_csr(faces, vert_coords.shape[0])
+    assert adjacency_indptr.shape == (SUBJECT1_SURF_LH_WHITE_NUM_VERTICES + 1, )
+    source_vertex = 100
+    assert_array_equal(sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, source_vertex, 0), [100])
+    assert sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, source_vertex, 1).shape == (9, )
+    assert sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, source_vertex, 2).shape == (25, )
+    assert sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, source_vertex, 3).shape == (48, )
+
+
+def test_get_neighbors_up_to_dist_csr_several_sources():
+    import brainload.surfacegraph as sg
+    faces = np.array([[0, 1, 2], [1, 2, 3], [3, 4, 5]], dtype=int)
+    adjacency_indptr, adjacency_indices = sg.mesh_to_adjacency_csr(faces, 7)
+    assert_array_equal(sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, np.array([0, 5]), 1), [0, 1, 2, 3, 4, 5])
+    assert_array_equal(sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, np.array([0, 6]), 2), [0, 1, 2, 3, 6])
+    assert_array_equal(sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, np.array([0]), 10), [0, 1, 2, 3, 4, 5])
+
+
+def test_surface_graph_adjacency_cache_file(tmpdir):
+    import brainload.surfacegraph as sg
+    mesh_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.white')
+    vert_coords, faces, meta_data = bl.subject_mesh('subject1', TEST_DATA_DIR, surf='white', hemi='lh')
+    cache_file = sg.get_adjacency_cache_file(mesh_file, cache_dir=str(tmpdir))
+    assert os.path.dirname(cache_file) == str(tmpdir)
+    assert not os.path.isfile(cache_file)
+    surface_graph = sg.SurfaceGraph(vert_coords, faces, adjacency_cache_file=cache_file)
+    assert os.path.isfile(cache_file)
+    cached_surface_graph = sg.SurfaceGraph(vert_coords, faces, adjacency_cache_file=cache_file)
+    assert_array_equal(cached_surface_graph.adjacency_indptr, surface_graph.adjacency_indptr)
+    assert_array_equal(cached_surface_graph.adjacency_indices, surface_graph.adjacency_indices)
+    assert cached_surface_graph.get_neighbors_up_to_dist(100, 2).shape == (25, )
+
+
+def test_get_neighbors_up_to_dist_csr_with_out_buffer():
+    import brainload.surfacegraph as sg
+    faces = np.array([[0, 1, 2], [1, 2, 3], [3, 4, 5]], dtype=int)
+    adjacency_indptr, adjacency_indices = sg.mesh_to_adjacency_csr(faces, 7)
+    out = np.full((7, ), -1, dtype=np.int32)
+    neighbors = sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, np.array([5]), 2, out=out)
+    assert_array_equal(neighbors, [5, 3, 4, 1, 2])
+    assert_array_equal(out[:5], [5, 3, 4, 1, 2])
+    neighbors = sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, 6, 2, out=out)
+    assert_array_equal(neighbors, [6])
+    with pytest.raises(ValueError):
+        sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, 0, 1, out=np.zeros((3, ), dtype=np.int32))
+
+
+def test_get_last_source_up_to_dist_csr_later_sources_win_on_overlap():
+    import brainload.surfacegraph as sg
+    faces = np.array([[0, 1, 2], [1, 2, 3], [3, 4, 5]], dtype=int)
+    adjacency_indptr, adjacency_indices = sg.mesh_to_adjacency_csr(faces, 7)
+    # Sources 0 and 2 are the same vertex, so wherever source 1 overlaps with them, source 2 wins.
+    last_source = sg.get_last_source_up_to_dist_csr(adjacency_indptr, adjacency_indices, np.array([0, 3, 0]), 1)
+    assert_array_equal(last_source, [2, 2, 2, 1, 1, 1, -1])
+    last_source = sg.get_last_source_up_to_dist_csr(adjacency_indptr, adjacency_indices, np.array([0, 3, 5]), 1)
+    assert_array_equal(last_source, [0, 1, 1, 2, 2, 2, -1])
+    last_source = sg.get_last_source_up_to_dist_csr(adjacency_indptr, adjacency_indices, np.array([5, 0]), 0)
+    assert_array_equal(last_source, [1, -1, -1, -1, -1, 0, -1])
+
+
+def test_get_last_source_up_to_dist_csr_matches_neighbors_of_each_source():
+    import brainload.surfacegraph as sg
+    vert_coords, faces, meta_data = bl.subject_mesh('subject1', TEST_DATA_DIR, surf='white', hemi='lh')
+    adjacency_indptr, adjacency_indices = sg.mesh_to_adjacency_csr(faces, vert_coords.shape[0])
+    source_verts = np.array([100, 101, 5000, 100, 103])
+    expected = np.full((vert_coords.shape[0], ), -1, dtype=int)
+    for source_idx, source_vert in enumerate(source_verts):
+        expected[sg.get_neighbors_up_to_dist_csr(adjacency_indptr, adjacency_indices, source_vert, 2)] = source_idx
+    assert_array_equal(sg.get_last_source_up_to_dist_csr(adjacency_indptr, adjacency_indices, source_verts, 2), expected)
@@ -0,0 +1,56 @@
+# Tests for the brain_morph_info script.
+#
+# These tests require the package `pytest-console-scripts`.
+
+import os
+import pytest
+
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_DATA_DIR = os.path.join(THIS_DIR, os.pardir, 'test_data')
+TEST_CURV_FILE_LH = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.area')
+TEST_CURV_FILE_RH = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'rh.area')
+
+def test_brain_morph_info_help(script_runner):
+    ret = script_runner.run('brain_morph_info', '--help')
+    assert ret.success
+    assert 'usage' in ret.stdout
+    assert ret.stderr == ''
+
+
+def test_brain_morph_info_values_by_index(script_runner):
+    ret = script_runner.run('brain_morph_info', TEST_CURV_FILE_LH, '-i', '1,2')
+    assert ret.success
+    assert ret.stdout.strip() == '0.5074570775032043,1.0300418138504028'
+    assert ret.stderr == ''
+
+
+def test_brain_morph_info_values_by_index_for_several_files(script_runner):
+    ret = script_runner.run('brain_morph_info', TEST_CURV_FILE_LH, TEST_CURV_FILE_RH, '-i', '1,2')
+    assert ret.success
+    lines = ret.stdout.strip().split('\n')
+    assert len(lines) == 2
+    assert lines[0] == TEST_CURV_FILE_LH + ',0.5074570775032043,1.0300418138504028'
+    assert lines[1] == TEST_CURV_FILE_RH + ',0.5282740592956543,0.5678732395172119'
+    assert ret.stderr == ''
+
+
+def test_brain_morph_info_describe_all_for_several_files(script_runner):
+    ret = script_runner.run('brain_morph_info', TEST_CURV_FILE_LH, TEST_CURV_FILE_RH, '-a', '-q', 'describe')
+    assert ret.success
+    lines = ret.stdout.strip().split('\n')
+    assert len(lines) == 2
+    assert lines[0].startswith(TEST_CURV_FILE_LH + ', 149244, ')
+    assert lines[1].startswith(TEST_CURV_FILE_RH + ', 153333, ')
+    assert ret.stderr == ''
+
+
+def test_brain_morph_info_query_index_too_large(script_runner):
+    ret = script_runner.run('brain_morph_info', TEST_CURV_FILE_LH, '-i', '10,200000')
+    assert not ret.success
+    assert "ERROR: All query indices must be < 149244" in ret.stderr
+
+
+def test_brain_morph_info_query_index_too_small(script_runner):
+    ret = script_runner.run('brain_morph_info', TEST_CURV_FILE_LH, '-i', '10,-11')
+    assert not ret.success
+    assert "ERROR: All query indices must be >= 0, but encountered negative index '-11'. Exiting." in ret.stderr
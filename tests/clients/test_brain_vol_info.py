@@ -6,6 +6,8 @@ import os
 import pytest
 import tempfile
 import shutil
+import numpy as np
+import nibabel as nib
 
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
 TEST_DATA_DIR = os.path.join(THIS_DIR, os.pardir, 'test_data')
@@ -27,3 +29,35 @@ def test_brain_vol_info_by_single_index(script_runner):
     assert "Received 1 voxel index (with 3 dimensions) from the command line. Printing intensity value of the voxel '10 10 10' in the volume." in ret.stdout
     assert '---Brain Vol Info---' in ret.stdout
     assert ret.stderr == ''
+
+
+def test_brain_vol_info_by_single_index_out_of_bounds(script_runner):
+    ret = script_runner.run('brain_vol_info', TEST_VOL_FILE, '--crs', '10', '10', '300')
+    assert not ret.success
+    assert 'ERROR: All query voxel indices must be >= 0 and smaller than the volume shape (256, 256, 256)' in ret.stderr
+
+
+def _value_counts_like_dict_loop(vol_data):
+    # The values and their counts as the script computed them before it used np.bincount and np.unique.
+    occuring_values = dict()
+    for value in vol_data.ravel():
+        occuring_values[value] = occuring_values.get(value, 0) + 1
+    return sorted(occuring_values.keys()), [pair[1] for pair in sorted(occuring_values.items(), key=lambda pair: pair[0])]
+
+
+@pytest.mark.parametrize("vol_data", [
+    np.array([[[0, 3], [17, 3]], [[3, 0], [2, 17]]], dtype=np.int32),                       # label volume: counted with np.bincount
+    np.array([[[-5.2, 3.0], [2000000.0, 3.0]], [[-5.0, 0.4], [2000000.0, 1.6]]], dtype=np.float32),   # negative and large values: counted with np.unique
+])
+def test_brain_vol_info_all_values_and_value_counts(script_runner, tmpdir, vol_data):
+    vol_file = str(tmpdir.join('vol.mgz'))
+    nib.save(nib.MGHImage(vol_data, np.eye(4)), vol_file)
+    expected_values, expected_counts = _value_counts_like_dict_loop(np.rint(vol_data).astype(int))
+    ret = script_runner.run('brain_vol_info', vol_file, '-a')
+    assert ret.success
+    assert ret.stdout.strip() == ' '.join([str(v) for v in expected_values])
+    assert ret.stderr == ''
+    ret = script_runner.run('brain_vol_info', vol_file, '-l')
+    assert ret.success
+    assert ret.stdout.strip() == ' '.join([str(c) for c in expected_counts])
+    assert ret.stderr == ''
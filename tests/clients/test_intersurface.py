@@ -4,6 +4,9 @@ import os
 from numpy.testing import assert_array_equal, assert_allclose
 import brainload as bl
 
+THIS_DIR = os.path.dirname(os.path.abspath(__file__))
+TEST_DATA_DIR = os.path.join(THIS_DIR, os.pardir, 'test_data')
+
 
 def test_face_area_single_face():
     try:
@@ -30,6 +33,31 @@ def test_get_mesh_face_areas():
     assert areas[1] == pytest.approx(12.5, 0.00001)
 
 
+def test_get_mesh_face_areas_matches_face_area_of_each_face():
+    try:
+        import brainload.clients.intersurface as blis
+    except:
+        pytest.skip("Optional test dependencies missing. Most likely you are missing one of: networkx, scipy.")
+    vert_coords, faces, meta_data = bl.subject_mesh('subject1', TEST_DATA_DIR, hemi='lh')
+    areas = blis.get_mesh_face_areas(vert_coords, faces)
+    assert areas.shape == (faces.shape[0],)
+    for face_idx in [0, 1, 5000, faces.shape[0] - 1]:
+        face = faces[face_idx]
+        assert areas[face_idx] == pytest.approx(blis.face_area(vert_coords[face[0]], vert_coords[face[1]], vert_coords[face[2]]), 0.00001)
+
+
+def test_get_expected_volume_per_vertex():
+    try:
+        import brainload.clients.intersurface as blis
+    except:
+        pytest.skip("Optional test dependencies missing. Most likely you are missing one of: networkx, scipy.")
+    vert_coords = np.array([[0.0, 0.0, 0.0], [5.0, 0.0, 0.0], [5.0, 5.0, 0.0], [10.0, 0.0, 0.0], [20.0, 20.0, 20.0]])
+    faces = np.array([[0, 1, 2], [1, 2, 3]], dtype=int)
+    cortical_thickness = np.array([1.0, 2.0, 2.0, 1.0, 3.0])
+    expected_volume = blis.get_expected_volume_per_vertex(vert_coords, faces, cortical_thickness)
+    assert_allclose(expected_volume, np.array([12.5, 50.0, 50.0, 12.5, 0.0]))
+
+
 def test_get_convex_polygon_volumes():
     try:
         import brainload.clients.intersurface as blis
@@ -95,3 +95,41 @@ def test_visualize_verts_num_verts_color_on_commandline_several_nonunique_foregr
     assert "Using background color '10 10 10'." in ret.stdout
     assert 'Resulting surface RGB map contains 3 marked vertices (2 unique).' in ret.stdout      # Note that 2 are unique only!
     assert ret.stderr == ''
+
+
+def test_visualize_verts_extend_neighborhood_later_vertices_win_on_overlap_with_interleaved_colors(script_runner, tmpdir):
+    import brainload as bl
+    import brainload.surfacegraph as sg
+    mesh_file = os.path.join(TEST_DATA_DIR, 'subject1', 'surf', 'lh.white')
+    vert_coords, faces, meta_data = bl.subject_mesh('subject1', TEST_DATA_DIR, surf='white', hemi='lh')
+    adjacency_indptr, adjacency_indices = sg.mesh_to_adjacency_csr(faces, vert_coords.shape[0])
+    vertex_a = 100
+    vertex_b = adjacency_indices[adjacency_indptr[vertex_a]]      # a direct neighbor of vertex_a, so their neighborhoods overlap
+    vertex_c = 5000
+    index_file = str(tmpdir.join('verts_with_color.txt'))
+    with open(index_file, 'w') as f:
+        f.write("%d,255,0,0\n%d,0,0,255\n%d,255,0,0\n" % (vertex_a, vertex_b, vertex_c))     # red, blue, red
+    output_file = str(tmpdir.join('surface_RGB_map.txt'))
+    ret = script_runner.run('visualize_verts', '-t', mesh_file, '-f', index_file, '-e', mesh_file, '1', '-o', output_file)
+    assert ret.success
+    with open(output_file) as f:
+        lines = f.read().splitlines()
+    assert lines[vertex_a] == "0, 0, 255"     # reached by vertex_a (red) and the later vertex_b (blue)
+    assert lines[vertex_b] == "0, 0, 255"
+    assert lines[vertex_c] == "255, 0, 0"
+    assert lines[adjacency_indices[adjacency_indptr[vertex_c]]] == "255, 0, 0"
+
+
+def test_visualize_verts_color_out_of_range_in_index_file(script_runner, tmpdir):
+    index_file = str(tmpdir.join('verts_with_color.txt'))
+    with open(index_file, 'w') as f:
+        f.write("1,255,0,0\n2,256,0,0\n")
+    ret = script_runner.run('visualize_verts', '-n', '15', '-f', index_file, '-o', str(tmpdir.join('surface_RGB_map.txt')))
+    assert not ret.success
+    assert "ERROR: All color values must be between 0 and 255, but the vertex index file '%s' contains the value '256'. Exiting." % (index_file) in ret.stderr
+
+
+def test_visualize_verts_color_out_of_range_on_commandline(script_runner, tmpdir):
+    ret = script_runner.run('visualize_verts', '-n', '15', '-i', '1', '-c', '0', '-1', '0', '-o', str(tmpdir.join('surface_RGB_map.txt')))
+    assert not ret.success
+    assert "ERROR: All color values must be between 0 and 255, but the foreground color (-c) contains the value '-1'. Exiting." in ret.stderr